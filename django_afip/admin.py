@@ -512,6 +512,7 @@ class ReceiptValidationAdmin(admin.ModelAdmin):
         "cae",
         "processed_date",
     )
+    list_select_related = ("receipt__point_of_sales", "receipt__receipt_type")
 
     raw_id_fields = ("receipt",)
 
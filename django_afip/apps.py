@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 from django.apps import AppConfig
+from django.conf import settings
+
+from django_afip import clients
 
 
 class AfipConfig(AppConfig):
@@ -12,3 +15,7 @@ class AfipConfig(AppConfig):
     def ready(self) -> None:
         # Register app signals:
         from django_afip import signals  # noqa: F401
+
+        # Warm up clients before any worker processes are forked:
+        for service_name, sandbox in getattr(settings, "AFIP_WARM_UP_CLIENTS", ()):
+            clients.warm_up([service_name], sandbox)
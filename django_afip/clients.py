@@ -1,21 +1,61 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import lru_cache
+from pathlib import Path
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
+from weakref import WeakKeyDictionary
 
+import requests
+from django.conf import settings
+from django.core.cache import caches
+from django.dispatch import Signal
+from django.utils.module_loading import import_string
+from lxml import etree
 from requests import Session
 from requests.adapters import HTTPAdapter
 from urllib3.util.ssl_ import create_urllib3_context
+from zeep import AsyncClient
 from zeep import Client
-from zeep.cache import SqliteCache
+from zeep.cache import Base
+from zeep.transports import AsyncTransport
 from zeep.transports import Transport
+from zeep.wsdl.utils import etree_to_string
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from ssl import SSLContext
+    from typing import Any
+
+    import httpx
+    from requests import Response
     from urllib3 import PoolManager
     from urllib3 import ProxyManager
 
-__all__ = ("get_client",)
+__all__ = (
+    "asend_raw",
+    "get_async_client",
+    "get_client",
+    "on_behalf_of",
+    "operation_finished",
+    "render_message",
+    "reset_connections",
+    "send_raw",
+    "warm_up",
+)
+
+logger = logging.getLogger(__name__)
 
 try:
     from zoneinfo import ZoneInfo
@@ -69,19 +109,468 @@ WSDLS = {
 }
 
 
+def create_ssl_context() -> SSLContext:
+    """Create an SSL context with reduced security so it'll work with AFIP."""
+    context = create_urllib3_context(ciphers="AES128-SHA")
+    context.load_default_certs()
+    return context
+
+
+#: The WSDL cache used when the ``AFIP_WSDL_CACHE`` setting is not defined.
+DEFAULT_WSDL_CACHE = {
+    "BACKEND": "zeep.cache.SqliteCache",
+    "OPTIONS": {"timeout": 86400},
+}
+
+
+class DjangoCache(Base):
+    """A zeep cache backed by Django's cache framework.
+
+    Using a shared cache (e.g.: Redis or memcached) allows sharing WSDL files
+    across processes and hosts.
+
+    :param alias: The alias of the Django cache to use.
+    :param timeout: Seconds for which documents are cached.
+    """
+
+    def __init__(self, alias: str = "default", timeout: int | None = 86400) -> None:
+        self.alias = alias
+        self.timeout = timeout
+
+    def _key(self, url: str) -> str:
+        return f"django_afip.wsdl.{hashlib.sha256(url.encode()).hexdigest()}"
+
+    def add(self, url: str, content: bytes) -> None:
+        caches[self.alias].set(self._key(url), content, self.timeout)
+
+    def get(self, url: str) -> bytes | None:
+        return caches[self.alias].get(self._key(url))
+
+
+class FileSystemCache(Base):
+    """A zeep cache which stores each document in its own file.
+
+    Files are written atomically, so many processes may share the same directory
+    without any locking. Failing to write into the cache (e.g.: on a read-only
+    filesystem) is logged and otherwise ignored.
+
+    :param path: The directory where documents are stored. Defaults to a
+        subdirectory of the system's temporary directory.
+    :param timeout: Seconds for which documents are cached. ``None`` means forever.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        timeout: int | None = 86400,
+    ) -> None:
+        if path is None:
+            path = Path(tempfile.gettempdir()) / "django_afip_wsdl"
+        self.path = Path(path)
+        self.timeout = timeout
+
+    def _file(self, url: str) -> Path:
+        return self.path / f"{hashlib.sha256(url.encode()).hexdigest()}.xml"
+
+    def add(self, url: str, content: bytes) -> None:
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path)
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp, self._file(url))
+        except OSError:
+            logger.warning("Could not write %s into the WSDL cache.", url)
+
+    def get(self, url: str) -> bytes | None:
+        file = self._file(url)
+        try:
+            age = time.time() - file.stat().st_mtime
+            if self.timeout is not None and age > self.timeout:
+                return None
+            return file.read_bytes()
+        except OSError:
+            return None
+
+
+def create_cache() -> Base | None:
+    """Create the WSDL cache configured via the ``AFIP_WSDL_CACHE`` setting.
+
+    The setting follows the same format as Django's :setting:`STORAGES`: a
+    ``BACKEND`` with the path to a zeep cache class, and optional ``OPTIONS`` with
+    keyword arguments for it. For example:
+
+    .. code-block:: python
+
+        AFIP_WSDL_CACHE = {
+            "BACKEND": "django_afip.clients.DjangoCache",
+            "OPTIONS": {"alias": "default"},
+        }
+
+    Setting it to ``None`` disables caching entirely.
+    """
+    config = getattr(settings, "AFIP_WSDL_CACHE", DEFAULT_WSDL_CACHE)
+    if config is None:
+        return None
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+#: The timeout for operations, used for any not listed in ``AFIP_TIMEOUTS``.
+#: This is a ``(connect, read)`` tuple, in seconds.
+DEFAULT_TIMEOUT = (10, 300)
+
+#: Operations which do not alter any data, and hence are safe to retry.
+#: Any operation starting with one of these names is considered read-only.
+READ_ONLY_OPERATIONS = (
+    "FECompConsultar",
+    "FECompTotXRequest",
+    "FECompUltimoAutorizado",
+    "FEDummy",
+    "FEParamGet",
+)
+
+#: HTTP status codes which indicate that a request may be retried.
+RETRY_STATUSES = (502, 503, 504)
+
+# Maps the (host, path) of each service to its name:
+_ENDPOINTS = {
+    (parsed.netloc.lower(), parsed.path.lower()): service_name
+    for environment in WSDLS.values()
+    for service_name, url in environment.items()
+    for parsed in [urlparse(url)]
+}
+
+_SANDBOX_HOSTS = frozenset(
+    urlparse(url).netloc.lower() for url in WSDLS["sandbox"].values()
+)
+
+#: Sent after each HTTP request to AFIP's web services (including each retry
+#: attempt), with the following arguments:
+#:
+#: - ``service``, ``operation``: The names of the service and operation.
+#: - ``sandbox``: Whether the request was sent to a sandbox server.
+#: - ``cuit``: The CUIT of the taxpayer on whose behalf the request was made (see
+#:   :func:`on_behalf_of`), or ``None``.
+#: - ``duration``: Seconds elapsed until the response was received (or failed).
+#: - ``request_size``, ``response_size``: Sizes of the bodies, in bytes. The latter
+#:   is ``None`` if no response was received.
+#: - ``status_code``: The HTTP status of the response, or ``None``.
+#: - ``outcome``: ``"success"``, ``"fault"`` (a SOAP fault), ``"http_error"`` or
+#:   ``"error"`` (e.g.: a timeout or connection failure).
+#: - ``exception``: The exception raised if the request failed, or ``None``.
+#: - ``attempt``: The attempt number, starting with ``1``.
+operation_finished = Signal()
+
+_current_cuit: ContextVar[int | None] = ContextVar("django_afip_cuit", default=None)
+
+
+@contextmanager
+def on_behalf_of(cuit: int | None) -> Iterator[None]:
+    """Attribute any requests made within this block to a given taxpayer.
+
+    The CUIT is included when sending :data:`operation_finished`.
+    """
+    token = _current_cuit.set(cuit)
+    try:
+        yield
+    finally:
+        _current_cuit.reset(token)
+
+
+def is_sandbox(address: str) -> bool:
+    """Return whether an address belongs to one of AFIP's sandbox servers."""
+    return urlparse(address).netloc.lower() in _SANDBOX_HOSTS
+
+
+def _operation_details(
+    address: str,
+    service_name: str,
+    operation: str,
+    message: bytes,
+    started: float,
+    attempt: int,
+    status_code: int | None = None,
+    response_size: int | None = None,
+    exception: Exception | None = None,
+) -> dict[str, Any]:
+    """Return the arguments for sending :data:`operation_finished`."""
+    if exception is not None:
+        outcome = "error"
+    elif status_code == 200:
+        outcome = "success"
+    elif status_code == 500:
+        outcome = "fault"
+    else:
+        outcome = "http_error"
+
+    return {
+        "service": service_name,
+        "operation": operation,
+        "sandbox": is_sandbox(address),
+        "cuit": _current_cuit.get(),
+        "duration": time.perf_counter() - started,
+        "request_size": len(message),
+        "response_size": response_size,
+        "status_code": status_code,
+        "outcome": outcome,
+        "exception": exception,
+        "attempt": attempt + 1,
+    }
+
+
+def get_operation(
+    address: str,
+    headers: dict[str, str],
+    message: bytes = b"",
+) -> tuple[str, str]:
+    """Return the names of the service and operation for a SOAP request.
+
+    The operation is taken from the ``SOAPAction`` header. Some operations (e.g.:
+    ``wsaa``'s ``loginCms``) send an empty one, in which case the name of the
+    first element in the envelope's body is used instead.
+
+    Either name is an empty string if it cannot be determined.
+    """
+    parsed = urlparse(address)
+    service_name = _ENDPOINTS.get((parsed.netloc.lower(), parsed.path.lower()), "")
+    operation = headers.get("SOAPAction", "").strip('"').rsplit("/", 1)[-1]
+    if not operation and message:
+        operation = _get_body_element(message)
+
+    return service_name, operation
+
+
+def _get_body_element(message: bytes) -> str:
+    """Return the local name of the first element in a SOAP envelope's body."""
+    try:
+        envelope = etree.fromstring(message)
+    except etree.XMLSyntaxError:
+        return ""
+
+    for body in envelope.iterchildren(tag=etree.Element):
+        if etree.QName(body).localname == "Body":
+            for element in body.iterchildren(tag=etree.Element):
+                return etree.QName(element).localname
+    return ""
+
+
+def get_timeout(
+    service_name: str,
+    operation: str,
+) -> float | tuple[float, float] | None:
+    """Return the timeout for a given operation.
+
+    Timeouts are configured via the ``AFIP_TIMEOUTS`` setting, which maps either
+    ``"service"``, ``"service.Operation"`` or ``"default"`` to a timeout. Timeouts
+    may be a number of seconds, a ``(connect, read)`` tuple, or ``None`` to wait
+    forever. The most specific match is used.
+    """
+    timeouts = getattr(settings, "AFIP_TIMEOUTS", {})
+    for key in (f"{service_name}.{operation}", service_name, "default"):
+        if key in timeouts:
+            return timeouts[key]
+    return DEFAULT_TIMEOUT
+
+
+def get_retries(operation: str) -> int:
+    """Return how many times a failed operation may be retried.
+
+    Only read-only operations are retried (see :data:`READ_ONLY_OPERATIONS`), up to
+    ``AFIP_RETRIES`` times (two, by default).
+    """
+    if not operation.startswith(READ_ONLY_OPERATIONS):
+        return 0
+    return getattr(settings, "AFIP_RETRIES", 2)
+
+
+def get_backoff(attempt: int) -> float:
+    """Return how long to wait before a given retry attempt.
+
+    Uses exponential backoff with full jitter, based on ``AFIP_RETRY_BACKOFF``
+    (half a second, by default).
+    """
+    return random.uniform(0, getattr(settings, "AFIP_RETRY_BACKOFF", 0.5) * 2**attempt)
+
+
+class AFIPTransport(Transport):
+    """A transport with per-operation timeouts, retries and instrumentation.
+
+    See :func:`get_timeout` and :func:`get_retries` for details. Sends
+    :data:`operation_finished` after each request.
+    """
+
+    def post(self, address: str, message: bytes, headers: dict[str, str]) -> Response:
+        service_name, operation = get_operation(address, headers, message)
+        timeout = get_timeout(service_name, operation)
+        retries = get_retries(operation)
+
+        attempt = 0
+        while True:
+            self.logger.debug("HTTP Post to %s (attempt %d)", address, attempt + 1)
+            started = time.perf_counter()
+            try:
+                response = self.session.post(
+                    address,
+                    data=message,
+                    headers=headers,
+                    timeout=timeout,
+                )
+            except Exception as e:
+                operation_finished.send(
+                    sender=type(self),
+                    **_operation_details(
+                        address,
+                        service_name,
+                        operation,
+                        message,
+                        started,
+                        attempt,
+                        exception=e,
+                    ),
+                )
+                retryable = isinstance(e, (requests.ConnectionError, requests.Timeout))
+                if not retryable or attempt == retries:
+                    raise
+            else:
+                operation_finished.send(
+                    sender=type(self),
+                    **_operation_details(
+                        address,
+                        service_name,
+                        operation,
+                        message,
+                        started,
+                        attempt,
+                        status_code=response.status_code,
+                        response_size=len(response.content),
+                    ),
+                )
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    return response
+            time.sleep(get_backoff(attempt))
+            attempt += 1
+
+
+class AsyncAFIPTransport(AsyncTransport):
+    """An asynchronous transport with per-operation timeouts and retries.
+
+    See :class:`AFIPTransport` for details.
+
+    Connections pooled by ``httpx`` are bound to the event loop in which they were
+    opened, and cannot be used from any other. If ``client_factory`` is given, it is
+    called to create a separate ``httpx.AsyncClient`` for each event loop (e.g.:
+    when called via ``async_to_sync``, which runs a new loop each time). Otherwise,
+    the same ``client`` is used for all of them.
+    """
+
+    def __init__(
+        self,
+        *args,
+        client_factory: Callable[[], httpx.AsyncClient] | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.client_factory = client_factory
+        self._clients: WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            httpx.AsyncClient,
+        ] = WeakKeyDictionary()
+
+    def get_client(self) -> httpx.AsyncClient:
+        """Return the ``httpx`` client for the running event loop."""
+        if self.client_factory is None:
+            return self.client
+
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = self.client_factory()
+        return client
+
+    async def aclose(self) -> None:
+        """Close the ``httpx`` client for the running event loop."""
+        if self.client_factory is None:
+            await self.client.aclose()
+        elif client := self._clients.pop(asyncio.get_running_loop(), None):
+            await client.aclose()
+
+    async def post(
+        self,
+        address: str,
+        message: bytes,
+        headers: dict[str, str],
+    ) -> httpx.Response:
+        import httpx
+
+        service_name, operation = get_operation(address, headers, message)
+        timeout = get_timeout(service_name, operation)
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        retries = get_retries(operation)
+
+        attempt = 0
+        while True:
+            self.logger.debug("HTTP Post to %s (attempt %d)", address, attempt + 1)
+            started = time.perf_counter()
+            try:
+                response = await self.get_client().post(
+                    address,
+                    content=message,
+                    headers=headers,
+                    timeout=timeout,
+                )
+            except Exception as e:
+                await operation_finished.asend(
+                    sender=type(self),
+                    **_operation_details(
+                        address,
+                        service_name,
+                        operation,
+                        message,
+                        started,
+                        attempt,
+                        exception=e,
+                    ),
+                )
+                if not isinstance(e, httpx.TransportError) or attempt == retries:
+                    raise
+            else:
+                await operation_finished.asend(
+                    sender=type(self),
+                    **_operation_details(
+                        address,
+                        service_name,
+                        operation,
+                        message,
+                        started,
+                        attempt,
+                        status_code=response.status_code,
+                        response_size=len(response.content),
+                    ),
+                )
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    return response
+            await asyncio.sleep(get_backoff(attempt))
+            attempt += 1
+
+
 class AFIPAdapter(HTTPAdapter):
-    """An adapter with reduced security so it'll work with AFIP."""
+    """An adapter with reduced security so it'll work with AFIP.
+
+    The size of the connection pool for each host can be configured via the
+    ``AFIP_POOL_MAXSIZE`` setting.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        kwargs.setdefault("pool_maxsize", getattr(settings, "AFIP_POOL_MAXSIZE", 10))
+        super().__init__(*args, **kwargs)
 
     def init_poolmanager(self, *args, **kwargs) -> PoolManager:
-        context = create_urllib3_context(ciphers="AES128-SHA")
-        context.load_default_certs()
-        kwargs["ssl_context"] = context
+        kwargs["ssl_context"] = create_ssl_context()
         return super().init_poolmanager(*args, **kwargs)
 
     def proxy_manager_for(self, *args, **kwargs) -> ProxyManager:
-        context = create_urllib3_context(ciphers="AES128-SHA")
-        context.load_default_certs()
-        kwargs["ssl_context"] = context
+        kwargs["ssl_context"] = create_ssl_context()
         return super().proxy_manager_for(*args, **kwargs)
 
 
@@ -89,10 +578,11 @@ class AFIPAdapter(HTTPAdapter):
 def get_or_create_transport() -> Transport:
     """Create a specially-configured Zeep transport.
 
-    This transport does two non-default things:
+    This transport does a few non-default things:
     - Reduces TLS security. Sadly, AFIP only has insecure endpoints, so we're
       forced to reduce security to talk to them.
-    - Cache the WSDL file for a whole day.
+    - Cache WSDL files (for a whole day, by default). See :func:`create_cache`.
+    - Applies timeouts and retries to operations. See :class:`AFIPTransport`.
 
     This function will only create a transport once, and return the same
     transport in subsequent calls.
@@ -107,7 +597,57 @@ def get_or_create_transport() -> Transport:
             base_url = f"{parsed.scheme}://{parsed.netloc}"
             session.mount(base_url, AFIPAdapter())
 
-    return Transport(cache=SqliteCache(timeout=86400), session=session)
+    return AFIPTransport(cache=create_cache(), session=session)
+
+
+@lru_cache(maxsize=1)
+def get_or_create_async_transport() -> AsyncAFIPTransport:
+    """Create a specially-configured asynchronous Zeep transport.
+
+    This transport is configured just like the one returned by
+    :func:`get_or_create_transport`, and shares its WSDL cache. It uses ``httpx``,
+    which needs to be installed separately (e.g.: via the ``async`` extra).
+
+    Note that zeep loads WSDL files synchronously, even for asynchronous clients;
+    only operations are executed asynchronously.
+
+    This function will only create a transport once, and return the same
+    transport in subsequent calls. The transport opens a separate connection pool
+    for each event loop that uses it.
+    """
+    import httpx
+
+    def create_client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(verify=create_ssl_context())
+
+    return AsyncAFIPTransport(
+        client=create_client(),
+        client_factory=create_client,
+        wsdl_client=httpx.Client(verify=create_ssl_context(), timeout=300),
+        cache=get_or_create_transport().cache,
+    )
+
+
+def get_wsdl(service_name: str, sandbox: bool = False) -> str:
+    """Return the URL for the WSDL for a given service.
+
+    URLs may be overridden via the ``AFIP_WSDLS`` setting, which has the same shape
+    as :data:`WSDLS` (e.g.: to use a local :class:`~.testing.fake.FakeAFIP`).
+
+    :param service_name: The name of the web services.
+    :param sandbox: Whether to return the sandbox (or production) WSDL.
+    """
+    environment = "sandbox" if sandbox else "production"
+    key = service_name.lower()
+
+    overrides = getattr(settings, "AFIP_WSDLS", {}).get(environment, {})
+    if key in overrides:
+        return overrides[key]
+
+    try:
+        return WSDLS[environment][key]
+    except KeyError:
+        raise ValueError(f"Unknown service name, {service_name}") from None
 
 
 @lru_cache(maxsize=32)
@@ -128,10 +668,149 @@ def get_client(service_name: str, sandbox: bool = False) -> Client:
         be used by the returned client.
     :returns: A zeep client to communicate with an AFIP web service.
     """
-    environment = "sandbox" if sandbox else "production"
-    key = service_name.lower()
+    return Client(
+        get_wsdl(service_name, sandbox),
+        transport=get_or_create_transport(),
+    )
 
-    try:
-        return Client(WSDLS[environment][key], transport=get_or_create_transport())
-    except KeyError:
-        raise ValueError(f"Unknown service name, {service_name}") from None
+
+@lru_cache(maxsize=32)
+def get_async_client(service_name: str, sandbox: bool = False) -> AsyncClient:
+    """
+    Return an asynchronous client for a given service.
+
+    This is the asynchronous counterpart of :func:`get_client`, and accepts the same
+    arguments. Operations on the returned client are coroutines.
+
+    Building a client requires loading its WSDL, which is a blocking operation.
+    Callers running inside an event loop should call this function in a thread
+    (e.g.: via ``sync_to_async``) the first time around.
+
+    This function is cached with `lru_cache`, and will re-use existing clients
+    if possible.
+
+    :param service_name: The name of the web services.
+    :param sandbox: Whether the sandbox (or production) environment should
+        be used by the returned client.
+    :returns: An asynchronous zeep client to communicate with an AFIP web service.
+    """
+    return AsyncClient(
+        get_wsdl(service_name, sandbox),
+        transport=get_or_create_async_transport(),
+    )
+
+
+def warm_up(service_names: Iterable[str], sandbox: bool | None = None) -> None:
+    """Create clients for the given services ahead of time.
+
+    This loads (and caches) their WSDL files, so that subsequent calls to
+    :func:`get_client` need not do so.
+
+    :param service_names: The names of the web services.
+    :param sandbox: Whether to warm up clients for the sandbox or production
+        environment. If ``None``, both are warmed up.
+    """
+    environments = (False, True) if sandbox is None else (sandbox,)
+    for service_name in service_names:
+        for environment in environments:
+            get_client(service_name, environment)
+
+
+def _prepare_raw_request(
+    client: Client | AsyncClient,
+    operation: str,
+) -> tuple[str, dict[str, str]]:
+    """Return the address and HTTP headers for a raw request to ``operation``."""
+    operation_obj = client.service._binding.get(operation)
+    headers = {
+        "SOAPAction": f'"{operation_obj.soapaction}"',
+        "Content-Type": "text/xml; charset=utf-8",
+    }
+    return client.service._binding_options["address"], headers
+
+
+def _process_raw_reply(  # noqa: ANN202
+    client: Client | AsyncClient,
+    operation: str,
+    response: Response,
+    parser: Callable[[bytes], Any] | None,
+):
+    binding = client.service._binding
+    if parser is None or response.status_code != 200:
+        # zeep raises the appropriate exceptions for SOAP faults and HTTP errors.
+        return binding.process_reply(client, binding.get(operation), response)
+    return parser(response.content)
+
+
+def render_message(client: Client | AsyncClient, operation: str, *args) -> bytes:
+    """Render a SOAP envelope for ``operation`` with zeep.
+
+    The result is suitable for :func:`send_raw`.
+    """
+    return etree_to_string(client.create_message(client.service, operation, *args))
+
+
+def send_raw(  # noqa: ANN201
+    client: Client,
+    operation: str,
+    envelope: bytes,
+    parser: Callable[[bytes], Any] | None = None,
+):
+    """Send a pre-rendered SOAP envelope and parse its reply.
+
+    This allows sending requests rendered by means other than zeep (e.g.:
+    :func:`~.serializers.render_cae_request`), while still using the client's
+    transport (and its connection pool, timeouts and retries).
+
+    :param client: The client for the service which the envelope targets.
+    :param operation: The name of the operation.
+    :param envelope: The complete SOAP envelope, as bytes.
+    :param parser: A function which decodes the body of successful responses (e.g.:
+        :func:`~.parsers.parse_cae_response`). If ``None``, zeep parses the
+        response, exactly as it would for a regular call.
+    :returns: The parsed response.
+    """
+    address, headers = _prepare_raw_request(client, operation)
+    response = client.transport.post(address, envelope, headers)
+
+    return _process_raw_reply(client, operation, response, parser)
+
+
+async def asend_raw(  # noqa: ANN201
+    client: AsyncClient,
+    operation: str,
+    envelope: bytes,
+    parser: Callable[[bytes], Any] | None = None,
+):
+    """Asynchronous version of :func:`send_raw`."""
+    address, headers = _prepare_raw_request(client, operation)
+    response = await client.transport.post(address, envelope, headers)
+
+    return _process_raw_reply(
+        client,
+        operation,
+        client.transport.new_response(response),
+        parser,
+    )
+
+
+def reset_connections() -> None:
+    """Drop all pooled connections to AFIP's servers.
+
+    Connections cannot be shared across processes, so this is called automatically
+    in child processes after a fork. Clients and parsed WSDL files are kept, so
+    warming up clients before forking (e.g.: with gunicorn's ``--preload``) lets all
+    workers share them.
+
+    Asynchronous clients are discarded entirely, since their connection pools
+    cannot be closed synchronously.
+    """
+    if get_or_create_transport.cache_info().currsize:
+        get_or_create_transport().session.close()
+
+    get_async_client.cache_clear()
+    get_or_create_async_transport.cache_clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_connections)
@@ -8,20 +8,19 @@ from cryptography.hazmat.primitives.serialization import Encoding
 from cryptography.hazmat.primitives.serialization import load_pem_private_key
 from cryptography.hazmat.primitives.serialization.pkcs7 import PKCS7Options
 from cryptography.hazmat.primitives.serialization.pkcs7 import PKCS7SignatureBuilder
+from cryptography.x509 import Certificate
 from cryptography.x509 import load_pem_x509_certificate
 from OpenSSL import crypto
 
 from django_afip import exceptions
 
 
-def create_embeded_pkcs7_signature(data: bytes, cert: bytes, key: bytes) -> bytes:
-    """Creates an embedded ("nodetached") PKCS7 signature.
+def load_credentials(cert: bytes, key: bytes) -> tuple[Certificate, RSAPrivateKey]:
+    """Parse a PEM-encoded certificate and private key, for use with :func:`sign`.
 
-    This is equivalent to the output of::
-
-        openssl smime -sign -signer cert -inkey key -outform DER -nodetach < data
+    Parsing keys is relatively expensive, so callers signing repeatedly with the
+    same credentials should keep the result around.
     """
-
     try:
         pkey = load_pem_private_key(key, None)
         signcert = load_pem_x509_certificate(cert)
@@ -31,14 +30,32 @@ def create_embeded_pkcs7_signature(data: bytes, cert: bytes, key: bytes) -> byte
     if not isinstance(pkey, RSAPrivateKey):
         raise exceptions.CorruptCertificate("Private key is not RSA")
 
+    return signcert, pkey
+
+
+def sign(data: bytes, cert: Certificate, key: RSAPrivateKey) -> bytes:
+    """Creates an embedded ("nodetached") PKCS7 signature with parsed credentials.
+
+    See :func:`load_credentials`.
+    """
     return (
         PKCS7SignatureBuilder()
         .set_data(data)
-        .add_signer(signcert, pkey, hashes.SHA256())
+        .add_signer(cert, key, hashes.SHA256())
         .sign(Encoding.DER, [PKCS7Options.Binary])
     )
 
 
+def create_embeded_pkcs7_signature(data: bytes, cert: bytes, key: bytes) -> bytes:
+    """Creates an embedded ("nodetached") PKCS7 signature.
+
+    This is equivalent to the output of::
+
+        openssl smime -sign -signer cert -inkey key -outform DER -nodetach < data
+    """
+    return sign(data, *load_credentials(cert, key))
+
+
 def create_key(file_: IO[bytes]) -> None:
     """Create a key and write it into ``file_``."""
     pkey = crypto.PKey()
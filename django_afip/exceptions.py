@@ -9,7 +9,9 @@ class AfipException(DjangoAfipException):
     """Wraps around errors returned by AFIP's WS."""
 
     def __init__(self, response) -> None:  # noqa: ANN001
-        if "Errors" in response:
+        if hasattr(response, "errors"):  # Responses decoded via django_afip.parsers
+            message = f"Error {response.errors[0].code}: {response.errors[0].message}"
+        elif "Errors" in response:
             message = (
                 f"Error {response.Errors.Err[0].Code}: {response.Errors.Err[0].Msg}"
             )
@@ -21,6 +23,13 @@ class AfipException(DjangoAfipException):
         Exception.__init__(self, message)
 
 
+class ServiceUnavailable(DjangoAfipException):
+    """Raised when AFIP's servers report an outage.
+
+    See :func:`~.helpers.check_circuit_breaker`.
+    """
+
+
 class AuthenticationError(DjangoAfipException):
     """Raised when there is an error during an authentication attempt.
 
@@ -41,6 +50,14 @@ class CorruptCertificate(AuthenticationError):
     """Raised when a corrupt certificate file is used in an authentication attempt."""
 
 
+class SigningError(AuthenticationError):
+    """Raised when a signer failed to sign an authentication request."""
+
+
+class TicketAlreadyExists(AuthenticationError):
+    """Raised when AFIP refuses a new ticket because a previous one is still valid."""
+
+
 class CannotValidateTogether(DjangoAfipException):
     """Raised when attempting to validate invalid combinations of receipts.
 
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import logging
+import threading
+import time
 from dataclasses import dataclass
 
+from django.conf import settings
+
 from django_afip import clients
+from django_afip import exceptions
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -43,3 +51,118 @@ def get_server_status(production: bool) -> ServerStatus:
         db=response["DbServer"] == "OK",
         auth=response["AuthServer"] == "OK",
     )
+
+
+#: The status assumed when AFIP's servers cannot be reached at all.
+UNREACHABLE = ServerStatus(app=False, db=False, auth=False)
+
+# Maps the `production` flag to a `(timestamp, status)` tuple.
+_status_cache: dict[bool, tuple[float, ServerStatus]] = {}
+_status_locks = {True: threading.Lock(), False: threading.Lock()}
+
+
+def get_status_ttl() -> float:
+    """Return for how many seconds a server status is cached.
+
+    This is configured via the ``AFIP_SERVER_STATUS_TTL`` setting (one minute, by
+    default).
+    """
+    return getattr(settings, "AFIP_SERVER_STATUS_TTL", 60)
+
+
+def refresh_server_status(production: bool) -> ServerStatus:
+    """Fetch the status of AFIP's WS servers and cache it.
+
+    If the servers cannot be reached at all, they are considered to be down (see
+    :data:`UNREACHABLE`).
+
+    :param production: Whether to check the production servers. If false, the
+        testing servers will be checked instead.
+    """
+    try:
+        status = get_server_status(production)
+    except Exception:
+        logger.warning("Could not determine the status of AFIP's WS.", exc_info=True)
+        status = UNREACHABLE
+
+    _status_cache[production] = (time.monotonic(), status)
+    return status
+
+
+def get_cached_server_status(production: bool) -> ServerStatus:
+    """Return the status of AFIP's WS servers, caching it for a while.
+
+    This is the same as :func:`get_server_status`, but a fresh status is only
+    fetched once it is older than ``AFIP_SERVER_STATUS_TTL`` seconds. While
+    another thread is refreshing it, the previous status is returned immediately.
+
+    :param production: Whether to check the production servers. If false, the
+        testing servers will be checked instead.
+    """
+    cached = _status_cache.get(production)
+    if cached and time.monotonic() - cached[0] < get_status_ttl():
+        return cached[1]
+
+    lock = _status_locks[production]
+    if cached and not lock.acquire(blocking=False):
+        return cached[1]
+    if not cached:
+        lock.acquire()
+
+    try:
+        # Another thread may have refreshed it while we waited for the lock:
+        latest = _status_cache.get(production)
+        if latest is not cached and latest is not None:
+            return latest[1]
+        return refresh_server_status(production)
+    finally:
+        lock.release()
+
+
+class ServerStatusRefresher(threading.Thread):
+    """A daemon thread which periodically refreshes the cached server status.
+
+    This keeps :func:`get_cached_server_status` from ever blocking on a request
+    to AFIP. Threads do not survive forking, so pre-fork servers should start
+    refreshers in each worker (e.g.: in gunicorn's ``post_fork`` hook)::
+
+        ServerStatusRefresher(production=True).start()
+
+    :param production: Whether to check the production servers.
+    :param interval: Seconds between refreshes. Defaults to
+        ``AFIP_SERVER_STATUS_TTL``.
+    """
+
+    def __init__(self, production: bool, interval: float | None = None) -> None:
+        super().__init__(name="django-afip-status-refresher", daemon=True)
+        self.production = production
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            refresh_server_status(self.production)
+            self._stopped.wait(self.interval or get_status_ttl())
+
+    def stop(self) -> None:
+        """Stop refreshing the status; the thread exits shortly afterwards."""
+        self._stopped.set()
+
+
+def check_circuit_breaker(production: bool) -> None:
+    """Fail fast if AFIP's servers report an outage.
+
+    This is a no-op unless the ``AFIP_CIRCUIT_BREAKER`` setting is enabled. When it
+    is, operations which would otherwise likely block until timing out during an
+    outage call this first.
+
+    :param production: Whether to check the production servers.
+    :raises ~.exceptions.ServiceUnavailable: If the cached server status reports
+        any server being down.
+    """
+    if not getattr(settings, "AFIP_CIRCUIT_BREAKER", False):
+        return
+
+    status = get_cached_server_status(production)
+    if not status:
+        raise exceptions.ServiceUnavailable(f"AFIP reports an outage: {status}")
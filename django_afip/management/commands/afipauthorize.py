@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from datetime import datetime
+from datetime import timezone
+from typing import TYPE_CHECKING
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.utils.translation import gettext as _
+
+from django_afip import models
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = _("Creates authorization tickets for many taxpayers concurrently.")
+    requires_migrations_checks = True
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--service",
+            default="wsfe",
+            help=_("The service to authorize (default: wsfe)."),
+        )
+        taxpayers = parser.add_mutually_exclusive_group(required=True)
+        taxpayers.add_argument(
+            "--all",
+            action="store_true",
+            help=_("Authorize all taxpayers."),
+        )
+        taxpayers.add_argument(
+            "--cuit",
+            action="append",
+            type=int,
+            dest="cuits",
+            help=_("Authorize taxpayers with this CUIT. May be repeated."),
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=16,
+            help=_("The amount of taxpayers to authorize at once (default: 16)."),
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help=_(
+                "Also authorize taxpayers which have an active ticket. AFIP won't "
+                "issue a new ticket while one is still valid, so those known "
+                "locally are reused."
+            ),
+        )
+
+    def handle(self, *args, **options) -> None:
+        service = options["service"]
+        taxpayers = models.TaxPayer.objects.all()
+        if options["cuits"]:
+            taxpayers = taxpayers.filter(cuit__in=options["cuits"])
+        if not options["force"]:
+            taxpayers = taxpayers.exclude(
+                pk__in=models.AuthTicket.objects.filter(
+                    service=service,
+                    expires__gt=datetime.now(timezone.utc),
+                ).values("owner"),
+            )
+
+        authorized, failed = models.AuthTicket.objects.authorize_many(
+            taxpayers,
+            service,
+            options["concurrency"],
+        )
+
+        self.stdout.write(
+            _("Authorized %(count)d taxpayers.") % {"count": len(authorized)}
+        )
+        for taxpayer, error in failed:
+            self.stderr.write(f"{taxpayer} ({taxpayer.cuit}): {error}")
+        if failed:
+            raise CommandError(
+                _("Could not authorize %(count)d taxpayers.") % {"count": len(failed)}
+            )
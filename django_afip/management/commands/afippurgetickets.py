@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.core.management.base import BaseCommand
+from django.utils.translation import gettext as _
+
+from django_afip import models
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = _("Deletes expired authorization tickets.")
+    requires_migrations_checks = True
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help=_("Delete this many tickets per statement (default: 1000)."),
+        )
+
+    def handle(self, *args, **options) -> None:
+        deleted = models.AuthTicket.objects.purge_expired(options["batch_size"])
+        self.stdout.write(_("Deleted %(count)d expired tickets.") % {"count": deleted})
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.core.management.base import BaseCommand
+from django.utils.translation import gettext as _
+
+from django_afip import models
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = _("Renews authorization tickets which have just expired.")
+    requires_migrations_checks = True
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--window",
+            type=float,
+            help=_(
+                "Renew tickets which expired within this many seconds. Defaults "
+                "to AFIP_TICKET_RENEWAL_WINDOW."
+            ),
+        )
+
+    def handle(self, *args, **options) -> None:
+        for ticket in models.AuthTicket.objects.renew_expired(options["window"]):
+            self.stdout.write(
+                _("Renewed the %(service)s ticket for %(owner)s.")
+                % {"service": ticket.service, "owner": ticket.owner}
+            )
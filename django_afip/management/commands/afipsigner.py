@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from typing import TYPE_CHECKING
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils.translation import gettext as _
+
+from django_afip import signers
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = _("Runs a daemon which signs authentication requests for other processes.")
+    requires_migrations_checks = True
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--socket",
+            required=True,
+            help=_("The path of the Unix socket to listen on."),
+        )
+        parser.add_argument(
+            "--mode",
+            type=lambda mode: int(mode, 8),
+            default=0o600,
+            help=_(
+                "The permissions of the Unix socket, in octal. Defaults to 600 "
+                "(only accessible by its owner)."
+            ),
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            help=_("The amount of signing processes. Defaults to one per CPU."),
+        )
+
+    def handle(self, *args, **options) -> None:
+        path = options["socket"]
+        with suppress(FileNotFoundError):
+            os.unlink(path)
+
+        # Connections must not be shared with the worker processes:
+        connections.close_all()
+        with (
+            ProcessPoolExecutor(
+                options["processes"],
+                initializer=signers.init_worker,
+            ) as executor,
+            signers.SignerServer(path, executor, options["mode"]) as server,
+        ):
+            self.stdout.write(_("Listening on %(path)s.") % {"path": path})
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os.unlink(path)
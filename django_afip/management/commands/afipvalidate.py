@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.utils.translation import gettext as _
+
+from django_afip import models
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = _(
+        "Validates pending receipts, concurrently for each point of sales and "
+        "receipt type."
+    )
+    requires_migrations_checks = True
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        taxpayers = parser.add_mutually_exclusive_group(required=True)
+        taxpayers.add_argument(
+            "--all",
+            action="store_true",
+            help=_("Validate receipts for all taxpayers."),
+        )
+        taxpayers.add_argument(
+            "--cuit",
+            action="append",
+            type=int,
+            dest="cuits",
+            help=_("Validate receipts for taxpayers with this CUIT. May be repeated."),
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=16,
+            help=_("The amount of groups to validate at once (default: 16)."),
+        )
+
+    def handle(self, *args, **options) -> None:
+        receipts = models.Receipt.objects.all()
+        if options["cuits"]:
+            receipts = receipts.filter(point_of_sales__owner__cuit__in=options["cuits"])
+
+        results = receipts.validate_all(options["concurrency"])
+
+        failed = 0
+        for (point_of_sales, receipt_type), result in results.items():
+            if not result:
+                continue
+            failed += 1
+            errors = [result] if isinstance(result, Exception) else result
+            for error in errors:
+                self.stderr.write(f"{point_of_sales} ({receipt_type}): {error}")
+
+        self.stdout.write(
+            _("Validated receipts for %(count)d groups.")
+            % {"count": len(results) - failed}
+        )
+        if failed:
+            raise CommandError(
+                _("Could not validate receipts for %(count)d groups.")
+                % {"count": failed}
+            )
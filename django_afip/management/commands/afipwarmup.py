@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.core.management.base import BaseCommand
+from django.utils.translation import gettext as _
+
+from django_afip import clients
+
+if TYPE_CHECKING:
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):
+    help = _("Loads and caches the WSDL files for AFIP's web services.")
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--service",
+            action="append",
+            dest="services",
+            help=_("A service to warm up. May be repeated. Defaults to wsaa and wsfe."),
+        )
+        environment = parser.add_mutually_exclusive_group()
+        environment.add_argument(
+            "--sandbox",
+            action="store_const",
+            const=True,
+            dest="sandbox",
+            help=_("Only warm up sandbox clients."),
+        )
+        environment.add_argument(
+            "--production",
+            action="store_const",
+            const=False,
+            dest="sandbox",
+            help=_("Only warm up production clients."),
+        )
+
+    def handle(self, *args, **options) -> None:
+        clients.warm_up(options["services"] or ("wsaa", "wsfe"), options["sandbox"])
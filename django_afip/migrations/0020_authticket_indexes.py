@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("afip", "0019_alter_receiptentry_options"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="authticket",
+            index=models.Index(
+                fields=["owner", "service", "expires"],
+                name="afip_ticket_owner_service_exp",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="authticket",
+            index=models.Index(fields=["expires"], name="afip_ticket_expires"),
+        ),
+    ]
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import base64
+import copy
+import itertools
 import logging
 import os
 import random
 import re
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from datetime import datetime
 from datetime import timedelta
@@ -20,21 +24,31 @@ from typing import Literal
 from typing import TypeVar
 from uuid import uuid4
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core import management
+from django.core.cache import caches
 from django.core.files import File
 from django.core.files.base import ContentFile
 from django.core.files.storage import InvalidStorageError
 from django.core.files.storage import default_storage
 from django.core.files.storage import storages
 from django.core.validators import MinValueValidator
+from django.db import close_old_connections
 from django.db import connection
+from django.db import connections
 from django.db import models
+from django.db import transaction
+from django.db.models import Case
 from django.db.models import CheckConstraint
 from django.db.models import Count
 from django.db.models import F
+from django.db.models import Max
+from django.db.models import Min
 from django.db.models import Q
 from django.db.models import Sum
+from django.db.models import Value
+from django.db.models import When
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
 from lxml import etree
@@ -50,10 +64,15 @@ from django_afip.pdf import PdfBuilder
 from . import clients
 from . import crypto
 from . import exceptions
+from . import helpers
 from . import parsers
 from . import serializers
+from . import signers
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from django.core.cache.backends.base import BaseCache
     from django.core.files.storage import Storage
     from django.db.models.fields.files import FieldFile
 
@@ -86,6 +105,13 @@ CLIENT_VAT_CONDITIONS = (
 # Keys: ConceptType.code, Values: maximum days ago.
 RECEIPT_DATE_OFFSET = {"1": 5, "2": 14, "3": 14}
 
+# The error code returned by WSFE when the token or signature are not valid.
+TICKET_REJECTED_CODE = 600
+
+# The maximum amount of receipts per FECAESolicitar request, as reported by
+# FECompTotXRequest. Keys indicate whether the limit is for the sandbox.
+_max_receipts_per_request: dict[bool, int] = {}
+
 
 def load_metadata() -> None:
     """Loads metadata from fixtures into the database."""
@@ -98,7 +124,7 @@ def load_metadata() -> None:
     management.call_command("loaddata", label, app="afip")
 
 
-def check_response(response) -> None:  # noqa: ANN001
+def check_response(response, ticket: AuthTicket | None = None) -> None:  # noqa: ANN001
     """Check that a response is not an error.
 
     AFIP allows us to create valid tickets with invalid key/CUIT pairs, so we
@@ -109,12 +135,25 @@ def check_response(response) -> None:  # noqa: ANN001
 
     This method checks if responses have an error, and raise a readable
     message.
+
+    Both zeep responses and responses decoded via :mod:`~.parsers` are supported.
+
+    If AFIP rejected the ``ticket`` used for the request, that ticket is invalidated
+    before raising, so that a new one is created for further requests.
     """
-    if "Errors" in response:
-        if response.Errors:
-            raise exceptions.AfipException(response)
+    if isinstance(response, (parsers.CAEResponse, parsers.ReceiptDataResponse)):
+        codes = [error.code for error in response.errors]
+    elif "Errors" in response:
+        codes = [error.Code for error in response.Errors.Err] if response.Errors else []
     elif "errorConstancia" in response and response.errorConstancia:
         raise exceptions.AfipException(response)
+    else:
+        codes = []
+
+    if codes:
+        if ticket is not None and TICKET_REJECTED_CODE in codes:
+            ticket.invalidate()
+        raise exceptions.AfipException(response)
 
 
 def first_currency() -> int | None:
@@ -182,17 +221,32 @@ class GenericAfipTypeManager(models.Manager, Generic[_T]):
         ticket = ticket or AuthTicket.objects.get_any_active("wsfe")
         client = clients.get_client("wsfe", ticket.owner.is_sandboxed)
         service = getattr(client.service, self.__service_name)
-        response_xml = service(serializers.serialize_ticket(ticket))
+        with clients.on_behalf_of(ticket.owner.cuit):
+            response_xml = service(serializers.serialize_ticket(ticket))
 
-        check_response(response_xml)
+        check_response(response_xml, ticket)
 
-        for result in getattr(response_xml.ResultGet, self.__type_name):
-            self.get_or_create(
-                code=result.Id,
-                description=result.Desc,
-                valid_from=parsers.parse_date(result.FchDesde),
-                valid_to=parsers.parse_date_maybe(result.FchHasta),
+        existing = set(
+            self.values_list("code", "description", "valid_from", "valid_to")
+        )
+        self.bulk_create(
+            self.model(
+                code=code,
+                description=description,
+                valid_from=valid_from,
+                valid_to=valid_to,
             )
+            for code, description, valid_from, valid_to in {
+                (
+                    str(result.Id),
+                    result.Desc,
+                    parsers.parse_date(result.FchDesde),
+                    parsers.parse_date_maybe(result.FchHasta),
+                )
+                for result in getattr(response_xml.ResultGet, self.__type_name)
+            }
+            - existing
+        )
 
     def get_by_natural_key(self, code: str) -> _T:
         return self.get(code=code)
@@ -560,21 +614,39 @@ class TaxPayer(models.Model):
 
         Tickets are saved to the database. It is recommended to use the
         :meth:`~.TaxPayer.get_or_create_ticket` method instead.
+
+        If the ``AFIP_PURGE_EXPIRED_TICKETS`` setting is enabled, this taxpayer's
+        expired tickets for the same service are deleted.
         """
         ticket = AuthTicket(owner=self, service=service)
         ticket.authorize()
+        ticket_cache.set(ticket)
+
+        if getattr(settings, "AFIP_PURGE_EXPIRED_TICKETS", False):
+            self.auth_tickets.filter(
+                service=service,
+                expires__lte=datetime.now(timezone.utc),
+            ).delete()
         return ticket
 
     def get_ticket(self, service: str) -> AuthTicket | None:
         """Return an existing AuthTicket for a given service, if any.
 
+        Active tickets are cached (see :class:`~.TicketCache`), so the database is
+        only queried the first time a ticket is requested.
+
         It is recommended to use the :meth:`~.TaxPayer.get_or_create_ticket` method
         instead.
         """
-        return self.auth_tickets.filter(
-            expires__gt=datetime.now(timezone.utc),
-            service=service,
-        ).last()
+        ticket = ticket_cache.get(self, service)
+        if ticket is None:
+            ticket = self.auth_tickets.filter(
+                expires__gt=datetime.now(timezone.utc),
+                service=service,
+            ).last()
+            if ticket is not None:
+                ticket_cache.set(ticket)
+        return ticket
 
     def get_or_create_ticket(self, service: str) -> AuthTicket:
         """
@@ -585,8 +657,72 @@ class TaxPayer(models.Model):
 
         This is generally the preferred method of obtaining tickets for any
         service.
+
+        Only one ticket is created at a time for each taxpayer, even across
+        processes: concurrent callers wait for it and reuse it, rather than each
+        requesting their own (which AFIP would reject).
         """
-        return self.get_ticket(service) or self.create_ticket(service)
+        return (
+            self.get_ticket(service)
+            or self._get_or_create_ticket_exclusively(service)[0]
+        )
+
+    def _get_or_create_ticket_exclusively(
+        self,
+        service: str,
+    ) -> tuple[AuthTicket, bool]:
+        """Return a valid ticket, creating it if needed.
+
+        This taxpayer's row is locked meanwhile, so that only one process creates a
+        ticket; others wait for the lock and then find the new ticket.
+
+        Returns a tuple with the format ``(ticket, created)``.
+        """
+        with transaction.atomic():
+            TaxPayer.objects.select_for_update().values_list("pk").get(pk=self.pk)
+
+            # Another process may have created a ticket while we waited:
+            ticket = self.auth_tickets.filter(
+                expires__gt=datetime.now(timezone.utc),
+                service=service,
+            ).last()
+            if ticket is not None:
+                ticket_cache.set(ticket)
+                return ticket, False
+
+            return self.create_ticket(service), True
+
+    async def acreate_ticket(self, service: str) -> AuthTicket:
+        """Asynchronous version of :meth:`create_ticket`."""
+        ticket = AuthTicket(owner=self, service=service)
+        await ticket.aauthorize()
+        await ticket_cache.aset(ticket)
+        return ticket
+
+    async def aget_ticket(self, service: str) -> AuthTicket | None:
+        """Asynchronous version of :meth:`get_ticket`."""
+        ticket = await ticket_cache.aget(self, service)
+        if ticket is None:
+            ticket = await self.auth_tickets.filter(
+                expires__gt=datetime.now(timezone.utc),
+                service=service,
+            ).alast()
+            if ticket is not None:
+                await ticket_cache.aset(ticket)
+        return ticket
+
+    async def aget_or_create_ticket(self, service: str) -> AuthTicket:
+        """Asynchronous version of :meth:`get_or_create_ticket`.
+
+        Since it requires a database transaction, creating a ticket is done
+        synchronously, in a thread.
+        """
+        ticket = await self.aget_ticket(service)
+        if ticket is None:
+            ticket, _ = await sync_to_async(self._get_or_create_ticket_exclusively)(
+                service,
+            )
+        return ticket
 
     def fetch_points_of_sales(
         self,
@@ -603,10 +739,11 @@ class TaxPayer(models.Model):
         ticket = ticket or self.get_or_create_ticket("wsfe")
 
         client = clients.get_client("wsfe", self.is_sandboxed)
-        response = client.service.FEParamGetPtosVenta(
-            serializers.serialize_ticket(ticket),
-        )
-        check_response(response)
+        with clients.on_behalf_of(self.cuit):
+            response = client.service.FEParamGetPtosVenta(
+                serializers.serialize_ticket(ticket),
+            )
+        check_response(response, ticket)
 
         results = []
 
@@ -764,28 +901,240 @@ class PointOfSales(models.Model):
 
 class AuthTicketManager(models.Manager["AuthTicket"]):
     def get_any_active(self, service: str) -> AuthTicket:
-        """Return a valid, active ticket for a given service."""
-        ticket = AuthTicket.objects.filter(
-            token__isnull=False,
-            expires__gt=datetime.now(timezone.utc),
-            service=service,
-        ).first()
+        """Return a valid, active ticket for a given service.
+
+        If the ``AFIP_DEFAULT_TAXPAYER`` setting is set to a CUIT, a ticket for that
+        taxpayer is always used. Otherwise, the active ticket that expires last is
+        returned, so that the same one is reused for as long as possible. If there
+        are no active tickets, one is created for the first taxpayer.
+        """
+        cuit = getattr(settings, "AFIP_DEFAULT_TAXPAYER", None)
+        if cuit is not None:
+            taxpayer = TaxPayer.objects.filter(cuit=cuit).order_by("pk").first()
+            if not taxpayer:
+                raise exceptions.AuthenticationError(
+                    _("There is no taxpayer with CUIT %s.") % cuit,
+                )
+            return taxpayer.get_or_create_ticket(service)
+
+        ticket = (
+            AuthTicket.objects.select_related("owner")
+            .filter(
+                token__isnull=False,
+                expires__gt=datetime.now(timezone.utc),
+                service=service,
+            )
+            .order_by("-expires")
+            .first()
+        )
         if ticket:
             return ticket
 
-        taxpayer = TaxPayer.objects.order_by("?").first()
+        taxpayer = TaxPayer.objects.order_by("pk").first()
 
         if not taxpayer:
             raise exceptions.AuthenticationError(
                 _("There are no taxpayers to generate a ticket."),
             )
 
-        return taxpayer.create_ticket(service)
+        return taxpayer.get_or_create_ticket(service)
+
+    def _newest_per_pair(self) -> models.QuerySet:
+        """Return the expiration of the newest ticket for each taxpayer and service."""
+        return (
+            self.values("owner", "service")
+            .annotate(latest=Max("expires"))
+            .order_by("owner", "service")
+        )
+
+    def next_expiration(self) -> datetime | None:
+        """Return when the next ticket that needs to be renewed expires.
+
+        Only the newest ticket of each taxpayer and service is considered. Returns
+        ``None`` if none of them is still valid.
+        """
+        return (
+            self._newest_per_pair()
+            .filter(latest__gt=datetime.now(timezone.utc))
+            .aggregate(next=Min("latest"))["next"]
+        )
+
+    def renew_expired(self, window: float | None = None) -> list[AuthTicket]:
+        """Create new tickets to replace those which have just expired.
+
+        A ticket is created for each taxpayer and service whose newest ticket
+        expired within the last ``window`` seconds. Pairs whose tickets expired
+        earlier are left alone; they'll get a new one on demand.
+
+        AFIP refuses to issue a new ticket while the previous one is still valid,
+        so tickets can't be renewed ahead of time. If AFIP still considers the
+        previous ticket valid (e.g.: if clocks are skewed), the pair is skipped
+        quietly, and retried on the next call. Other failures are logged and
+        skipped.
+
+        :param window: Defaults to the ``AFIP_TICKET_RENEWAL_WINDOW`` setting.
+        :returns: The newly created tickets.
+        """
+        if window is None:
+            window = get_renewal_window()
+
+        now = datetime.now(timezone.utc)
+        expired = list(
+            self._newest_per_pair().filter(
+                latest__lte=now,
+                latest__gt=now - timedelta(seconds=window),
+            )
+        )
+        owners = TaxPayer.objects.in_bulk({row["owner"] for row in expired})
+
+        renewed = []
+        for row in expired:
+            owner = owners[row["owner"]]
+            try:
+                # Skips tickets already renewed by another process:
+                ticket, created = owner._get_or_create_ticket_exclusively(
+                    row["service"],
+                )
+            except exceptions.TicketAlreadyExists:
+                logger.debug(
+                    "The %s ticket for %s is still valid for AFIP.",
+                    row["service"],
+                    owner,
+                )
+                continue
+            except Exception:
+                logger.warning(
+                    "Could not renew the %s ticket for %s.",
+                    row["service"],
+                    owner,
+                    exc_info=True,
+                )
+                continue
+            if created:
+                renewed.append(ticket)
+        return renewed
+
+    def authorize_many(
+        self,
+        taxpayers: Iterable[TaxPayer],
+        service: str,
+        concurrency: int = 16,
+    ) -> tuple[list[AuthTicket], list[tuple[TaxPayer, Exception]]]:
+        """Create tickets for many taxpayers concurrently.
+
+        All requests are signed with a single call to the signer's
+        :meth:`~.signers.Signer.sign_many`, and then sent to AFIP from a pool of
+        ``concurrency`` threads. Taxpayers sharing a certificate are authorized one
+        after the other, since AFIP won't authorize the same certificate
+        concurrently. New tickets are saved with a single query.
+
+        Unlike :meth:`~.TaxPayer.get_or_create_ticket`, this always requests new
+        tickets, even if taxpayers have active ones. AFIP refuses to issue a new
+        ticket while a previous one is still valid; in that case, the taxpayer's
+        active ticket is returned instead, if it is known locally.
+
+        :returns: A tuple with the new (or reused) tickets, and a list of
+            ``(taxpayer, error)`` for those which failed.
+        """
+        tickets = [
+            AuthTicket(owner=taxpayer, service=service) for taxpayer in taxpayers
+        ]
+        signatures = _sign_many(
+            [(ticket.owner, ticket._create_request_xml()) for ticket in tickets]
+        )
+
+        by_certificate: dict[str, list[tuple[AuthTicket, bytes | Exception]]] = {}
+        for ticket, signature in zip(tickets, signatures, strict=True):
+            by_certificate.setdefault(ticket.owner.certificate.name, []).append(
+                (ticket, signature)
+            )
+
+        def login(
+            pending: list[tuple[AuthTicket, bytes | Exception]],
+        ) -> list[tuple[AuthTicket, Exception | None]]:
+            results: list[tuple[AuthTicket, Exception | None]] = []
+            for ticket, signature in pending:
+                try:
+                    if isinstance(signature, Exception):
+                        raise signature
+                    ticket._login(signature)
+                except Exception as e:
+                    results.append((ticket, e))
+                else:
+                    results.append((ticket, None))
+            return results
+
+        created, reused, failed = [], [], []
+        with ThreadPoolExecutor(concurrency) as executor:
+            for results in executor.map(login, by_certificate.values()):
+                for ticket, error in results:
+                    if error is None:
+                        created.append(ticket)
+                    elif isinstance(error, exceptions.TicketAlreadyExists) and (
+                        existing := ticket.owner.get_ticket(service)
+                    ):
+                        reused.append(existing)
+                    else:
+                        failed.append((ticket.owner, error))
+
+        self.bulk_create(created)
+        for ticket in created:
+            ticket_cache.set(ticket)
+        return created + reused, failed
+
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        """Delete all expired tickets.
+
+        Tickets are deleted in batches of ``batch_size``, each in a separate
+        statement, so that the table is never locked for long.
+
+        :returns: The amount of tickets deleted.
+        """
+        now = datetime.now(timezone.utc)
+        deleted = 0
+        while True:
+            batch = list(
+                self.filter(expires__lte=now).values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch:
+                return deleted
+            deleted += self.filter(pk__in=batch).delete()[0]
 
     def get_by_natural_key(self, unique_id: int) -> AuthTicket:
         return self.get(unique_id=unique_id)
 
 
+def _sign_many(requests: list[tuple[TaxPayer, bytes]]) -> list[bytes | Exception]:
+    """Sign ``requests`` with a single batch, returning signatures in order.
+
+    If signing the batch fails, requests are signed one by one, and the error for
+    each one that fails is returned in place of its signature.
+    """
+    signer = signers.get_signer()
+    try:
+        return list(signer.sign_many(requests))
+    except Exception:
+        logger.warning("Could not sign requests as a batch.", exc_info=True)
+
+    signatures: list[bytes | Exception] = []
+    for taxpayer, data in requests:
+        try:
+            signatures.append(signer.sign(taxpayer, data))
+        except Exception as e:
+            signatures.append(e)
+    return signatures
+
+
+def get_renewal_window() -> float:
+    """Return for how many seconds after expiring tickets are renewed.
+
+    Tickets which expired earlier than that are assumed to be unused, and are
+    not renewed. This is configured via the ``AFIP_TICKET_RENEWAL_WINDOW``
+    setting (30 minutes, by default).
+    """
+    return getattr(settings, "AFIP_TICKET_RENEWAL_WINDOW", 30 * 60)
+
+
 def default_generated() -> datetime:
     """The default generated date for new tickets."""
     return datetime.now(TZ_AR)
@@ -849,11 +1198,20 @@ class AuthTicket(models.Model):
     class Meta:
         verbose_name = _("authorization ticket")
         verbose_name_plural = _("authorization tickets")
+        indexes = (
+            # Used to find a taxpayer's active ticket for a service:
+            models.Index(
+                fields=("owner", "service", "expires"),
+                name="afip_ticket_owner_service_exp",
+            ),
+            # Used to find any active ticket, and to purge expired ones:
+            models.Index(fields=("expires",), name="afip_ticket_expires"),
+        )
 
     def __str__(self) -> str:
         return str(self.unique_id)
 
-    def __create_request_xml(self) -> bytes:
+    def _create_request_xml(self) -> bytes:
         """Create a new ticket request XML
 
         This is the payload we sent to AFIP to request a new ticket."""
@@ -870,40 +1228,268 @@ class AuthTicket(models.Model):
         return etree.tostring(request_xml, pretty_print=True)
 
     def __sign_request(self, request: bytes) -> bytes:
-        with self.owner.certificate.file.open("rb") as f:
-            cert = f.read()
+        return signers.get_signer().sign(self.owner, request)
 
-        with self.owner.key.file.open("rb") as f:
-            key = f.read()
+    def __create_signed_request(self) -> str:
+        """Create the signed and encoded payload for ``loginCms``."""
+        request_xml = self._create_request_xml()
+        signed_request = self.__sign_request(request_xml)
+        return base64.b64encode(signed_request).decode()
+
+    @staticmethod
+    def __translate_fault(e: Fault) -> exceptions.AuthenticationError:
+        """Return the exception that should be raised for a ``loginCms`` fault."""
+        if str(e) == "Certificado expirado":
+            return exceptions.CertificateExpired(str(e))
+        if str(e) == "Certificado no emitido por AC de confianza":
+            return exceptions.UntrustedCertificate(str(e))
+        if str(e).startswith("El CEE ya posee un TA valido"):
+            return exceptions.TicketAlreadyExists(str(e))
+        return exceptions.AuthenticationError(str(e))
+
+    def __load_response(self, raw_response: str) -> None:
+        """Load the token and signature from a ``loginCms`` response."""
+        response = etree.fromstring(raw_response.encode("utf-8"))
 
-        return crypto.create_embeded_pkcs7_signature(request, cert, key)
+        self.token = response.xpath(self.TOKEN_XPATH)[0].text
+        self.signature = response.xpath(self.SIGN_XPATH)[0].text
 
     def authorize(self) -> None:
         """Send this ticket to AFIP for authorization."""
-        request_xml = self.__create_request_xml()
-        signed_request = self.__sign_request(request_xml)
-        request = base64.b64encode(signed_request).decode()
+        self._login()
+        self.save()
+
+    def _login(self, signed_request: bytes | None = None) -> None:
+        """Sign and send this ticket to AFIP, loading the response, but not saving.
+
+        This touches no database, so may be run concurrently from threads.
+
+        :param signed_request: The signed request XML, if it has already been signed.
+        """
+        if signed_request is None:
+            request = self.__create_signed_request()
+        else:
+            request = base64.b64encode(signed_request).decode()
 
         client = clients.get_client("wsaa", self.owner.is_sandboxed)
         try:
-            raw_response = client.service.loginCms(request)
+            with clients.on_behalf_of(self.owner.cuit):
+                raw_response = client.service.loginCms(request)
         except Fault as e:
-            if str(e) == "Certificado expirado":
-                raise exceptions.CertificateExpired(str(e)) from e
-            if str(e) == "Certificado no emitido por AC de confianza":
-                raise exceptions.UntrustedCertificate(str(e)) from e
-            raise exceptions.AuthenticationError(str(e)) from e
-        response = etree.fromstring(raw_response.encode("utf-8"))
+            raise self.__translate_fault(e) from e
+        self.__load_response(raw_response)
 
-        self.token = response.xpath(self.TOKEN_XPATH)[0].text
-        self.signature = response.xpath(self.SIGN_XPATH)[0].text
+    async def aauthorize(self) -> None:
+        """Asynchronous version of :meth:`authorize`."""
+        owner = await sync_to_async(lambda: self.owner)()
+        request = await sync_to_async(self.__create_signed_request)()
 
-        self.save()
+        client = await sync_to_async(clients.get_async_client)(
+            "wsaa",
+            owner.is_sandboxed,
+        )
+        try:
+            with clients.on_behalf_of(owner.cuit):
+                raw_response = await client.service.loginCms(request)
+        except Fault as e:
+            raise self.__translate_fault(e) from e
+        self.__load_response(raw_response)
+
+        await self.asave()
+
+    def invalidate(self) -> None:
+        """Mark this ticket as expired, so that it is no longer used.
+
+        This is done automatically when AFIP rejects a ticket.
+        """
+        self.expires = datetime.now(timezone.utc)
+        AuthTicket.objects.filter(pk=self.pk).update(expires=self.expires)
+        ticket_cache.delete(self.owner_id, self.service)
 
     def natural_key(self) -> tuple[int]:
         return (self.unique_id,)
 
 
+class TicketCache:
+    """A cache of active tickets, keyed by taxpayer and service.
+
+    Tickets are always cached in-process. If the ``AFIP_TICKET_CACHE`` setting names
+    one of Django's caches, tickets are also shared via that cache, so that other
+    processes need not query the database either.
+
+    Entries expire along with their ticket. Applications should not generally need
+    to use this class directly; the instance used by :class:`~.TaxPayer` is
+    ``django_afip.models.ticket_cache``.
+    """
+
+    def __init__(self) -> None:
+        self._tickets: dict[tuple[int, str], AuthTicket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(taxpayer_id: int, service: str) -> str:
+        return f"django_afip:ticket:{taxpayer_id}:{service}"
+
+    @staticmethod
+    def _shared() -> BaseCache | None:
+        alias = getattr(settings, "AFIP_TICKET_CACHE", None)
+        return caches[alias] if alias else None
+
+    @staticmethod
+    def _timeout(ticket: AuthTicket) -> float:
+        return (ticket.expires - datetime.now(timezone.utc)).total_seconds()
+
+    @staticmethod
+    def _dump(ticket: AuthTicket) -> dict[str, object]:
+        return {
+            field.attname: getattr(ticket, field.attname)
+            for field in AuthTicket._meta.concrete_fields
+        }
+
+    def _load(
+        self,
+        taxpayer: TaxPayer,
+        service: str,
+        values: dict[str, object] | None,
+    ) -> AuthTicket | None:
+        """Return an active ticket from the local cache or shared ``values``."""
+        key = (taxpayer.pk, service)
+        with self._lock:
+            ticket = self._tickets.get(key)
+            if ticket is None and values is not None:
+                ticket = AuthTicket.from_db(
+                    taxpayer._state.db,
+                    list(values),
+                    list(values.values()),
+                )
+                self._tickets[key] = ticket
+            if ticket is None:
+                return None
+            if self._timeout(ticket) <= 0:
+                del self._tickets[key]
+                return None
+
+        # Return a copy, so that callers can't alter the cached instance:
+        ticket = copy.copy(ticket)
+        ticket.owner = taxpayer
+        return ticket
+
+    def _store(self, ticket: AuthTicket) -> None:
+        # Don't keep a reference to the owner, which callers may alter:
+        cached = copy.copy(ticket)
+        cached._state.fields_cache.clear()
+        with self._lock:
+            self._tickets[(ticket.owner_id, ticket.service)] = cached
+
+    def get(self, taxpayer: TaxPayer, service: str) -> AuthTicket | None:
+        """Return a cached, active ticket, if any."""
+        ticket = self._load(taxpayer, service, None)
+        if ticket is None and (shared := self._shared()) is not None:
+            values = shared.get(self._key(taxpayer.pk, service))
+            ticket = self._load(taxpayer, service, values)
+        return ticket
+
+    async def aget(self, taxpayer: TaxPayer, service: str) -> AuthTicket | None:
+        """Asynchronous version of :meth:`get`."""
+        ticket = self._load(taxpayer, service, None)
+        if ticket is None and (shared := self._shared()) is not None:
+            values = await shared.aget(self._key(taxpayer.pk, service))
+            ticket = self._load(taxpayer, service, values)
+        return ticket
+
+    def set(self, ticket: AuthTicket) -> None:
+        """Cache a ticket until it expires."""
+        self._store(ticket)
+        if (shared := self._shared()) is not None:
+            shared.set(
+                self._key(ticket.owner_id, ticket.service),
+                self._dump(ticket),
+                self._timeout(ticket),
+            )
+
+    async def aset(self, ticket: AuthTicket) -> None:
+        """Asynchronous version of :meth:`set`."""
+        self._store(ticket)
+        if (shared := self._shared()) is not None:
+            await shared.aset(
+                self._key(ticket.owner_id, ticket.service),
+                self._dump(ticket),
+                self._timeout(ticket),
+            )
+
+    def delete(self, taxpayer_id: int, service: str) -> None:
+        """Remove a ticket from the cache."""
+        with self._lock:
+            self._tickets.pop((taxpayer_id, service), None)
+        if (shared := self._shared()) is not None:
+            shared.delete(self._key(taxpayer_id, service))
+
+    def clear(self) -> None:
+        """Remove all tickets from the in-process cache."""
+        with self._lock:
+            self._tickets.clear()
+
+
+ticket_cache = TicketCache()
+
+
+class TicketRenewer(threading.Thread):
+    """A daemon thread which renews tickets as soon as they expire.
+
+    This keeps requests from having to wait for a new ticket to be authorized.
+    The thread wakes up right after the next ticket expires (see
+    :meth:`~.AuthTicketManager.next_expiration`), and renews it (see
+    :meth:`~.AuthTicketManager.renew_expired`). Only a single process needs to
+    run a renewer; the ``afiprenewtickets`` command may be run periodically
+    instead::
+
+        TicketRenewer().start()
+
+    :param interval: The maximum amount of seconds between renewals. Tickets
+        which couldn't be renewed, or which were created by other processes, are
+        picked up within this time.
+    :param window: Defaults to ``AFIP_TICKET_RENEWAL_WINDOW``.
+    """
+
+    #: Seconds to wait after a ticket expires before renewing it, so that AFIP
+    #: doesn't consider it valid anymore.
+    DELAY = 1
+
+    def __init__(
+        self,
+        interval: float = 60,
+        window: float | None = None,
+    ) -> None:
+        super().__init__(name="django-afip-ticket-renewer", daemon=True)
+        self.interval = interval
+        self.window = window
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            self._stopped.wait(self.renew())
+
+    def renew(self) -> float:
+        """Renew expired tickets, and return how long to wait until the next run."""
+        try:
+            AuthTicket.objects.renew_expired(self.window)
+            expiration = AuthTicket.objects.next_expiration()
+        except Exception:
+            logger.warning("Could not renew tickets.", exc_info=True)
+            return self.interval
+        finally:
+            close_old_connections()
+
+        if expiration is None:
+            return self.interval
+        remaining = (expiration - datetime.now(timezone.utc)).total_seconds()
+        return min(max(remaining, 0) + self.DELAY, self.interval)
+
+    def stop(self) -> None:
+        """Stop renewing tickets; the thread exits shortly afterwards."""
+        self._stopped.set()
+
+
 class ReceiptQuerySet(models.QuerySet):
     """The default queryset obtains when querying via :class:`~.ReceiptManager`."""
 
@@ -911,32 +1497,66 @@ class ReceiptQuerySet(models.QuerySet):
     # Inspired by Django's flag of the same name for `Atomic`.
     _ensure_durability = True
 
-    def _assign_numbers(self) -> None:
+    #: The maximum amount of receipts numbered with a single ``UPDATE``. Keeps the
+    #: amount of query parameters within the limits of all supported databases.
+    ASSIGN_NUMBERS_BATCH_SIZE = 500
+
+    def _assign_numbers(
+        self,
+        last_number: int | None = None,
+        ticket: AuthTicket | None = None,
+    ) -> dict[int, int]:
         """Assign numbers in preparation for validating these receipts.
 
         WARNING: Don't call the method manually unless you know what you're
         doing!
+
+        Numbers are assigned in the queryset's order, with a single ``UPDATE`` per
+        :attr:`ASSIGN_NUMBERS_BATCH_SIZE` receipts. Receipts are only updated if
+        they still have no number, so any numbered concurrently are left as-is.
+
+        :param last_number: The number of the last receipt validated by AFIP. If
+            ``None``, it is fetched from AFIP's WS.
+        :param ticket: The ticket used to fetch the last number, if needed.
+        :returns: A mapping of the ID of each numbered receipt to its new number.
         """
-        first = self.select_related("point_of_sales", "receipt_type").first()
-        assert first is not None  # should never happen; mostly a hint for mypy
+        if last_number is None:
+            first = self.select_related("point_of_sales", "receipt_type").first()
+            assert first is not None  # should never happen; mostly a hint for mypy
 
-        next_num = (
-            Receipt.objects.fetch_last_receipt_number(
+            last_number = Receipt.objects.fetch_last_receipt_number(
                 first.point_of_sales,
                 first.receipt_type,
+                ticket,
             )
-            + 1
-        )
 
-        for receipt in self.filter(receipt_number__isnull=True):
-            # Atomically update receipt number
-            Receipt.objects.filter(
-                pk=receipt.id,
+        pks = self.filter(receipt_number__isnull=True).values_list("pk", flat=True)
+        numbers = dict(zip(pks, itertools.count(last_number + 1)))
+
+        batch_size = self.ASSIGN_NUMBERS_BATCH_SIZE
+        items = list(numbers.items())
+        updated = 0
+        for i in range(0, len(items), batch_size):
+            batch = items[i : i + batch_size]
+            updated += Receipt.objects.filter(
+                pk__in=[pk for pk, _ in batch],
                 receipt_number__isnull=True,
             ).update(
-                receipt_number=next_num,
+                receipt_number=Case(
+                    *(When(pk=pk, then=Value(number)) for pk, number in batch),
+                ),
             )
-            next_num += 1
+
+        if updated < len(numbers):
+            # Some receipts were numbered concurrently; keep only our own:
+            numbers = {
+                pk: number
+                for pk, number in Receipt.objects.filter(
+                    pk__in=numbers,
+                ).values_list("pk", "receipt_number")
+                if numbers[pk] == number
+            }
+        return numbers
 
     def check_groupable(self) -> ReceiptQuerySet:
         """Check that all receipts returned by this queryset are groupable.
@@ -985,13 +1605,20 @@ class ReceiptQuerySet(models.QuerySet):
         Attempting to validate an empty queryset will simply return an empty
         list.
 
-        This method takes the following steps:
+        AFIP limits how many receipts may be sent in a single request (see
+        :meth:`~.ReceiptManager.fetch_max_receipts_per_request`), so receipts are
+        sent in chunks of up to that size. For each chunk, this method takes the
+        following steps:
 
-            - Assigns numbers to all receipts.
+            - Assigns numbers to the chunk's receipts.
             - Saves the assigned numbers to the database.
             - Sends the receipts to AFIP.
             - Saves the results into the local DB.
 
+        If any receipt in a chunk fails validation, later chunks are not sent (and
+        are left without numbers), since AFIP requires receipts to be numbered
+        sequentially.
+
         Should execution be interrupted (e.g.: a power failure), receipts will have been
         saved with their number. In this case, the ``revalidate`` method should be used,
         to determine if they have been registered by AFIP, or if the interruption
@@ -1001,6 +1628,196 @@ class ReceiptQuerySet(models.QuerySet):
         doing so risks leaving the database in an inconsistent state should there be any
         fatal interruptions. In particular, the receipt numbers will not have been
         saved, so it would be impossible to recover from the incomplete operation.
+
+        If ``AFIP_CIRCUIT_BREAKER`` is enabled and AFIP reports an outage,
+        :class:`~.exceptions.ServiceUnavailable` is raised before any receipts are
+        numbered.
+        """
+        qs, first = self._prepare_validation()
+
+        # Return early if queryset is empty:
+        if first is None:
+            return []
+
+        owner = first.point_of_sales.owner
+        helpers.check_circuit_breaker(not owner.is_sandboxed)
+        ticket = ticket or owner.get_or_create_ticket("wsfe")
+        limit = Receipt.objects.fetch_max_receipts_per_request(ticket)
+        last_number = Receipt.objects.fetch_last_receipt_number(
+            first.point_of_sales,
+            first.receipt_type,
+            ticket,
+        )
+
+        errs: list[str] = []
+        while True:
+            chunk, size = qs._next_chunk(limit)
+            if not size:
+                return errs
+            numbers = chunk.order_by("issued_date", "id")._assign_numbers(last_number)
+
+            client = clients.get_client("wsfe", owner.is_sandboxed)
+            if getattr(settings, "AFIP_RAW_SOAP", False):
+                envelope = serializers.render_cae_request(ticket, chunk)
+            else:
+                envelope = clients.render_message(
+                    client,
+                    "FECAESolicitar",
+                    serializers.serialize_ticket(ticket),
+                    serializers.serialize_multiple_receipts(chunk),
+                )
+            with clients.on_behalf_of(owner.cuit):
+                response = clients.send_raw(
+                    client,
+                    "FECAESolicitar",
+                    envelope,
+                    parsers.parse_cae_response,
+                )
+            check_response(response, ticket)
+
+            errs.extend(chunk._save_validation_results(response, numbers))
+            approved = _approved_numbers(response)
+            if len(approved) < size:
+                return errs
+            last_number = max(approved)
+
+    async def avalidate(self, ticket: AuthTicket | None = None) -> list[str]:
+        """Asynchronous version of :meth:`validate`.
+
+        Database operations are executed in a thread, while requests to AFIP's WS
+        are awaited without blocking the event loop. The same caveats regarding
+        transactions and concurrency apply.
+        """
+        qs, first = await sync_to_async(self._prepare_validation)()
+
+        # Return early if queryset is empty:
+        if first is None:
+            return []
+
+        owner = first.point_of_sales.owner
+        await sync_to_async(helpers.check_circuit_breaker)(not owner.is_sandboxed)
+        ticket = ticket or await owner.aget_or_create_ticket("wsfe")
+        limit = await Receipt.objects.afetch_max_receipts_per_request(ticket)
+        last_number = await Receipt.objects.afetch_last_receipt_number(
+            first.point_of_sales,
+            first.receipt_type,
+            ticket,
+        )
+
+        errs: list[str] = []
+        while True:
+            chunk, size = await sync_to_async(qs._next_chunk)(limit)
+            if not size:
+                return errs
+            numbers = await sync_to_async(
+                chunk.order_by("issued_date", "id")._assign_numbers,
+            )(last_number)
+
+            client = await sync_to_async(clients.get_async_client)(
+                "wsfe",
+                owner.is_sandboxed,
+            )
+            if getattr(settings, "AFIP_RAW_SOAP", False):
+                envelope = await sync_to_async(serializers.render_cae_request)(
+                    ticket,
+                    chunk,
+                )
+            else:
+                envelope = clients.render_message(
+                    client,
+                    "FECAESolicitar",
+                    await sync_to_async(serializers.serialize_ticket)(ticket),
+                    await sync_to_async(serializers.serialize_multiple_receipts)(chunk),
+                )
+            with clients.on_behalf_of(owner.cuit):
+                response = await clients.asend_raw(
+                    client,
+                    "FECAESolicitar",
+                    envelope,
+                    parsers.parse_cae_response,
+                )
+            await sync_to_async(check_response)(response, ticket)
+
+            errs.extend(
+                await sync_to_async(chunk._save_validation_results)(response, numbers),
+            )
+            approved = _approved_numbers(response)
+            if len(approved) < size:
+                return errs
+            last_number = max(approved)
+
+    def validate_all(
+        self,
+        concurrency: int = 16,
+    ) -> dict[tuple[PointOfSales, ReceiptType], list[str] | Exception]:
+        """Validate all receipts matching this queryset, in concurrent groups.
+
+        Unlike :meth:`validate`, receipts need not share their point of sales and
+        receipt type. They are grouped by both, and each group is validated via
+        :meth:`validate` from a pool of ``concurrency`` threads. Groups are
+        independent, so a failure in one of them does not affect the others.
+
+        Already-validated receipts are ignored.
+
+        SQLite locks whole tables when writing, so concurrent groups would fail
+        with "database table is locked". On SQLite, groups are validated one after
+        the other, in the calling thread.
+
+        :returns: A mapping of each ``(point_of_sales, receipt_type)`` to the errors
+            returned when validating its receipts or, if validating them raised an
+            exception, to that exception.
+        """
+        if self._ensure_durability and connection.in_atomic_block:
+            raise RuntimeError("This function cannot be called within a transaction")
+
+        pending = self.filter(validation__isnull=True)
+        pairs = set(
+            pending.order_by().values_list("point_of_sales", "receipt_type").distinct()
+        )
+        poses = PointOfSales.objects.select_related("owner").in_bulk(
+            {pos for pos, _ in pairs}
+        )
+        receipt_types = ReceiptType.objects.in_bulk({type_ for _, type_ in pairs})
+        groups = [(poses[pos], receipt_types[type_]) for pos, type_ in pairs]
+
+        def validate(group: tuple[PointOfSales, ReceiptType]) -> list[str] | Exception:
+            point_of_sales, receipt_type = group
+            try:
+                return pending.filter(
+                    point_of_sales=point_of_sales,
+                    receipt_type=receipt_type,
+                ).validate()
+            except Exception as e:
+                logger.warning(
+                    "Could not validate %s receipts for point of sales %s.",
+                    receipt_type,
+                    point_of_sales,
+                    exc_info=True,
+                )
+                return e
+
+        def validate_in_thread(
+            group: tuple[PointOfSales, ReceiptType],
+        ) -> list[str] | Exception:
+            try:
+                return validate(group)
+            finally:
+                # Each thread has its own connection; don't leak them:
+                connections.close_all()
+
+        if connection.vendor == "sqlite":
+            return {group: validate(group) for group in groups}
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            return dict(
+                zip(groups, executor.map(validate_in_thread, groups), strict=True)
+            )
+
+    def _prepare_validation(self) -> tuple[ReceiptQuerySet, Receipt | None]:
+        """Return the receipts pending validation, and the first one among them.
+
+        Raises if called within a transaction, or if receipts cannot be validated
+        together.
         """
         if self._ensure_durability and connection.in_atomic_block:
             raise RuntimeError("This function cannot be called within a transaction")
@@ -1008,71 +1825,189 @@ class ReceiptQuerySet(models.QuerySet):
         # Skip any already-validated ones:
         qs = self.filter(validation__isnull=True).check_groupable()
 
-        # Return early if queryset is empty:
-        first = qs.first()
-        if first is None:
-            return []
+        return qs, qs.select_related("point_of_sales__owner").first()
 
-        qs.order_by("issued_date", "id")._assign_numbers()
+    def _next_chunk(self, limit: int) -> tuple[ReceiptQuerySet, int]:
+        """Return the next (up to) ``limit`` receipts pending validation.
 
-        ticket = ticket or first.point_of_sales.owner.get_or_create_ticket("wsfe")
-        client = clients.get_client("wsfe", first.point_of_sales.owner.is_sandboxed)
-        response = client.service.FECAESolicitar(
-            serializers.serialize_ticket(ticket),
-            serializers.serialize_multiple_receipts(qs),
+        Also returns the amount of receipts in the chunk; it is zero once all
+        receipts have been validated.
+        """
+        pks = list(
+            self.filter(validation__isnull=True)
+            .order_by("issued_date", "id")
+            .values_list("pk", flat=True)[:limit]
         )
-        check_response(response)
-        errs = []
-        for cae_data in response.FeDetResp.FECAEDetResponse:
-            if cae_data.Resultado == "A":
-                validation = ReceiptValidation.objects.create(
-                    cae=cae_data.CAE,
-                    cae_expiration=parsers.parse_date(cae_data.CAEFchVto),
-                    receipt=qs.get(
-                        receipt_number=cae_data.CbteDesde,
-                    ),
-                    processed_date=parsers.parse_datetime(
-                        response.FeCabResp.FchProceso,
-                    ),
+        return self.filter(pk__in=pks), len(pks)
+
+    def _save_validation_results(
+        self,
+        response: parsers.CAEResponse,
+        numbers: dict[int, int] | None = None,
+    ) -> list[str]:
+        """Save the results of a ``FECAESolicitar`` call for these receipts.
+
+        Returns a list of errors for receipts which failed validation.
+
+        Results are saved with a fixed amount of queries, in a single transaction.
+
+        :param numbers: The mapping returned by :meth:`_assign_numbers`. Receipts
+            included are not looked up again by their number.
+        """
+        approved = [cae_data for cae_data in response.results if cae_data.result == "A"]
+        errs = [
+            f"Error {obs.code}: {parsers.parse_string(obs.message)}"
+            for cae_data in response.results
+            if cae_data.result != "A"
+            for obs in cae_data.observations
+        ]
+
+        receipt_ids = {number: pk for pk, number in (numbers or {}).items()}
+        missing = [
+            cae_data.receipt_number
+            for cae_data in approved
+            if cae_data.receipt_number not in receipt_ids
+        ]
+        if missing:
+            receipt_ids.update(
+                self.filter(receipt_number__in=missing).values_list(
+                    "receipt_number",
+                    "pk",
+                ),
+            )
+        validations = [
+            ReceiptValidation(
+                cae=cae_data.cae,
+                cae_expiration=cae_data.cae_expiration,
+                receipt_id=receipt_ids[cae_data.receipt_number],
+                processed_date=response.processed_date,
+            )
+            for cae_data in approved
+        ]
+        observations = [
+            [
+                Observation(code=obs.code, message=obs.message)
+                for obs in cae_data.observations
+            ]
+            for cae_data in approved
+        ]
+
+        through = ReceiptValidation.observations.through
+        with transaction.atomic():
+            ReceiptValidation.objects.bulk_create(validations)
+            if any(observations):
+                _bulk_create_observations(validations, observations)
+            through.objects.bulk_create(
+                through(receiptvalidation_id=validation.pk, observation_id=obs.pk)
+                for validation, validation_observations in zip(
+                    validations,
+                    observations,
+                    strict=True,
                 )
-                if cae_data.Observaciones:
-                    for obs in cae_data.Observaciones.Obs:
-                        observation = Observation.objects.create(
-                            code=obs.Code,
-                            message=obs.Msg,
-                        )
-                    validation.observations.add(observation)
-            elif cae_data.Observaciones:
-                for obs in cae_data.Observaciones.Obs:
-                    errs.append(f"Error {obs.Code}: {parsers.parse_string(obs.Msg)}")
-
-        # Remove the number from ones that failed to validate:
-        qs.filter(validation__isnull=True).update(receipt_number=None)
+                for obs in validation_observations
+            )
+
+            # Remove the number from ones that failed to validate:
+            self.filter(validation__isnull=True).update(receipt_number=None)
 
         return errs
 
 
+def _bulk_create_observations(
+    validations: list[ReceiptValidation],
+    observations: list[list[Observation]],
+) -> None:
+    """Insert ``observations``, and set primary keys for them and ``validations``.
+
+    On databases which cannot return primary keys from bulk inserts (e.g.: MySQL),
+    the keys for validations are queried, and observations are inserted one by one.
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        Observation.objects.bulk_create(itertools.chain.from_iterable(observations))
+        return
+
+    pks = dict(
+        ReceiptValidation.objects.filter(
+            receipt_id__in=[validation.receipt_id for validation in validations],
+        ).values_list("receipt_id", "pk")
+    )
+    for validation in validations:
+        validation.pk = pks[validation.receipt_id]
+    for observation in itertools.chain.from_iterable(observations):
+        observation.save(force_insert=True)
+
+
+def _approved_numbers(response: parsers.CAEResponse) -> list[int]:
+    """Return the numbers of receipts approved in a ``FECAESolicitar`` response."""
+    return [
+        cae_data.receipt_number
+        for cae_data in response.results
+        if cae_data.result == "A"
+    ]
+
+
 class ReceiptManager(models.Manager):
     """Default manager for the :class:`~.Receipt` class.
 
     This should be accessed using ``Receipt.objects``.
     """
 
+    def fetch_max_receipts_per_request(self, ticket: AuthTicket) -> int:
+        """Returns the maximum amount of receipts per ``FECAESolicitar`` request.
+
+        The limit is fetched from AFIP (via ``FECompTotXRequest``) only once, and
+        cached in-process afterwards.
+        """
+        is_sandboxed = ticket.owner.is_sandboxed
+        if is_sandboxed not in _max_receipts_per_request:
+            client = clients.get_client("wsfe", is_sandboxed)
+            with clients.on_behalf_of(ticket.owner.cuit):
+                response_xml = client.service.FECompTotXRequest(
+                    serializers.serialize_ticket(ticket),
+                )
+            check_response(response_xml, ticket)
+            _max_receipts_per_request[is_sandboxed] = response_xml.RegXReq
+
+        return _max_receipts_per_request[is_sandboxed]
+
+    async def afetch_max_receipts_per_request(self, ticket: AuthTicket) -> int:
+        """Asynchronous version of :meth:`fetch_max_receipts_per_request`."""
+        owner = await sync_to_async(lambda: ticket.owner)()
+        if owner.is_sandboxed not in _max_receipts_per_request:
+            client = await sync_to_async(clients.get_async_client)(
+                "wsfe",
+                owner.is_sandboxed,
+            )
+            with clients.on_behalf_of(owner.cuit):
+                response_xml = await client.service.FECompTotXRequest(
+                    await sync_to_async(serializers.serialize_ticket)(ticket),
+                )
+            await sync_to_async(check_response)(response_xml, ticket)
+            _max_receipts_per_request[owner.is_sandboxed] = response_xml.RegXReq
+
+        return _max_receipts_per_request[owner.is_sandboxed]
+
     def fetch_last_receipt_number(
         self,
         point_of_sales: PointOfSales,
         receipt_type: ReceiptType,
+        ticket: AuthTicket | None = None,
     ) -> int:
-        """Returns the number for the last validated receipt."""
+        """Returns the number for the last validated receipt.
+
+        Raises :class:`~.exceptions.ServiceUnavailable` if AFIP reports an outage
+        and ``AFIP_CIRCUIT_BREAKER`` is enabled.
+        """
+        helpers.check_circuit_breaker(not point_of_sales.owner.is_sandboxed)
         client = clients.get_client("wsfe", point_of_sales.owner.is_sandboxed)
-        response_xml = client.service.FECompUltimoAutorizado(
-            serializers.serialize_ticket(
-                point_of_sales.owner.get_or_create_ticket("wsfe")
-            ),
-            point_of_sales.number,
-            receipt_type.code,
-        )
-        check_response(response_xml)
+        ticket = ticket or point_of_sales.owner.get_or_create_ticket("wsfe")
+        with clients.on_behalf_of(point_of_sales.owner.cuit):
+            response_xml = client.service.FECompUltimoAutorizado(
+                serializers.serialize_ticket(ticket),
+                point_of_sales.number,
+                receipt_type.code,
+            )
+        check_response(response_xml, ticket)
 
         # TODO XXX: Error handling
         # (FERecuperaLastCbteResponse){
@@ -1091,29 +2026,66 @@ class ReceiptManager(models.Manager):
 
         return response_xml.CbteNro
 
-    def fetch_receipt_data(  # noqa: ANN201
+    async def afetch_last_receipt_number(
+        self,
+        point_of_sales: PointOfSales,
+        receipt_type: ReceiptType,
+        ticket: AuthTicket | None = None,
+    ) -> int:
+        """Asynchronous version of :meth:`fetch_last_receipt_number`."""
+        owner = await sync_to_async(lambda: point_of_sales.owner)()
+        await sync_to_async(helpers.check_circuit_breaker)(not owner.is_sandboxed)
+        ticket = ticket or await owner.aget_or_create_ticket("wsfe")
+
+        client = await sync_to_async(clients.get_async_client)(
+            "wsfe",
+            owner.is_sandboxed,
+        )
+        with clients.on_behalf_of(owner.cuit):
+            response_xml = await client.service.FECompUltimoAutorizado(
+                await sync_to_async(serializers.serialize_ticket)(ticket),
+                point_of_sales.number,
+                receipt_type.code,
+            )
+        await sync_to_async(check_response)(response_xml, ticket)
+
+        return response_xml.CbteNro
+
+    def fetch_receipt_data(
         self,
         receipt_type: str,
         receipt_number: int,
         point_of_sales: PointOfSales,
-    ):  # TODO: Wrap this in a dataclass
-        """Returns receipt related data"""
+        ticket: AuthTicket | None = None,
+    ) -> parsers.ReceiptData | None:
+        """Returns receipt related data.
+
+        Returns ``None`` if AFIP has no record of such a receipt.
+        """
 
         if not receipt_number:
             return None
 
+        ticket = ticket or point_of_sales.owner.get_or_create_ticket("wsfe")
         client = clients.get_client("wsfe", point_of_sales.owner.is_sandboxed)
-        response_xml = client.service.FECompConsultar(
-            serializers.serialize_ticket(
-                point_of_sales.owner.get_or_create_ticket("wsfe")
-            ),
+        envelope = clients.render_message(
+            client,
+            "FECompConsultar",
+            serializers.serialize_ticket(ticket),
             serializers.serialize_receipt_data(
                 receipt_type, receipt_number, point_of_sales.number
             ),
         )
+        with clients.on_behalf_of(point_of_sales.owner.cuit):
+            response = clients.send_raw(
+                client,
+                "FECompConsultar",
+                envelope,
+                parsers.parse_receipt_data,
+            )
         try:
-            check_response(response_xml)
-            return response_xml.ResultGet
+            check_response(response, ticket)
+            return response.receipt
         except exceptions.AfipException:
             return None
 
@@ -1377,10 +2349,13 @@ class Receipt(models.Model):
         # See: https://github.com/typeddjango/django-stubs/issues/1067
         qs = Receipt.objects.filter(pk=self.pk)
         assert isinstance(qs, ReceiptQuerySet)  # required for mypy
-        rv = qs.validate(ticket)
-        # Since we're operating via a queryset, this instance isn't properly
-        # updated:
-        self.refresh_from_db()
+        try:
+            rv = qs.validate(ticket)
+        finally:
+            # Since we're operating via a queryset, this instance isn't properly
+            # updated. Refresh it even on failure, since it may have been numbered
+            # (e.g.: so that it may be revalidated after a timeout):
+            self.refresh_from_db()
         if raise_ and rv:
             raise exceptions.ValidationError(rv[0])
         return rv
@@ -1412,22 +2387,22 @@ class Receipt(models.Model):
         if not receipt_data:
             return None
 
-        if receipt_data.Resultado == "A":
+        if receipt_data.result == "A":
             validation = ReceiptValidation.objects.create(
-                cae=receipt_data.CodAutorizacion,
-                cae_expiration=parsers.parse_date(receipt_data.FchVto),
+                cae=receipt_data.cae,
+                cae_expiration=receipt_data.cae_expiration,
                 receipt=self,
-                processed_date=parsers.parse_datetime(
-                    receipt_data.FchProceso,
-                ),
+                processed_date=receipt_data.processed_date,
+            )
+            validation.observations.add(
+                *(
+                    Observation.objects.get_or_create(
+                        code=obs.code,
+                        message=obs.message,
+                    )[0]
+                    for obs in receipt_data.observations
+                )
             )
-            if receipt_data.Observaciones:
-                for obs in receipt_data.Observaciones.Obs:
-                    observation, _ = Observation.objects.get_or_create(
-                        code=obs.Code,
-                        message=obs.Msg,
-                    )
-                validation.observations.add(observation)
             return validation
         return None
 
@@ -1941,19 +2916,36 @@ class ClientVatConditionManager(models.Manager["ClientVatCondition"]):
 
         ticket = ticket or AuthTicket.objects.get_any_active("wsfe")
         client = clients.get_client("wsfe", ticket.owner.is_sandboxed)
-        response = client.service.FEParamGetCondicionIvaReceptor(
-            serializers.serialize_ticket(ticket),
-        )
-        check_response(response)
+        with clients.on_behalf_of(ticket.owner.cuit):
+            response = client.service.FEParamGetCondicionIvaReceptor(
+                serializers.serialize_ticket(ticket),
+            )
+        check_response(response, ticket)
 
+        existing = {condition.code: condition for condition in self.all()}
+        created, updated = [], []
         for condition_data in response.ResultGet.CondicionIvaReceptor:
-            self.update_or_create(
-                code=condition_data.Id,
-                defaults={
-                    "description": condition_data.Desc,
-                    "cmp_clase": condition_data.Cmp_Clase,
-                },
-            )
+            code = str(condition_data.Id)
+            condition = existing.get(code)
+            if condition is None:
+                created.append(
+                    self.model(
+                        code=code,
+                        description=condition_data.Desc,
+                        cmp_clase=condition_data.Cmp_Clase,
+                    )
+                )
+            elif (condition.description, condition.cmp_clase) != (
+                condition_data.Desc,
+                condition_data.Cmp_Clase,
+            ):
+                condition.description = condition_data.Desc
+                condition.cmp_clase = condition_data.Cmp_Clase
+                updated.append(condition)
+
+        with transaction.atomic():
+            self.bulk_create(created)
+            self.bulk_update(updated, ["description", "cmp_clase"])
 
 
 class ClientVatCondition(models.Model):
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import date
 from datetime import datetime
+from decimal import Decimal
+from io import BytesIO
+
+from lxml import etree
 
 from django_afip.clients import TZ_AR
 
@@ -33,3 +38,157 @@ def parse_string(string: str) -> str:
     except UnicodeDecodeError:
         # It looks like SOME errors are plain UTF-8 text.
         return string
+
+
+FEV1 = "{http://ar.gov.afip.dif.FEV1/}"
+
+
+@dataclass(frozen=True, slots=True)
+class Message:
+    """An error or observation included in a response from AFIP's WS."""
+
+    code: int
+    #: The message, exactly as returned by AFIP (see :func:`parse_string`).
+    message: str
+
+
+@dataclass(frozen=True, slots=True)
+class CAEResult:
+    """The result for a single receipt from a ``FECAESolicitar`` response."""
+
+    #: ``"A"`` for approved receipts, ``"R"`` for rejected ones.
+    result: str
+    receipt_number: int
+    cae: str | None
+    cae_expiration: date | None
+    observations: tuple[Message, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class CAEResponse:
+    """A decoded ``FECAESolicitar`` response."""
+
+    processed_date: datetime | None
+    results: tuple[CAEResult, ...]
+    errors: tuple[Message, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class ReceiptData:
+    """Data for a single receipt, as returned by ``FECompConsultar``."""
+
+    receipt_type: int
+    point_of_sales: int
+    receipt_number: int
+    issued_date: date | None
+    total_amount: Decimal
+    #: ``"A"`` for approved receipts, ``"R"`` for rejected ones.
+    result: str
+    cae: str | None
+    cae_expiration: date | None
+    processed_date: datetime | None
+    observations: tuple[Message, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class ReceiptDataResponse:
+    """A decoded ``FECompConsultar`` response."""
+
+    receipt: ReceiptData | None
+    errors: tuple[Message, ...]
+
+
+def _text(element: etree._Element, tag: str) -> str | None:
+    return element.findtext(FEV1 + tag) or None
+
+
+def _messages(element: etree._Element | None, tag: str) -> tuple[Message, ...]:
+    if element is None:
+        return ()
+    return tuple(
+        Message(
+            code=int(child.findtext(FEV1 + "Code")),
+            message=child.findtext(FEV1 + "Msg") or "",
+        )
+        for child in element.iterfind(FEV1 + tag)
+    )
+
+
+def _release(element: etree._Element) -> None:
+    """Free an element (and any preceding siblings) once it has been decoded."""
+    element.clear(keep_tail=True)
+    while element.getprevious() is not None:
+        del element.getparent()[0]
+
+
+def parse_cae_response(content: bytes) -> CAEResponse:
+    """Decode the body of a ``FECAESolicitar`` response.
+
+    Only the fields which are persisted are read. The document is parsed
+    incrementally, discarding each receipt's XML once decoded, so memory usage
+    remains low even for large batches.
+    """
+    processed_date = None
+    results = []
+    errors: tuple[Message, ...] = ()
+
+    for _, element in etree.iterparse(
+        BytesIO(content),
+        tag=(FEV1 + "FeCabResp", FEV1 + "FECAEDetResponse", FEV1 + "Errors"),
+    ):
+        if element.tag == FEV1 + "FeCabResp":
+            processed_date = parse_datetime_maybe(_text(element, "FchProceso"))
+        elif element.tag == FEV1 + "FECAEDetResponse":
+            results.append(
+                CAEResult(
+                    result=element.findtext(FEV1 + "Resultado"),
+                    receipt_number=int(element.findtext(FEV1 + "CbteDesde")),
+                    cae=_text(element, "CAE"),
+                    cae_expiration=parse_date_maybe(_text(element, "CAEFchVto")),
+                    observations=_messages(
+                        element.find(FEV1 + "Observaciones"),
+                        "Obs",
+                    ),
+                )
+            )
+        else:
+            errors = _messages(element, "Err")
+        _release(element)
+
+    return CAEResponse(
+        processed_date=processed_date,
+        results=tuple(results),
+        errors=errors,
+    )
+
+
+def parse_receipt_data(content: bytes) -> ReceiptDataResponse:
+    """Decode the body of a ``FECompConsultar`` response."""
+    receipt = None
+    errors: tuple[Message, ...] = ()
+
+    for _, element in etree.iterparse(
+        BytesIO(content),
+        tag=(FEV1 + "ResultGet", FEV1 + "Errors"),
+    ):
+        if element.tag == FEV1 + "ResultGet":
+            receipt = ReceiptData(
+                receipt_type=int(element.findtext(FEV1 + "CbteTipo")),
+                point_of_sales=int(element.findtext(FEV1 + "PtoVta")),
+                receipt_number=int(element.findtext(FEV1 + "CbteDesde")),
+                issued_date=parse_date_maybe(_text(element, "CbteFch")),
+                total_amount=Decimal(element.findtext(FEV1 + "ImpTotal")),
+                result=element.findtext(FEV1 + "Resultado"),
+                cae=_text(element, "CodAutorizacion"),
+                cae_expiration=parse_date_maybe(_text(element, "FchVto")),
+                processed_date=parse_datetime_maybe(_text(element, "FchProceso")),
+                observations=_messages(
+                    element.find(FEV1 + "Observaciones"),
+                    "Obs",
+                ),
+            )
+        else:
+            errors = _messages(element, "Err")
+        _release(element)
+
+    return ReceiptDataResponse(receipt=receipt, errors=errors)
@@ -157,8 +157,10 @@ class PdfBuilder:
 
         context: dict = {}
 
+        # Paginate a list, rather than the queryset, so that entries are fetched with
+        # a single query instead of one per page:
         context["entries"] = create_entries_context_for_render(
-            Paginator(receipt.entries.all(), self.entries_per_page)
+            Paginator(list(receipt.entries.all()), self.entries_per_page)
         )
         context["pdf"] = receipt.receiptpdf
         context["taxpayer"] = receipt.point_of_sales.owner
@@ -4,6 +4,8 @@ import typing
 from typing import TYPE_CHECKING
 
 from django.utils.functional import LazyObject
+from django.utils.functional import empty
+from lxml import etree
 
 from django_afip.clients import get_client
 
@@ -26,9 +28,16 @@ class _LazyFactory(LazyObject):
     def _setup(self) -> None:
         self._wrapped = get_client("wsfe").type_factory("ns0")
 
+    def reset(self) -> None:
+        """Discard the factory, so that it is re-created from a new client."""
+        self._wrapped = empty
+
 
 f = _LazyFactory()
 
+FEV1_NS = "http://ar.gov.afip.dif.FEV1/"
+SOAP_ENV_NS = "http://schemas.xmlsoap.org/soap/envelope/"
+
 
 def serialize_datetime(datetime: datetime) -> str:
     """
@@ -55,11 +64,40 @@ def serialize_ticket(ticket: AuthTicket):  # noqa: ANN201
     )
 
 
+def _for_serialization(receipts: QuerySet[Receipt]) -> list[Receipt]:
+    """Return receipts, along with all the related objects needed to serialize them.
+
+    This takes a fixed number of queries, regardless of the amount of receipts.
+    """
+    return list(
+        receipts.all()
+        .order_by("receipt_number")
+        .select_related(
+            "point_of_sales",
+            "receipt_type",
+            "concept",
+            "document_type",
+            "currency",
+            "client_vat_condition",
+        )
+        .prefetch_related(
+            "taxes__tax_type",
+            "vat__vat_type",
+            "optionals__optional_type",
+            "related_receipts__point_of_sales__owner",
+        )
+    )
+
+
 @typing.no_type_check  # zeep's dynamic types cannot be type-checked
 def serialize_multiple_receipts(receipts: QuerySet[Receipt]):  # noqa: ANN201
-    receipts = receipts.all().order_by("receipt_number")
+    """Serialize receipts into a ``FECAERequest``.
 
-    first = receipts.first()
+    This runs a fixed number of queries, regardless of the amount of receipts.
+    """
+    receipts = _for_serialization(receipts)
+
+    first = receipts[0]
     receipts = [serialize_receipt(receipt) for receipt in receipts]
 
     return f.FECAERequest(
@@ -171,3 +209,130 @@ def serialize_receipt_data(  # noqa: ANN201
     return f.FECompConsultaReq(  # type: ignore[attr-defined]
         CbteTipo=receipt_type, CbteNro=receipt_number, PtoVta=point_of_sales
     )
+
+
+def _element(parent: etree._Element, tag: str) -> etree._Element:
+    """Append an empty ``FEV1`` child element to ``parent``."""
+    return etree.SubElement(parent, f"{{{FEV1_NS}}}{tag}")
+
+
+def _append(parent: etree._Element, tag: str, value: object) -> None:
+    """Append a ``FEV1`` child element with the given value to ``parent``.
+
+    Values are rendered via ``str()``, which is exactly what zeep does for all the
+    types used by ``FECAESolicitar``. Like zeep, ``None`` values are omitted.
+    """
+    if value is not None:
+        etree.SubElement(parent, f"{{{FEV1_NS}}}{tag}").text = str(value)
+
+
+def render_cae_request(ticket: AuthTicket, receipts: QuerySet[Receipt]) -> bytes:
+    """Render a ``FECAESolicitar`` SOAP envelope for the given receipts.
+
+    The output is byte-for-byte identical to the envelope that zeep renders when
+    calling ``FECAESolicitar`` with the output of :func:`serialize_ticket` and
+    :func:`serialize_multiple_receipts`. However, it skips building zeep objects and
+    walking the schema for each one of them, which is a noticeable CPU cost for
+    large batches.
+
+    Elements are emitted in the order mandated by the ``wsfev1`` schema; this must be
+    kept in sync if AFIP ever changes it.
+
+    Like :func:`serialize_multiple_receipts`, this runs a fixed number of queries,
+    regardless of the amount of receipts.
+    """
+    receipt_list = _for_serialization(receipts)
+    first = receipt_list[0]
+
+    envelope = etree.Element(
+        f"{{{SOAP_ENV_NS}}}Envelope",
+        nsmap={"soap-env": SOAP_ENV_NS},
+    )
+    body = etree.SubElement(envelope, f"{{{SOAP_ENV_NS}}}Body")
+    request = etree.SubElement(
+        body,
+        f"{{{FEV1_NS}}}FECAESolicitar",
+        nsmap={"ns0": FEV1_NS},
+    )
+
+    auth = _element(request, "Auth")
+    _append(auth, "Token", ticket.token)
+    _append(auth, "Sign", ticket.signature)
+    _append(auth, "Cuit", ticket.owner.cuit)
+
+    cae_request = _element(request, "FeCAEReq")
+    header = _element(cae_request, "FeCabReq")
+    _append(header, "CantReg", len(receipt_list))
+    _append(header, "PtoVta", first.point_of_sales.number)
+    _append(header, "CbteTipo", first.receipt_type.code)
+
+    details = _element(cae_request, "FeDetReq")
+    for receipt in receipt_list:
+        _render_receipt(_element(details, "FECAEDetRequest"), receipt)
+
+    return etree.tostring(envelope, xml_declaration=True, encoding="utf-8")
+
+
+def _render_receipt(parent: etree._Element, receipt: Receipt) -> None:
+    """Render a single ``FECAEDetRequest``; see :func:`serialize_receipt`."""
+    taxes = receipt.taxes.all()
+    vats = receipt.vat.all()
+    optionals = receipt.optionals.all()
+    related_receipts = receipt.related_receipts.all()
+
+    _append(parent, "Concepto", receipt.concept.code)
+    _append(parent, "DocTipo", receipt.document_type.code)
+    _append(parent, "DocNro", receipt.document_number)
+    _append(parent, "CbteDesde", receipt.receipt_number)
+    _append(parent, "CbteHasta", receipt.receipt_number)
+    _append(parent, "CbteFch", serialize_date(receipt.issued_date))
+    _append(parent, "ImpTotal", receipt.total_amount)
+    _append(parent, "ImpTotConc", receipt.net_untaxed)
+    _append(parent, "ImpNeto", receipt.net_taxed)
+    _append(parent, "ImpOpEx", receipt.exempt_amount)
+    _append(parent, "ImpTrib", sum(tax.amount for tax in taxes))
+    _append(parent, "ImpIVA", sum(vat.amount for vat in vats))
+    if int(receipt.concept.code) in (2, 3):
+        _append(parent, "FchServDesde", serialize_date(receipt.service_start))
+        _append(parent, "FchServHasta", serialize_date(receipt.service_end))
+    if receipt.expiration_date is not None:
+        _append(parent, "FchVtoPago", serialize_date(receipt.expiration_date))
+    _append(parent, "MonId", receipt.currency.code)
+    _append(parent, "MonCotiz", receipt.currency_quote)
+    if receipt.client_vat_condition:
+        _append(parent, "CondicionIVAReceptorId", receipt.client_vat_condition.code)
+
+    if related_receipts:
+        container = _element(parent, "CbtesAsoc")
+        for related in related_receipts:
+            element = _element(container, "CbteAsoc")
+            _append(element, "Tipo", related.receipt_type.code)
+            _append(element, "PtoVta", related.point_of_sales.number)
+            _append(element, "Nro", related.receipt_number)
+            _append(element, "Cuit", related.point_of_sales.owner.cuit)
+            _append(element, "CbteFch", serialize_date(related.issued_date))
+
+    if taxes:
+        container = _element(parent, "Tributos")
+        for tax in taxes:
+            element = _element(container, "Tributo")
+            _append(element, "Id", tax.tax_type.code)
+            _append(element, "Desc", tax.description)
+            _append(element, "BaseImp", tax.base_amount)
+            _append(element, "Alic", tax.aliquot)
+            _append(element, "Importe", tax.amount)
+
+    if vats:
+        container = _element(parent, "Iva")
+        for vat in vats:
+            element = _element(container, "AlicIva")
+            _append(element, "Id", vat.vat_type.code)
+            _append(element, "BaseImp", vat.base_amount)
+            _append(element, "Importe", vat.amount)
+
+    if optionals:
+        container = _element(parent, "Opcionales")
+        for optional in optionals:
+            element = _element(container, "Opcional")
+            _append(element, "Id", optional.optional_type.code)
+            _append(element, "Valor", optional.value)
@@ -7,6 +7,7 @@ from django.db.models.signals import pre_save
 from django.dispatch import receiver
 
 from django_afip import models
+from django_afip import signers
 
 if TYPE_CHECKING:
     from django.db.models import Model
@@ -62,3 +63,12 @@ def delete_file_taxpayer(
         if old_file and old_file != new_file:
             # Delete the old file from storage.
             old_file.delete(save=False)
+
+
+@receiver(post_save, sender=models.TaxPayer)
+def clear_cached_credentials(
+    sender: type[models.TaxPayer],
+    instance: models.TaxPayer,
+    **kwargs,
+) -> None:
+    signers.credential_cache.delete(instance.pk)
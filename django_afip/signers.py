@@ -0,0 +1,265 @@
+"""Signers create the signatures used to request tickets from AFIP's WSAA.
+
+By default, requests are signed in-process, so every process needs access to all
+certificates and keys. Alternatively, the ``afipsigner`` command runs a daemon
+which holds them and signs requests on behalf of other processes, which use
+:class:`SocketSigner` to reach it.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import socket
+import socketserver
+import threading
+from abc import ABC
+from abc import abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+import django
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from django_afip import crypto
+from django_afip import exceptions
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from concurrent.futures import Executor
+
+    from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+    from cryptography.x509 import Certificate
+
+    from django_afip.models import TaxPayer
+
+#: The signer used if ``AFIP_SIGNER`` is not set.
+DEFAULT_SIGNER = {"BACKEND": "django_afip.signers.LocalSigner"}
+
+
+class CredentialCache:
+    """A bounded cache of each taxpayer's parsed certificate and key.
+
+    This avoids reading files from storage and parsing keys for each new ticket.
+    Entries are keyed by taxpayer and the names of their files, and are dropped
+    whenever a taxpayer is saved, so replaced files are picked up. Files changed
+    directly in storage (keeping the same name) require calling :meth:`clear`.
+
+    Up to ``AFIP_CREDENTIAL_CACHE_SIZE`` taxpayers are cached (1024 by default);
+    the least recently used ones are dropped first. The instance used by
+    :class:`LocalSigner` is ``django_afip.signers.credential_cache``.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[
+            int, tuple[tuple[str, str], tuple[Certificate, RSAPrivateKey]]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, taxpayer: TaxPayer) -> tuple[Certificate, RSAPrivateKey]:
+        """Return a taxpayer's parsed certificate and key, loading them if needed."""
+        names = (taxpayer.certificate.name, taxpayer.key.name)
+        with self._lock:
+            entry = self._entries.get(taxpayer.pk)
+            if entry is not None and entry[0] == names:
+                self._entries.move_to_end(taxpayer.pk)
+                return entry[1]
+
+        with taxpayer.certificate.file.open("rb") as f:
+            cert = f.read()
+        with taxpayer.key.file.open("rb") as f:
+            key = f.read()
+        credentials = crypto.load_credentials(cert, key)
+
+        if taxpayer.pk is not None:
+            with self._lock:
+                self._entries[taxpayer.pk] = (names, credentials)
+                self._entries.move_to_end(taxpayer.pk)
+                size = getattr(settings, "AFIP_CREDENTIAL_CACHE_SIZE", 1024)
+                while len(self._entries) > size:
+                    self._entries.popitem(last=False)
+        return credentials
+
+    def delete(self, taxpayer_id: int) -> None:
+        """Remove a taxpayer's credentials from the cache."""
+        with self._lock:
+            self._entries.pop(taxpayer_id, None)
+
+    def clear(self) -> None:
+        """Remove all credentials from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+credential_cache = CredentialCache()
+
+
+class Signer(ABC):
+    """Base class for signers.
+
+    Subclasses must implement :meth:`sign`.
+    """
+
+    @abstractmethod
+    def sign(self, taxpayer: TaxPayer, data: bytes) -> bytes:
+        """Return an embedded PKCS7 signature of ``data`` with a taxpayer's key."""
+
+    def sign_many(self, requests: Sequence[tuple[TaxPayer, bytes]]) -> list[bytes]:
+        """Sign several ``(taxpayer, data)`` pairs, returning signatures in order.
+
+        Subclasses may override this to sign them concurrently.
+        """
+        return [self.sign(taxpayer, data) for taxpayer, data in requests]
+
+
+class LocalSigner(Signer):
+    """Signs requests in the current process.
+
+    Certificates and keys are cached (see :class:`CredentialCache`).
+    """
+
+    def sign(self, taxpayer: TaxPayer, data: bytes) -> bytes:
+        return crypto.sign(data, *credential_cache.get(taxpayer))
+
+
+class SocketSigner(Signer):
+    """Signs requests via the ``afipsigner`` daemon, listening on a Unix socket.
+
+    Requests passed to :meth:`~.Signer.sign_many` are sent together, and signed
+    concurrently by the daemon.
+
+    :param path: The path of the daemon's socket.
+    :param timeout: Seconds to wait for the daemon to reply.
+    """
+
+    def __init__(self, path: str, timeout: float = 30) -> None:
+        self.path = path
+        self.timeout = timeout
+
+    def sign(self, taxpayer: TaxPayer, data: bytes) -> bytes:
+        return self.sign_many([(taxpayer, data)])[0]
+
+    def sign_many(self, requests: Sequence[tuple[TaxPayer, bytes]]) -> list[bytes]:
+        message = [
+            [taxpayer.pk, base64.b64encode(data).decode()]
+            for taxpayer, data in requests
+        ]
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            sock.sendall(json.dumps(message).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                results = json.loads(f.readline())
+
+        return [_decode_result(result) for result in results]
+
+
+def _decode_result(result: dict[str, str]) -> bytes:
+    """Return the signature in one of the daemon's results, or raise its error."""
+    if "signature" in result:
+        return base64.b64decode(result["signature"])
+
+    # Authentication errors (e.g.: a corrupt certificate) are raised as-is:
+    error = getattr(exceptions, result["error"], None)
+    if not (
+        isinstance(error, type) and issubclass(error, exceptions.AuthenticationError)
+    ):
+        error = exceptions.SigningError
+    raise error(result["message"])
+
+
+@lru_cache(maxsize=1)
+def get_signer() -> Signer:
+    """Return the signer configured via the ``AFIP_SIGNER`` setting.
+
+    The setting follows the same format as Django's :setting:`STORAGES`: a
+    ``BACKEND`` with the path to a :class:`Signer` class, and optional ``OPTIONS``
+    with keyword arguments for it. For example:
+
+    .. code-block:: python
+
+        AFIP_SIGNER = {
+            "BACKEND": "django_afip.signers.SocketSigner",
+            "OPTIONS": {"path": "/run/afip-signer.sock"},
+        }
+
+    Defaults to :class:`LocalSigner`.
+    """
+    config = getattr(settings, "AFIP_SIGNER", DEFAULT_SIGNER)
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+def init_worker() -> None:
+    """Set up Django in a signing worker process."""
+    django.setup()
+
+
+def sign_in_worker(taxpayer_id: int, data: bytes) -> bytes:
+    """Sign ``data`` on behalf of a taxpayer; runs in a signing worker process."""
+    # Imported here, since this module is imported before Django is set up:
+    from django_afip.models import TaxPayer
+
+    return LocalSigner().sign(TaxPayer.objects.get(pk=taxpayer_id), data)
+
+
+class SignerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """The server run by the ``afipsigner`` command.
+
+    Each line received is a JSON list of ``[taxpayer_id, data]`` pairs (with
+    ``data`` encoded in base64). All of them are signed concurrently in
+    ``executor``, and a JSON list of results is sent back in a single line. Each
+    result contains either a ``signature`` (in base64), or an ``error`` and its
+    ``message``.
+
+    Anything that can connect to the socket can request tickets on behalf of any
+    taxpayer, so it is only accessible by its owner by default. The socket must
+    be created in a directory which other users cannot write to.
+
+    :param path: The path of the Unix socket to listen on.
+    :param executor: The executor in which :func:`sign_in_worker` is run.
+    :param mode: The permissions of the socket.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: str, executor: Executor, mode: int = 0o600) -> None:
+        self.executor = executor
+        self.mode = mode
+        super().__init__(path, _SignerRequestHandler)
+
+    def server_bind(self) -> None:
+        # Create the socket with the right permissions, so that nobody else can
+        # connect to it before they're set:
+        umask = os.umask(~self.mode & 0o777)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+        os.chmod(self.server_address, self.mode)
+
+
+class _SignerRequestHandler(socketserver.StreamRequestHandler):
+    server: SignerServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            futures = [
+                self.server.executor.submit(
+                    sign_in_worker,
+                    taxpayer_id,
+                    base64.b64decode(data),
+                )
+                for taxpayer_id, data in json.loads(line)
+            ]
+            results = []
+            for future in futures:
+                try:
+                    signature = future.result()
+                except Exception as e:
+                    results.append({"error": type(e).__name__, "message": str(e)})
+                else:
+                    results.append({"signature": base64.b64encode(signature).decode()})
+            self.wfile.write(json.dumps(results).encode() + b"\n")
@@ -0,0 +1,96 @@
+"""Helpers for testing django_afip, and applications which use it."""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+
+from django.db import connections
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterator
+    from typing import Any
+
+__all__ = (
+    "QueryLog",
+    "query_budget",
+)
+
+
+@dataclass
+class QueryLog:
+    """The queries executed within a :func:`query_budget` block."""
+
+    #: The SQL and duration (in seconds) of each query, in order.
+    queries: list[tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        """The amount of queries executed."""
+        return len(self.queries)
+
+    @property
+    def duration(self) -> float:
+        """The total time spent executing queries, in seconds."""
+        return sum(duration for _, duration in self.queries)
+
+    def record(
+        self,
+        execute: Callable,
+        sql: str,
+        params: object,
+        many: bool,
+        context: dict[str, Any],
+    ) -> object:
+        """Execute and record a query; used as a database execute wrapper."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - started))
+
+    def __str__(self) -> str:
+        return "\n".join(
+            f"{i}. [{duration * 1000:.2f}ms] {sql}"
+            for i, (sql, duration) in enumerate(self.queries, start=1)
+        )
+
+
+@contextmanager
+def query_budget(
+    max_queries: int | None = None,
+    max_time: float | None = None,
+    using: str = "default",
+) -> Iterator[QueryLog]:
+    """Assert that a block of code stays within a database query budget.
+
+    Unlike Django's ``assertNumQueries``, budgets are upper bounds, so they keep
+    passing when an operation gets cheaper. Comparing the :class:`QueryLog` for
+    batches of different sizes makes it easy to check that an operation runs a
+    constant amount of queries::
+
+        with query_budget(max_queries=10) as log:
+            receipts.validate()
+
+    :param max_queries: The maximum amount of queries allowed.
+    :param max_time: The maximum total time spent executing queries, in seconds.
+    :param using: The alias of the database to monitor.
+    :raises AssertionError: If the block exceeds its budget. The message lists all
+        queries executed.
+    """
+    log = QueryLog()
+    with connections[using].execute_wrapper(log.record):
+        yield log
+
+    if max_queries is not None and log.count > max_queries:
+        raise AssertionError(
+            f"{log.count} queries executed, but the budget is {max_queries}:\n{log}"
+        )
+    if max_time is not None and log.duration > max_time:
+        raise AssertionError(
+            f"Queries took {log.duration:.3f}s, but the budget is {max_time}s:\n{log}"
+        )
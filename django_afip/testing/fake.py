@@ -0,0 +1,869 @@
+"""An in-process stand-in for AFIP's ``wsaa`` and ``wsfe`` web services.
+
+:class:`FakeAFIP` implements enough of both services to authorize tickets, validate
+receipts and load metadata without any network access. It keeps track of the last
+receipt number for each point of sales and receipt type, so numbering behaves just
+like it does with AFIP's servers.
+
+It can be used in-process, as a zeep transport::
+
+    with FakeAFIP().install():
+        receipts.validate()
+
+Or as an HTTP server, by pointing the ``AFIP_WSDLS`` setting at it::
+
+    python -m django_afip.testing.fake --port 8080
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+import requests
+from cryptography.hazmat.primitives.serialization.pkcs7 import (
+    load_der_pkcs7_certificates,
+)
+from cryptography.x509.oid import NameOID
+from lxml import etree
+from requests.adapters import BaseAdapter
+
+from django_afip import clients
+from django_afip import serializers
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from typing import Any
+
+    import httpx
+    from requests import PreparedRequest
+
+__all__ = (
+    "Disconnect",
+    "FakeAFIP",
+    "Fault",
+    "HTTPError",
+    "ServiceError",
+    "Timeout",
+)
+
+WSDL_DIR = Path(__file__).parent / "wsdl"
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+SOAP_ENV_NS = "http://schemas.xmlsoap.org/soap/envelope/"
+WSAA_NS = "http://wsaa.view.sua.dvadac.desein.afip.gov"
+FEV1_NS = "http://ar.gov.afip.dif.FEV1/"
+
+# Maps the (lowercase) path of each endpoint to the service it implements. These
+# match the paths for AFIP's real endpoints.
+PATHS = {
+    "/ws/services/logincms": "wsaa",
+    "/wsfev1/service.asmx": "wsfe",
+}
+
+# Maps metadata operations to the fixture with their data, and their type's name.
+METADATA = {
+    "FEParamGetTiposCbte": ("receipttype", "CbteTipo"),
+    "FEParamGetTiposConcepto": ("concepttype", "ConceptoTipo"),
+    "FEParamGetTiposDoc": ("documenttype", "DocTipo"),
+    "FEParamGetTiposIva": ("vattype", "IvaTipo"),
+    "FEParamGetTiposMonedas": ("currencytype", "Moneda"),
+    "FEParamGetTiposTributos": ("taxtype", "TributoTipo"),
+    "FEParamGetTiposOpcional": ("optionaltype", "OpcionalTipo"),
+}
+
+# Fields echoed back by FECompConsultar, in the order defined by the schema.
+RECEIPT_FIELDS = (
+    "Concepto",
+    "DocTipo",
+    "DocNro",
+    "CbteDesde",
+    "CbteHasta",
+    "CbteFch",
+    "ImpTotal",
+    "ImpTotConc",
+    "ImpNeto",
+    "ImpOpEx",
+    "ImpTrib",
+    "ImpIVA",
+    "FchServDesde",
+    "FchServHasta",
+    "FchVtoPago",
+    "MonId",
+    "MonCotiz",
+)
+
+#: How long tickets issued by ``loginCms`` are valid for.
+TICKET_LIFETIME = timedelta(hours=12)
+
+#: How long CAEs are valid for, after the receipt's date.
+CAE_LIFETIME = timedelta(days=10)
+
+
+@dataclass(frozen=True)
+class HTTPError:
+    """Respond with an HTTP error (e.g.: a 503 during maintenance)."""
+
+    status: int = 503
+
+
+@dataclass(frozen=True)
+class Timeout:
+    """Fail with a timeout, as if the server never responded.
+
+    If ``processed`` is true, the request is still processed, as happens when the
+    connection drops after AFIP has accepted a receipt.
+    """
+
+    processed: bool = False
+
+
+@dataclass(frozen=True)
+class Disconnect:
+    """Fail with a connection error, without processing the request."""
+
+
+@dataclass(frozen=True)
+class Fault:
+    """Respond with a SOAP fault."""
+
+    message: str = "Internal server error"
+
+
+@dataclass(frozen=True)
+class ServiceError:
+    """Respond with an error in the operation's ``Errors`` element.
+
+    Only ``wsfe`` operations report errors this way.
+    """
+
+    code: int = 500
+    message: str = "Error interno de aplicación"
+
+
+Failure = HTTPError | Timeout | Disconnect | Fault | ServiceError
+
+
+class _Unreachable(Exception):
+    """Raised when a request must fail without a response."""
+
+    def __init__(self, failure: Timeout | Disconnect) -> None:
+        super().__init__(failure)
+        self.failure = failure
+
+
+def _now() -> datetime:
+    return datetime.now(clients.TZ_AR).replace(microsecond=0)
+
+
+def _date(value: date) -> str:
+    return value.strftime("%Y%m%d")
+
+
+def _load_fixture(name: str) -> list[dict[str, Any]]:
+    with (FIXTURES_DIR / f"{name}.json").open(encoding="utf-8") as f:
+        return [entry["fields"] for entry in json.load(f)]
+
+
+def _append(parent: etree._Element, namespace: str, values: dict[str, Any]) -> None:
+    """Append elements for ``values`` to ``parent``.
+
+    Dictionaries are rendered as nested elements, and lists as repeated elements.
+    ``None`` values are omitted.
+    """
+    for tag, value in values.items():
+        for item in value if isinstance(value, list) else [value]:
+            if item is None:
+                continue
+            child = etree.SubElement(parent, f"{{{namespace}}}{tag}")
+            if isinstance(item, dict):
+                _append(child, namespace, item)
+            else:
+                child.text = str(item)
+
+
+def _envelope(namespace: str, operation: str, result: dict[str, Any]) -> bytes:
+    envelope = etree.Element(f"{{{SOAP_ENV_NS}}}Envelope", nsmap={"soap": SOAP_ENV_NS})
+    body = etree.SubElement(envelope, f"{{{SOAP_ENV_NS}}}Body")
+    response = etree.SubElement(
+        body,
+        f"{{{namespace}}}{operation}Response",
+        nsmap={None: namespace},
+    )
+    _append(response, namespace, result)
+    return etree.tostring(envelope, xml_declaration=True, encoding="utf-8")
+
+
+def _fault(message: str) -> bytes:
+    envelope = etree.Element(f"{{{SOAP_ENV_NS}}}Envelope", nsmap={"soap": SOAP_ENV_NS})
+    body = etree.SubElement(envelope, f"{{{SOAP_ENV_NS}}}Body")
+    fault = etree.SubElement(body, f"{{{SOAP_ENV_NS}}}Fault")
+    etree.SubElement(fault, "faultcode").text = "soap:Server"
+    etree.SubElement(fault, "faultstring").text = message
+    return etree.tostring(envelope, xml_declaration=True, encoding="utf-8")
+
+
+def _errors(code: int, message: str) -> dict[str, Any]:
+    return {"Errors": {"Err": {"Code": code, "Msg": message}}}
+
+
+class FakeAFIP:
+    """A fake implementation of AFIP's ``wsaa`` and ``wsfe`` web services.
+
+    Any ticket signed with a certificate carrying a CUIT is authorized, and receipts
+    are approved as long as they are numbered sequentially. The same state is shared
+    by the sandbox and production environments.
+
+    :param latency: Seconds to wait before responding to each request. May be a
+        ``(min, max)`` tuple, in which case a random delay in that range is used.
+    :param error_rate: The probability of any request failing with an HTTP 503.
+    :param points_of_sales: The points of sales returned for every taxpayer.
+    :param max_receipts: The maximum amount of receipts per ``FECAESolicitar``
+        request, as reported by ``FECompTotXRequest``.
+    :param seed: A seed for generated tokens and random failures, to make runs
+        reproducible.
+    """
+
+    def __init__(
+        self,
+        latency: float | tuple[float, float] = 0,
+        error_rate: float = 0,
+        points_of_sales: Iterable[int] = (1,),
+        max_receipts: int = 250,
+        seed: int | None = None,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.points_of_sales = list(points_of_sales)
+        self.max_receipts = max_receipts
+        #: The status reported by ``FEDummy`` for each server.
+        self.status = {"AppServer": "OK", "DbServer": "OK", "AuthServer": "OK"}
+        #: The name of each operation handled so far, in order.
+        self.calls: list[str] = []
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._failures: dict[str, list[Failure]] = {}
+        # Maps tokens to the (cuit, service) that they were issued for:
+        self._tokens: dict[str, tuple[int, str]] = {}
+        # Maps (cuit, pos, receipt_type) to the last receipt number:
+        self._last_numbers: dict[tuple[int, int, int], int] = {}
+        # Maps (cuit, pos, receipt_type, number) to the data of each receipt:
+        self._receipts: dict[tuple[int, int, int, int], dict[str, Any]] = {}
+        self._last_cae = 0
+
+    def inject(self, operation: str, failure: Failure, times: int = 1) -> None:
+        """Make the next ``times`` calls to ``operation`` fail with ``failure``."""
+        with self._lock:
+            self._failures.setdefault(operation, []).extend([failure] * times)
+
+    def last_receipt_number(self, cuit: int, pos: int, receipt_type: int) -> int:
+        """Return the last receipt number validated for a given sequence."""
+        return self._last_numbers.get((cuit, pos, receipt_type), 0)
+
+    def set_last_receipt_number(
+        self,
+        cuit: int,
+        pos: int,
+        receipt_type: int,
+        number: int,
+    ) -> None:
+        """Pretend that receipts up to ``number`` were validated elsewhere."""
+        with self._lock:
+            self._last_numbers[(cuit, pos, receipt_type)] = number
+
+    # Request handling
+
+    def delay(self) -> float:
+        """Return how long to wait before responding to a request."""
+        if isinstance(self.latency, tuple):
+            return self._random.uniform(*self.latency)
+        return self.latency
+
+    def wsdl(self, address: str) -> bytes | None:
+        """Return the WSDL for the service at ``address``, if it is implemented.
+
+        The WSDL's endpoint is ``address`` itself (without any query string).
+        """
+        parsed = urlparse(address)
+        service_name = PATHS.get(parsed.path.lower())
+        if service_name is None:
+            return None
+
+        endpoint = parsed._replace(query="", fragment="").geturl()
+        template = (WSDL_DIR / f"{service_name}.wsdl").read_text(encoding="utf-8")
+        return template.replace("{address}", endpoint).encode("utf-8")
+
+    def handle(self, path: str, body: bytes) -> tuple[int, bytes]:
+        """Handle a SOAP request, returning the HTTP status and response body.
+
+        :raises _Unreachable: If the request should fail without a response.
+        """
+        service_name = PATHS.get(path.lower())
+        if service_name is None:
+            return 404, b"Not found"
+
+        try:
+            request = etree.fromstring(body).find(f"{{{SOAP_ENV_NS}}}Body")[0]
+        except (etree.XMLSyntaxError, IndexError, TypeError):
+            return 500, _fault("Invalid SOAP message")
+        operation = etree.QName(request).localname
+
+        with self._lock:
+            self.calls.append(operation)
+            failure = self._next_failure(operation)
+            if isinstance(failure, Timeout) and failure.processed:
+                self._dispatch(service_name, operation, request)
+            if isinstance(failure, (Timeout, Disconnect)):
+                raise _Unreachable(failure)
+            if isinstance(failure, HTTPError):
+                return failure.status, b"Service Unavailable"
+            if isinstance(failure, Fault):
+                return 500, _fault(failure.message)
+            if isinstance(failure, ServiceError):
+                return 200, _envelope(
+                    FEV1_NS,
+                    operation,
+                    {f"{operation}Result": _errors(failure.code, failure.message)},
+                )
+
+            return self._dispatch(service_name, operation, request)
+
+    def _next_failure(self, operation: str) -> Failure | None:
+        pending = self._failures.get(operation)
+        if pending:
+            return pending.pop(0)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return HTTPError(503)
+        return None
+
+    def _dispatch(
+        self,
+        service_name: str,
+        operation: str,
+        request: etree._Element,
+    ) -> tuple[int, bytes]:
+        if service_name == "wsaa":
+            if operation != "loginCms":
+                return 500, _fault(f"Unknown operation: {operation}")
+            return self._login_cms(request)
+
+        if operation == "FEDummy":
+            return 200, _envelope(FEV1_NS, operation, {"FEDummyResult": self.status})
+
+        handler = getattr(self, f"_{operation}", None)
+        if handler is None and operation in METADATA:
+            handler = self._metadata
+        if handler is None:
+            return 500, _fault(f"Unknown operation: {operation}")
+
+        result = self._authenticate(request)
+        if result is None:
+            cuit = int(request.findtext(f"{{{FEV1_NS}}}Auth/{{{FEV1_NS}}}Cuit"))
+            result = handler(cuit, operation, request)
+        return 200, _envelope(FEV1_NS, operation, {f"{operation}Result": result})
+
+    # wsaa
+
+    def _login_cms(self, request: etree._Element) -> tuple[int, bytes]:
+        try:
+            cms = base64.b64decode(request.findtext(f"{{{WSAA_NS}}}in0") or "")
+            start = cms.index(b"<loginTicketRequest")
+            end = cms.index(b"</loginTicketRequest>") + len("</loginTicketRequest>")
+            ticket_request = etree.fromstring(cms[start:end])
+            [certificate] = load_der_pkcs7_certificates(cms)
+        except Exception:
+            return 500, _fault("cms.bad: CMS invalido")
+
+        serial = certificate.subject.get_attributes_for_oid(NameOID.SERIAL_NUMBER)
+        if not serial or not str(serial[0].value).startswith("CUIT "):
+            return 500, _fault("cms.cert.untrusted: Certificado sin CUIT")
+        cuit = int(str(serial[0].value).removeprefix("CUIT "))
+        service = ticket_request.findtext("service")
+
+        token = base64.b64encode(self._random.randbytes(48)).decode()
+        sign = base64.b64encode(self._random.randbytes(96)).decode()
+        self._tokens[token] = (cuit, service)
+
+        now = _now()
+        response = etree.Element("loginTicketResponse", version="1.0")
+        _append(
+            response,
+            "",
+            {
+                "header": {
+                    "source": "CN=wsaahomo, O=AFIP, C=AR",
+                    "destination": certificate.subject.rfc4514_string(),
+                    "uniqueId": ticket_request.findtext("header/uniqueId"),
+                    "generationTime": now.isoformat(),
+                    "expirationTime": (now + TICKET_LIFETIME).isoformat(),
+                },
+                "credentials": {"token": token, "sign": sign},
+            },
+        )
+        ticket = etree.tostring(response, xml_declaration=True, encoding="utf-8")
+        return 200, _envelope(
+            WSAA_NS,
+            "loginCms",
+            {"loginCmsReturn": ticket.decode()},
+        )
+
+    # wsfe
+
+    def _authenticate(self, request: etree._Element) -> dict[str, Any] | None:
+        """Return the errors for a request with invalid credentials, if any."""
+        auth = request.find(f"{{{FEV1_NS}}}Auth")
+        if auth is None:
+            return _errors(600, "ValidacionDeToken: No apareció Token en la request")
+
+        token = auth.findtext(f"{{{FEV1_NS}}}Token")
+        cuit = auth.findtext(f"{{{FEV1_NS}}}Cuit")
+        issued_for = self._tokens.get(token)
+        if issued_for is None or issued_for[1] != "wsfe":
+            return _errors(600, "ValidacionDeToken: No validaron las firmas digitales")
+        if str(issued_for[0]) != cuit:
+            return _errors(
+                600,
+                f"ValidacionDeToken: No apareció CUIT en lista de relaciones: {cuit}",
+            )
+        return None
+
+    def _FECAESolicitar(
+        self,
+        cuit: int,
+        operation: str,
+        request: etree._Element,
+    ) -> dict[str, Any]:
+        ns = f"{{{FEV1_NS}}}"
+        header = request.find(f"{ns}FeCAEReq/{ns}FeCabReq")
+        details = request.findall(f"{ns}FeCAEReq/{ns}FeDetReq/{ns}FECAEDetRequest")
+        if header is None or not details:
+            return _errors(10000, "El campo FeCabReq/FeDetReq es obligatorio")
+        pos = int(header.findtext(f"{ns}PtoVta"))
+        receipt_type = int(header.findtext(f"{ns}CbteTipo"))
+        if int(header.findtext(f"{ns}CantReg")) != len(details):
+            return _errors(
+                10001,
+                "El campo CantReg no coincide con la cantidad de comprobantes.",
+            )
+        if len(details) > self.max_receipts:
+            return _errors(
+                10002,
+                "La cantidad de comprobantes supera el máximo permitido.",
+            )
+
+        processed = _now()
+        results = []
+        for detail in details:
+            data = {field: detail.findtext(ns + field) for field in RECEIPT_FIELDS}
+            data["CbteFch"] = data["CbteFch"] or _date(processed)
+            key = (cuit, pos, receipt_type)
+            number = int(data["CbteDesde"])
+            result = {
+                "Concepto": data["Concepto"],
+                "DocTipo": data["DocTipo"],
+                "DocNro": data["DocNro"],
+                "CbteDesde": data["CbteDesde"],
+                "CbteHasta": data["CbteHasta"],
+                "CbteFch": data["CbteFch"],
+            }
+
+            if (
+                number != self._last_numbers.get(key, 0) + 1
+                or data["CbteHasta"] != (data["CbteDesde"])
+            ):
+                result["Resultado"] = "R"
+                result["Observaciones"] = {
+                    "Obs": {
+                        "Code": 10016,
+                        "Msg": (
+                            "El numero o fecha del comprobante no se corresponde con "
+                            "el proximo a autorizar. Consultar metodo "
+                            "FECompUltimoAutorizado."
+                        ),
+                    }
+                }
+            else:
+                self._last_cae += 1
+                issued = datetime.strptime(data["CbteFch"], "%Y%m%d")
+                result["Resultado"] = "A"
+                result["CAE"] = f"{70000000000000 + self._last_cae:014d}"
+                result["CAEFchVto"] = _date(issued + CAE_LIFETIME)
+
+                self._last_numbers[key] = number
+                self._receipts[(*key, number)] = {
+                    **data,
+                    "Resultado": "A",
+                    "CodAutorizacion": result["CAE"],
+                    "EmisionTipo": "CAE",
+                    "FchVto": result["CAEFchVto"],
+                    "FchProceso": processed.strftime("%Y%m%d%H%M%S"),
+                    "PtoVta": pos,
+                    "CbteTipo": receipt_type,
+                }
+            results.append(result)
+
+        outcomes = {result["Resultado"] for result in results}
+        return {
+            "FeCabResp": {
+                "Cuit": cuit,
+                "PtoVta": pos,
+                "CbteTipo": receipt_type,
+                "FchProceso": processed.strftime("%Y%m%d%H%M%S"),
+                "CantReg": len(details),
+                "Resultado": outcomes.pop() if len(outcomes) == 1 else "P",
+                "Reproceso": "N",
+            },
+            "FeDetResp": {"FECAEDetResponse": results},
+        }
+
+    def _FECompUltimoAutorizado(
+        self,
+        cuit: int,
+        operation: str,
+        request: etree._Element,
+    ) -> dict[str, Any]:
+        pos = int(request.findtext(f"{{{FEV1_NS}}}PtoVta"))
+        receipt_type = int(request.findtext(f"{{{FEV1_NS}}}CbteTipo"))
+        return {
+            "PtoVta": pos,
+            "CbteTipo": receipt_type,
+            "CbteNro": self._last_numbers.get((cuit, pos, receipt_type), 0),
+        }
+
+    def _FECompConsultar(
+        self,
+        cuit: int,
+        operation: str,
+        request: etree._Element,
+    ) -> dict[str, Any]:
+        ns = f"{{{FEV1_NS}}}"
+        query = request.find(f"{ns}FeCompConsReq")
+        data = self._receipts.get(
+            (
+                cuit,
+                int(query.findtext(f"{ns}PtoVta")),
+                int(query.findtext(f"{ns}CbteTipo")),
+                int(query.findtext(f"{ns}CbteNro")),
+            )
+        )
+        if data is None:
+            return _errors(
+                602,
+                "No existen datos en nuestros registros para los parametros "
+                "ingresados.",
+            )
+        return {"ResultGet": data}
+
+    def _FECompTotXRequest(
+        self,
+        cuit: int,
+        operation: str,
+        request: etree._Element,
+    ) -> dict[str, Any]:
+        return {"RegXReq": self.max_receipts}
+
+    def _FEParamGetPtosVenta(
+        self,
+        cuit: int,
+        operation: str,
+        request: etree._Element,
+    ) -> dict[str, Any]:
+        if not self.points_of_sales:
+            return _errors(602, "Sin Resultados: - Metodo FEParamGetPtosVenta")
+        return {
+            "ResultGet": {
+                "PtoVenta": [
+                    {
+                        "Nro": number,
+                        "EmisionTipo": "CAE - Ptovta (CAE)",
+                        "Bloqueado": "N",
+                        "FchBaja": "NULL",
+                    }
+                    for number in self.points_of_sales
+                ]
+            }
+        }
+
+    def _FEParamGetCondicionIvaReceptor(
+        self,
+        cuit: int,
+        operation: str,
+        request: etree._Element,
+    ) -> dict[str, Any]:
+        return {
+            "ResultGet": {
+                "CondicionIvaReceptor": [
+                    {
+                        "Id": fields["code"],
+                        "Desc": fields["description"],
+                        "Cmp_Clase": fields["cmp_clase"],
+                    }
+                    for fields in _load_fixture("clientvatcondition")
+                ]
+            }
+        }
+
+    def _metadata(
+        self,
+        cuit: int,
+        operation: str,
+        request: etree._Element,
+    ) -> dict[str, Any]:
+        fixture, type_name = METADATA[operation]
+        return {
+            "ResultGet": {
+                type_name: [
+                    {
+                        "Id": fields["code"],
+                        "Desc": fields["description"],
+                        "FchDesde": _date(date.fromisoformat(fields["valid_from"])),
+                        "FchHasta": (
+                            _date(date.fromisoformat(fields["valid_to"]))
+                            if fields["valid_to"]
+                            else "NULL"
+                        ),
+                    }
+                    for fields in _load_fixture(fixture)
+                ]
+            }
+        }
+
+    # Transports
+
+    def transport(self) -> clients.AFIPTransport:
+        """Return a zeep transport which sends all requests to this fake."""
+        session = requests.Session()
+        adapter = FakeAdapter(self)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return clients.AFIPTransport(cache=None, session=session)
+
+    def async_transport(self) -> clients.AsyncAFIPTransport:
+        """Return an asynchronous zeep transport which sends requests to this fake.
+
+        This requires ``httpx`` to be installed.
+        """
+        import httpx
+
+        return clients.AsyncAFIPTransport(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(self._ahandle)),
+            wsdl_client=httpx.Client(transport=httpx.MockTransport(self._handle)),
+            cache=None,
+        )
+
+    @contextmanager
+    def install(self) -> Iterator[FakeAFIP]:
+        """Route all requests made via :mod:`~django_afip.clients` to this fake.
+
+        Cached clients (and the type factory in :mod:`~django_afip.serializers`,
+        which is built from one) are discarded when entering and exiting the context.
+        """
+        original = clients.get_or_create_transport
+        original_async = clients.get_or_create_async_transport
+        transport = self.transport()
+
+        clients.get_or_create_transport = lambda: transport  # type: ignore[assignment]
+        clients.get_or_create_async_transport = (  # type: ignore[assignment]
+            self.async_transport
+        )
+        clients.get_client.cache_clear()
+        clients.get_async_client.cache_clear()
+        serializers.f.reset()
+        try:
+            yield self
+        finally:
+            clients.get_or_create_transport = original
+            clients.get_or_create_async_transport = original_async
+            clients.get_client.cache_clear()
+            clients.get_async_client.cache_clear()
+            serializers.f.reset()
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        time.sleep(self.delay())
+        return self._respond_httpx(request)
+
+    async def _ahandle(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.delay())
+        return self._respond_httpx(request)
+
+    def _respond_httpx(self, request: httpx.Request) -> httpx.Response:
+        import httpx
+
+        url = str(request.url)
+        if request.method == "GET":
+            wsdl = self.wsdl(url)
+            if wsdl is None:
+                return httpx.Response(404, request=request)
+            return httpx.Response(200, content=wsdl, request=request)
+
+        try:
+            status, body = self.handle(request.url.path, request.read())
+        except _Unreachable as e:
+            if isinstance(e.failure, Timeout):
+                raise httpx.ReadTimeout("Read timed out", request=request) from None
+            raise httpx.ConnectError("Connection refused", request=request) from None
+        return httpx.Response(
+            status,
+            content=body,
+            headers={"Content-Type": "text/xml; charset=utf-8"},
+            request=request,
+        )
+
+    @contextmanager
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> Iterator[FakeServer]:
+        """Serve this fake over HTTP in a background thread.
+
+        Point the ``AFIP_WSDLS`` setting at :attr:`FakeServer.wsdls` to use it.
+        """
+        server = FakeServer(self, host, port)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield server
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+
+class FakeAdapter(BaseAdapter):
+    """A ``requests`` adapter which sends all requests to a :class:`FakeAFIP`."""
+
+    def __init__(self, fake: FakeAFIP) -> None:
+        super().__init__()
+        self.fake = fake
+
+    def send(  # type: ignore[override]
+        self,
+        request: PreparedRequest,
+        **kwargs,
+    ) -> requests.Response:
+        time.sleep(self.fake.delay())
+
+        if request.method == "GET":
+            body = self.fake.wsdl(request.url)
+            status = 200 if body is not None else 404
+        else:
+            content = request.body or b""
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            try:
+                status, body = self.fake.handle(urlparse(request.url).path, content)
+            except _Unreachable as e:
+                if isinstance(e.failure, Timeout):
+                    raise requests.ReadTimeout(request=request) from None
+                raise requests.ConnectionError(request=request) from None
+
+        response = requests.Response()
+        response.status_code = status
+        response.headers["Content-Type"] = "text/xml; charset=utf-8"
+        response.raw = BytesIO(body or b"")
+        response._content = body or b""
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+class FakeServer(ThreadingHTTPServer):
+    """An HTTP server exposing a :class:`FakeAFIP`."""
+
+    daemon_threads = True
+
+    def __init__(self, fake: FakeAFIP, host: str, port: int) -> None:
+        super().__init__((host, port), _RequestHandler)
+        self.fake = fake
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def wsdls(self) -> dict[str, dict[str, str]]:
+        """A value for the ``AFIP_WSDLS`` setting pointing at this server."""
+        urls = {
+            "wsaa": f"{self.url}/ws/services/LoginCms?wsdl",
+            "wsfe": f"{self.url}/wsfev1/service.asmx?WSDL",
+        }
+        return {"production": urls, "sandbox": urls}
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server: FakeServer
+
+    def do_GET(self) -> None:
+        time.sleep(self.server.fake.delay())
+        wsdl = self.server.fake.wsdl(f"{self.server.url}{self.path}")
+        if wsdl is None:
+            self._respond(404, b"Not found")
+        else:
+            self._respond(200, wsdl)
+
+    def do_POST(self) -> None:
+        time.sleep(self.server.fake.delay())
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            status, response = self.server.fake.handle(urlparse(self.path).path, body)
+        except _Unreachable:
+            # Drop the connection without responding:
+            self.close_connection = True
+            return
+        self._respond(status, response)
+
+    def _respond(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve a fake implementation of AFIP's wsaa and wsfe.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0, help="in seconds")
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    fake = FakeAFIP(latency=args.latency, error_rate=args.error_rate, seed=args.seed)
+    server = FakeServer(fake, args.host, args.port)
+    print(f"AFIP_WSDLS = {server.wsdls!r}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
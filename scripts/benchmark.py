@@ -0,0 +1,299 @@
+# noqa: INP001
+"""Benchmarks for django_afip's hot paths.
+
+Runs offline, against an in-memory database and a fake AFIP backend (see
+:mod:`django_afip.testing.fake`). Results are written as JSON, and may be compared
+to those of a previous run to detect regressions:
+
+    tox -e benchmark -- --output new.json --baseline old.json
+
+The exit status is non-zero if any benchmark's median is slower than the baseline's
+by more than the given threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+from typing import TYPE_CHECKING
+from typing import Any
+
+import django
+from django.core import management
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from django_afip import models
+
+
+@dataclass
+class Case:
+    """A single benchmark.
+
+    ``setup`` runs before each round (untimed), and its result is passed to
+    ``run``, which is timed.
+    """
+
+    name: str
+    run: Callable[[Any], object]
+    setup: Callable[[], Any] = lambda: None
+    rounds: int = 10
+
+
+def measure(case: Case) -> dict[str, Any]:
+    case.run(case.setup())  # Warm up (e.g.: load WSDLs, templates, fonts).
+
+    timings = []
+    for _ in range(case.rounds):
+        state = case.setup()
+        started = time.perf_counter()
+        case.run(state)
+        timings.append(time.perf_counter() - started)
+
+    return {
+        "rounds": case.rounds,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def create_receipts(
+    pos: models.PointOfSales,
+    count: int,
+    entries: int = 0,
+) -> list[models.Receipt]:
+    """Create ``count`` receipts with VAT and taxes (and ``entries`` entries each)."""
+    from django_afip import models
+
+    vat_type = models.VatType.objects.get(code="5")
+    receipts = []
+    for _ in range(count):
+        receipt = models.Receipt.objects.create(
+            point_of_sales=pos,
+            receipt_type=models.ReceiptType.objects.get(code="6"),
+            concept=models.ConceptType.objects.get(code="1"),
+            document_type=models.DocumentType.objects.get(code="96"),
+            document_number=203012345,
+            issued_date=date.today(),
+            total_amount=130,
+            net_untaxed=0,
+            net_taxed=100,
+            exempt_amount=0,
+            currency=models.CurrencyType.objects.get(code="PES"),
+            currency_quote=1,
+            client_vat_condition=models.ClientVatCondition.objects.get(code="5"),
+        )
+        models.Vat.objects.create(
+            receipt=receipt,
+            vat_type=vat_type,
+            base_amount=100,
+            amount=21,
+        )
+        models.Tax.objects.create(
+            receipt=receipt,
+            tax_type=models.TaxType.objects.get(code="3"),
+            description="Percepción",
+            base_amount=100,
+            aliquot=9,
+            amount=9,
+        )
+        models.ReceiptEntry.objects.bulk_create(
+            models.ReceiptEntry(
+                receipt=receipt,
+                description=f"Item {i}",
+                quantity=1,
+                unit_price=Decimal("1.30"),
+                vat=vat_type,
+            )
+            for i in range(entries)
+        )
+        receipts.append(receipt)
+    return receipts
+
+
+def build_cases() -> list[Case]:
+    from django_afip import factories
+    from django_afip import models
+    from django_afip import serializers
+    from django_afip.pdf import PdfBuilder
+
+    def clear_metadata() -> None:
+        for model in models.GenericAfipType.SUBCLASSES:
+            model.objects.all().delete()
+        models.ClientVatCondition.objects.all().delete()
+
+    cases = [
+        Case("load_metadata", lambda _: models.load_metadata(), clear_metadata),
+    ]
+
+    taxpayer = factories.TaxPayerFactory.create()
+    points_of_sales = iter(range(1, 100_000))
+
+    def new_pos() -> models.PointOfSales:
+        return factories.PointOfSalesFactory.create(
+            owner=taxpayer,
+            number=next(points_of_sales),
+        )
+
+    def unsaved_receipts(count: int) -> Callable[[], models.ReceiptQuerySet]:
+        def setup() -> models.ReceiptQuerySet:
+            receipts = create_receipts(new_pos(), count)
+            return models.Receipt.objects.filter(pk__in=[r.pk for r in receipts])
+
+        return setup
+
+    def numbered_receipts(count: int) -> Callable[[], models.ReceiptQuerySet]:
+        receipts: models.ReceiptQuerySet | None = None
+
+        def setup() -> models.ReceiptQuerySet:
+            nonlocal receipts
+            if receipts is None:
+                receipts = unsaved_receipts(count)()
+                for number, receipt in enumerate(receipts, start=1):
+                    receipt.receipt_number = number
+                    receipt.save()
+            return receipts.all()
+
+        return setup
+
+    def receipt_with_entries(count: int) -> Callable[[], models.Receipt]:
+        receipt: models.Receipt | None = None
+
+        def setup() -> models.Receipt:
+            nonlocal receipt
+            if receipt is None:
+                [receipt] = create_receipts(new_pos(), 1, entries=count)
+                receipt.receipt_number = 1
+                receipt.save()
+                factories.ReceiptValidationFactory.create(receipt=receipt)
+                factories.ReceiptPDFFactory.create(receipt=receipt)
+            return models.Receipt.objects.get(pk=receipt.pk)
+
+        return setup
+
+    for count in (1, 50, 250):
+        cases.append(
+            Case(
+                f"serialize_multiple_receipts[{count}]",
+                serializers.serialize_multiple_receipts,
+                numbered_receipts(count),
+            )
+        )
+
+    cases.append(
+        Case(
+            "validate[50]",
+            lambda receipts: receipts.validate(),
+            unsaved_receipts(50),
+        )
+    )
+    cases.append(
+        Case(
+            "AuthTicket.authorize",
+            lambda _: taxpayer.create_ticket("wsfe"),
+        )
+    )
+    for count, rounds in ((10, 10), (1000, 3)):
+        cases.append(
+            Case(
+                f"PdfBuilder.render_pdf[{count}]",
+                lambda receipt: PdfBuilder().render_pdf(receipt, BytesIO()),
+                receipt_with_entries(count),
+                rounds=rounds,
+            )
+        )
+
+    return cases
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float,
+) -> list[str]:
+    """Return the names of benchmarks which regressed compared to ``baseline``."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["median"] / baseline[name]["median"]
+        result["baseline_ratio"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", help="Write results as JSON into this file.")
+    parser.add_argument("--baseline", help="Compare against results in this file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Maximum slowdown allowed, relative to the baseline (default: 0.2).",
+    )
+    parser.add_argument("-k", dest="filter", help="Only run matching benchmarks.")
+    args = parser.parse_args()
+
+    django.setup()
+    management.call_command("migrate", verbosity=0)
+
+    from django_afip.models import load_metadata
+    from django_afip.testing.fake import FakeAFIP
+
+    load_metadata()
+
+    results = {}
+    with FakeAFIP(seed=0).install():
+        for case in build_cases():
+            if args.filter and args.filter not in case.name:
+                continue
+            results[case.name] = measure(case)
+            print(
+                f"{case.name:40} median {results[case.name]['median'] * 1000:10.2f}ms",
+                file=sys.stderr,
+            )
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["benchmarks"]
+        regressions = compare(results, baseline, args.threshold)
+        for name in regressions:
+            print(
+                f"REGRESSION: {name} is {results[name]['baseline_ratio']:.2f}x slower.",
+                file=sys.stderr,
+            )
+
+    output = {
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "django": django.get_version(),
+            "platform": platform.platform(),
+        },
+        "benchmarks": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+    else:
+        json.dump(output, sys.stdout, indent=2)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
 import pytest
+import requests
+from django.test import override_settings
 
+from django_afip import exceptions
+from django_afip import helpers
 from django_afip.helpers import ServerStatus
 from django_afip.helpers import get_server_status
 
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
 
 @pytest.mark.live
 def test_get_server_status_production() -> None:
@@ -32,3 +43,84 @@ def test_server_status_is_false() -> None:
     server_status = ServerStatus(app=False, db=False, auth=False)
 
     assert not server_status
+
+
+@pytest.fixture
+def status_cache() -> Generator[None, None, None]:
+    helpers._status_cache.clear()
+    yield
+    helpers._status_cache.clear()
+
+
+UP = ServerStatus(app=True, db=True, auth=True)
+DOWN = ServerStatus(app=True, db=False, auth=True)
+
+
+@pytest.mark.usefixtures("status_cache")
+def test_cached_server_status() -> None:
+    with patch("django_afip.helpers.get_server_status", return_value=UP) as mocked:
+        assert helpers.get_cached_server_status(True) is UP
+        assert helpers.get_cached_server_status(True) is UP
+        assert helpers.get_cached_server_status(False) is UP
+
+    assert mocked.call_count == 2
+
+
+@pytest.mark.usefixtures("status_cache")
+@override_settings(AFIP_SERVER_STATUS_TTL=0)
+def test_cached_server_status_expires() -> None:
+    with patch("django_afip.helpers.get_server_status", side_effect=[UP, DOWN]):
+        assert helpers.get_cached_server_status(True) is UP
+        assert helpers.get_cached_server_status(True) is DOWN
+
+
+@pytest.mark.usefixtures("status_cache")
+def test_unreachable_server_status() -> None:
+    with patch(
+        "django_afip.helpers.get_server_status",
+        side_effect=requests.ConnectionError,
+    ):
+        status = helpers.refresh_server_status(True)
+
+    assert status is helpers.UNREACHABLE
+    assert not status
+
+
+@pytest.mark.usefixtures("status_cache")
+def test_server_status_refresher() -> None:
+    with patch("django_afip.helpers.get_server_status", return_value=UP) as mocked:
+        refresher = helpers.ServerStatusRefresher(production=True, interval=0.01)
+        refresher.start()
+        try:
+            while mocked.call_count < 2:
+                time.sleep(0.01)
+        finally:
+            refresher.stop()
+            refresher.join()
+
+    assert helpers.get_cached_server_status(True) is UP
+
+
+@pytest.mark.usefixtures("status_cache")
+def test_circuit_breaker_disabled() -> None:
+    with patch("django_afip.helpers.get_server_status", return_value=DOWN) as mocked:
+        helpers.check_circuit_breaker(True)
+
+    assert mocked.call_count == 0
+
+
+@pytest.mark.usefixtures("status_cache")
+@override_settings(AFIP_CIRCUIT_BREAKER=True)
+def test_circuit_breaker_open() -> None:
+    with (
+        patch("django_afip.helpers.get_server_status", return_value=DOWN),
+        pytest.raises(exceptions.ServiceUnavailable),
+    ):
+        helpers.check_circuit_breaker(True)
+
+
+@pytest.mark.usefixtures("status_cache")
+@override_settings(AFIP_CIRCUIT_BREAKER=True)
+def test_circuit_breaker_closed() -> None:
+    with patch("django_afip.helpers.get_server_status", return_value=UP):
+        helpers.check_circuit_breaker(True)
@@ -8,10 +8,12 @@ from django.conf import settings
 from django.core import serializers
 
 from django_afip import models
+from django_afip import signers
 from django_afip.exceptions import AuthenticationError
 from django_afip.factories import TaxPayerFactory
 from django_afip.factories import get_test_file
 from django_afip.models import AuthTicket
+from django_afip.testing.fake import FakeAFIP
 
 if TYPE_CHECKING:
     from collections.abc import Generator
@@ -29,6 +31,15 @@ def disable_durability_check() -> Generator[None, None, None]:
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_ticket_cache() -> Generator[None, None, None]:
+    """Don't share cached tickets, keys or limits across tests."""
+    yield
+    models.ticket_cache.clear()
+    models._max_receipts_per_request.clear()
+    signers.credential_cache.clear()
+
+
 @pytest.fixture(autouse=True)
 def force_gc_between_tests() -> Generator[None, None, None]:
     """Force garbage collection after each test."""
@@ -50,6 +61,13 @@ def pytest_runtest_setup(item: pytest.Function) -> None:
         _live_mode = True
 
 
+@pytest.fixture
+def fake() -> Generator[FakeAFIP, None, None]:
+    """Replace AFIP's web services with an in-process fake."""
+    with FakeAFIP(seed=0).install() as fake:
+        yield fake
+
+
 @pytest.fixture
 def expired_crt() -> bytes:
     with open(get_test_file("test_expired.crt"), "rb") as crt:
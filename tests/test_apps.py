@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from unittest.mock import call
+from unittest.mock import patch
+
+from django.apps import apps
+from django.test import override_settings
+
+
+@override_settings(AFIP_WARM_UP_CLIENTS=[("wsfe", False), ("wsaa", True)])
+def test_warm_up_clients_on_ready() -> None:
+    with patch("django_afip.clients.warm_up", spec=True) as mocked_warm_up:
+        apps.get_app_config("afip").ready()
+
+    assert mocked_warm_up.call_args_list == [
+        call(["wsfe"], False),
+        call(["wsaa"], True),
+    ]
+
+
+def test_no_warm_up_by_default() -> None:
+    with patch("django_afip.clients.warm_up", spec=True) as mocked_warm_up:
+        apps.get_app_config("afip").ready()
+
+    assert mocked_warm_up.call_count == 0
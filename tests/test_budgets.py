@@ -0,0 +1,150 @@
+"""Query budgets for the library's public operations.
+
+See the "Presupuestos de queries" section of the docs.
+"""
+
+from __future__ import annotations
+
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+import pytest
+
+from django_afip import factories
+from django_afip import models
+from django_afip import serializers
+from django_afip.pdf import PdfBuilder
+from django_afip.testing import query_budget
+
+if TYPE_CHECKING:
+    from django.test import Client
+
+    from django_afip.testing.fake import FakeAFIP
+
+
+@pytest.mark.django_db
+def test_query_budget_exceeded() -> None:
+    with (
+        pytest.raises(AssertionError, match="2 queries executed, but the budget is 1"),
+        query_budget(max_queries=1),
+    ):
+        [models.ReceiptType.objects.count() for _ in range(2)]
+
+
+@pytest.mark.django_db
+def test_query_budget_log() -> None:
+    with query_budget(max_queries=1, max_time=10) as log:
+        models.ReceiptType.objects.count()
+
+    assert log.count == 1
+    assert "COUNT" in log.queries[0][0]
+    assert log.duration > 0
+
+
+@pytest.mark.django_db
+def test_query_budget_time_exceeded() -> None:
+    with (
+        pytest.raises(AssertionError, match="but the budget is 0s"),
+        query_budget(max_time=0),
+    ):
+        models.ReceiptType.objects.count()
+
+
+@pytest.mark.django_db
+def test_populate_metadata(fake: FakeAFIP) -> None:
+    ticket = factories.TaxPayerFactory.create().create_ticket("wsfe")
+
+    with query_budget(max_queries=3):
+        models.ReceiptType.objects.populate(ticket)
+    # Populating again skips existing types:
+    with query_budget(max_queries=3):
+        models.ReceiptType.objects.populate(ticket)
+
+    assert models.ReceiptType.objects.filter(code="11").count() == 1
+
+
+def render_pdf(entries: int) -> int:
+    receipt = factories.ReceiptWithApprovedValidation.create()
+    factories.ReceiptPDFFactory.create(receipt=receipt)
+    factories.ReceiptEntryFactory.create_batch(
+        entries,
+        receipt=receipt,
+        quantity=1,
+        unit_price=10,
+    )
+    receipt = models.Receipt.objects.get(pk=receipt.pk)
+
+    with query_budget(max_queries=8) as log:
+        PdfBuilder(entries_per_page=5).render_pdf(receipt, BytesIO())
+    return log.count
+
+
+@pytest.mark.django_db
+def test_render_pdf() -> None:
+    assert render_pdf(entries=1) == render_pdf(entries=30)
+
+
+def changelist_queries(client: Client, url: str) -> int:
+    with query_budget() as log:
+        response = client.get(url)
+    assert response.status_code == 200
+    return log.count
+
+
+def test_receipt_changelist(admin_client: Client) -> None:
+    factories.ReceiptWithApprovedValidation.create()
+    single = changelist_queries(admin_client, "/admin/afip/receipt/")
+
+    factories.ReceiptWithApprovedValidation.create_batch(9)
+    assert changelist_queries(admin_client, "/admin/afip/receipt/") == single
+
+
+def test_receipt_validation_changelist(admin_client: Client) -> None:
+    factories.ReceiptWithApprovedValidation.create()
+    single = changelist_queries(admin_client, "/admin/afip/receiptvalidation/")
+
+    factories.ReceiptWithApprovedValidation.create_batch(9)
+    assert changelist_queries(admin_client, "/admin/afip/receiptvalidation/") == single
+
+
+def serialize(receipts: int) -> tuple[int, int]:
+    pos = factories.PointOfSalesFactory.create(number=receipts)
+    for number in range(1, receipts + 1):
+        receipt = factories.ReceiptFCEAWithVatTaxAndOptionalsFactory.create(
+            point_of_sales=pos,
+            receipt_number=number,
+        )
+        receipt.related_receipts.add(
+            factories.ReceiptWithApprovedValidation.create(point_of_sales=pos)
+        )
+    ticket = factories.TaxPayerFactory.create().get_or_create_ticket("wsfe")
+    qs = models.Receipt.objects.filter(point_of_sales=pos, receipt_number__isnull=False)
+    qs = qs.filter(validation__isnull=True)
+
+    with query_budget() as serialize_log:
+        serializers.serialize_multiple_receipts(qs)
+    with query_budget() as render_log:
+        serializers.render_cae_request(ticket, qs)
+    return serialize_log.count, render_log.count
+
+
+@pytest.mark.django_db
+def test_serialize_multiple_receipts(fake: FakeAFIP) -> None:
+    assert serialize(receipts=1) == serialize(receipts=10)
+
+
+def validate(receipts: int) -> int:
+    pos = factories.PointOfSalesFactory.create(number=receipts)
+    factories.ReceiptWithVatAndTaxFactory.create_batch(receipts, point_of_sales=pos)
+
+    with query_budget() as log:
+        models.Receipt.objects.filter(point_of_sales=pos).validate()
+    return log.count
+
+
+@pytest.mark.django_db
+def test_validate(fake: FakeAFIP) -> None:
+    # Obtain a ticket ahead of time, so both batches are validated alike:
+    factories.TaxPayerFactory.create().get_or_create_ticket("wsfe")
+
+    assert validate(receipts=1) == validate(receipts=5)
@@ -1,12 +1,40 @@
 from __future__ import annotations
 
+import os
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
 from unittest.mock import patch
 
+import httpx
 import pytest
 import requests
+from asgiref.sync import async_to_sync
+from django.test import override_settings
 from requests.exceptions import SSLError
 
+from django_afip import factories
+from django_afip.clients import AFIPAdapter
+from django_afip.clients import AFIPTransport
+from django_afip.clients import AsyncAFIPTransport
+from django_afip.clients import DjangoCache
+from django_afip.clients import FileSystemCache
+from django_afip.clients import create_cache
+from django_afip.clients import get_async_client
 from django_afip.clients import get_client
+from django_afip.clients import get_operation
+from django_afip.clients import get_or_create_transport
+from django_afip.clients import get_retries
+from django_afip.clients import get_timeout
+from django_afip.clients import get_wsdl
+from django_afip.clients import on_behalf_of
+from django_afip.clients import operation_finished
+from django_afip.clients import reset_connections
+from django_afip.clients import send_raw
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from django_afip.testing.fake import FakeAFIP
 
 
 @pytest.mark.live
@@ -23,7 +51,321 @@ def test_inexisting_service() -> None:
         get_client("nonexistant", False)
 
 
+def test_inexisting_service_async() -> None:
+    with pytest.raises(ValueError, match="Unknown service name, nonexistant"):
+        get_async_client("nonexistant", False)
+
+
+@override_settings(AFIP_WSDLS={"sandbox": {"wsfe": "http://localhost/wsfe?WSDL"}})
+def test_wsdl_overrides() -> None:
+    assert get_wsdl("wsfe", sandbox=True) == "http://localhost/wsfe?WSDL"
+    assert get_wsdl("wsfe") == "https://servicios1.afip.gov.ar/wsfev1/service.asmx?WSDL"
+    assert get_wsdl("wsaa", sandbox=True).startswith("https://wsaahomo.afip.gov.ar/")
+
+
 @pytest.mark.live
 def test_insecure_dh_hack_required() -> None:
     with pytest.raises(SSLError, match="SSL: DH_KEY_TOO_SMALL\\] dh key too small"):
         requests.get("https://servicios1.afip.gov.ar/wsfev1/service.asmx?WSDL")
+
+
+def test_filesystem_cache(tmp_path: Path) -> None:
+    cache = FileSystemCache(path=tmp_path / "wsdl")
+    cache.add("https://example.com/wsfe?WSDL", b"<definitions />")
+
+    assert cache.get("https://example.com/wsfe?WSDL") == b"<definitions />"
+    assert cache.get("https://example.com/missing.xsd") is None
+
+
+def test_filesystem_cache_expired(tmp_path: Path) -> None:
+    cache = FileSystemCache(path=tmp_path, timeout=60)
+    cache.add("https://example.com/wsfe?WSDL", b"<definitions />")
+
+    [file] = tmp_path.iterdir()
+    os.utime(file, (0, 0))
+
+    assert cache.get("https://example.com/wsfe?WSDL") is None
+
+
+def test_filesystem_cache_read_only(tmp_path: Path) -> None:
+    (tmp_path / "wsdl").write_bytes(b"Not a directory")
+    cache = FileSystemCache(path=tmp_path / "wsdl")
+    cache.add("https://example.com/wsfe?WSDL", b"<definitions />")
+
+    assert cache.get("https://example.com/wsfe?WSDL") is None
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+def test_django_cache() -> None:
+    cache = DjangoCache()
+    cache.add("https://example.com/wsfe?WSDL", b"<definitions />")
+
+    assert cache.get("https://example.com/wsfe?WSDL") == b"<definitions />"
+    assert cache.get("https://example.com/missing.xsd") is None
+
+
+def test_create_cache_default() -> None:
+    cache = create_cache()
+
+    assert cache.__class__.__name__ == "SqliteCache"
+
+
+@override_settings(
+    AFIP_WSDL_CACHE={
+        "BACKEND": "django_afip.clients.FileSystemCache",
+        "OPTIONS": {"path": "/tmp/wsdls", "timeout": 60},
+    },
+)
+def test_create_cache_from_settings() -> None:
+    cache = create_cache()
+
+    assert isinstance(cache, FileSystemCache)
+    assert str(cache.path) == "/tmp/wsdls"
+    assert cache.timeout == 60
+
+
+@override_settings(AFIP_WSDL_CACHE=None)
+def test_create_cache_disabled() -> None:
+    assert create_cache() is None
+
+
+def test_reset_connections() -> None:
+    transport = get_or_create_transport()
+
+    with patch.object(transport.session, "close", spec=True) as mocked_close:
+        reset_connections()
+
+    assert mocked_close.call_count == 1
+    # The transport itself (and hence, its cache) is retained:
+    assert get_or_create_transport() is transport
+
+
+def test_get_operation() -> None:
+    service_name, operation = get_operation(
+        "https://wswhomo.afip.gov.ar/wsfev1/service.asmx",
+        {"SOAPAction": '"http://ar.gov.afip.dif.FEV1/FECAESolicitar"'},
+    )
+
+    assert service_name == "wsfe"
+    assert operation == "FECAESolicitar"
+
+
+def test_get_operation_without_soap_action() -> None:
+    service_name, operation = get_operation(
+        "https://wsaahomo.afip.gov.ar/ws/services/LoginCms",
+        {"SOAPAction": '""'},
+        b'<soap-env:Envelope xmlns:soap-env="http://schemas.xmlsoap.org/soap/envelope/">'
+        b"<soap-env:Body><ns0:loginCms xmlns:ns0="
+        b'"http://wsaa.view.sua.dvadac.desein.afip.gov"><ns0:in0>...</ns0:in0>'
+        b"</ns0:loginCms></soap-env:Body></soap-env:Envelope>",
+    )
+
+    assert service_name == "wsaa"
+    assert operation == "loginCms"
+
+
+def test_get_operation_unknown() -> None:
+    assert get_operation("https://example.com/", {}) == ("", "")
+
+
+@override_settings(
+    AFIP_TIMEOUTS={
+        "default": 60,
+        "wsfe": (5, 30),
+        "wsfe.FECAESolicitar": (5, 120),
+    },
+)
+def test_get_timeout() -> None:
+    assert get_timeout("wsfe", "FECAESolicitar") == (5, 120)
+    assert get_timeout("wsfe", "FEDummy") == (5, 30)
+    assert get_timeout("wsaa", "loginCms") == 60
+
+
+def test_get_timeout_default() -> None:
+    assert get_timeout("wsfe", "FECAESolicitar") == (10, 300)
+
+
+@override_settings(AFIP_RETRIES=3)
+def test_get_retries() -> None:
+    assert get_retries("FEParamGetTiposCbte") == 3
+    assert get_retries("FECompConsultar") == 3
+    assert get_retries("FECAESolicitar") == 0
+    assert get_retries("loginCms") == 0
+
+
+@override_settings(AFIP_RETRY_BACKOFF=0)
+def test_transport_retries_read_only_operations() -> None:
+    session = MagicMock()
+    session.post.side_effect = [requests.ConnectionError, MagicMock(status_code=200)]
+    transport = AFIPTransport(session=session)
+
+    response = transport.post(
+        "https://wswhomo.afip.gov.ar/wsfev1/service.asmx",
+        b"<Envelope />",
+        {"SOAPAction": '"http://ar.gov.afip.dif.FEV1/FEDummy"'},
+    )
+
+    assert response.status_code == 200
+    assert session.post.call_count == 2
+    assert session.post.call_args.kwargs["timeout"] == (10, 300)
+
+
+@override_settings(AFIP_RETRY_BACKOFF=0)
+def test_transport_does_not_retry_other_operations() -> None:
+    session = MagicMock()
+    session.post.side_effect = requests.ConnectionError
+    transport = AFIPTransport(session=session)
+
+    with pytest.raises(requests.ConnectionError):
+        transport.post(
+            "https://wswhomo.afip.gov.ar/wsfev1/service.asmx",
+            b"<Envelope />",
+            {"SOAPAction": '"http://ar.gov.afip.dif.FEV1/FECAESolicitar"'},
+        )
+
+    assert session.post.call_count == 1
+
+
+@override_settings(AFIP_POOL_MAXSIZE=32)
+def test_adapter_pool_size() -> None:
+    adapter = AFIPAdapter()
+
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 32
+
+
+def test_send_raw_with_parser() -> None:
+    client = MagicMock()
+    client.service._binding_options = {"address": "https://example.com/service"}
+    client.service._binding.get.return_value.soapaction = "urn:Operation"
+    client.transport.post.return_value = MagicMock(status_code=200, content=b"<a/>")
+    parser = MagicMock()
+
+    result = send_raw(client, "Operation", b"<Envelope />", parser)
+
+    assert result is parser.return_value
+    parser.assert_called_once_with(b"<a/>")
+    client.transport.post.assert_called_once_with(
+        "https://example.com/service",
+        b"<Envelope />",
+        {"SOAPAction": '"urn:Operation"', "Content-Type": "text/xml; charset=utf-8"},
+    )
+    assert client.service._binding.process_reply.call_count == 0
+
+
+def test_send_raw_with_parser_and_fault() -> None:
+    client = MagicMock()
+    client.service._binding_options = {"address": "https://example.com/service"}
+    client.transport.post.return_value = MagicMock(status_code=500)
+    parser = MagicMock()
+
+    result = send_raw(client, "Operation", b"<Envelope />", parser)
+
+    # zeep handles (and raises for) faults:
+    assert result is client.service._binding.process_reply.return_value
+    assert parser.call_count == 0
+
+
+def test_transport_sends_operation_finished() -> None:
+    session = MagicMock()
+    session.post.return_value = MagicMock(status_code=200, content=b"<Response />")
+    transport = AFIPTransport(session=session)
+    receiver = MagicMock()
+    operation_finished.connect(receiver)
+
+    try:
+        with on_behalf_of(20329642330):
+            transport.post(
+                "https://wswhomo.afip.gov.ar/wsfev1/service.asmx",
+                b"<Envelope />",
+                {"SOAPAction": '"http://ar.gov.afip.dif.FEV1/FECAESolicitar"'},
+            )
+    finally:
+        operation_finished.disconnect(receiver)
+
+    assert receiver.call_count == 1
+    kwargs = receiver.call_args.kwargs
+    assert kwargs["sender"] is AFIPTransport
+    assert kwargs["service"] == "wsfe"
+    assert kwargs["operation"] == "FECAESolicitar"
+    assert kwargs["sandbox"] is True
+    assert kwargs["cuit"] == 20329642330
+    assert kwargs["duration"] >= 0
+    assert kwargs["request_size"] == 12
+    assert kwargs["response_size"] == 12
+    assert kwargs["status_code"] == 200
+    assert kwargs["outcome"] == "success"
+    assert kwargs["exception"] is None
+    assert kwargs["attempt"] == 1
+
+
+@pytest.mark.django_db
+def test_transport_sends_operation_for_login(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    receiver = MagicMock()
+    operation_finished.connect(receiver)
+
+    try:
+        taxpayer.create_ticket("wsfe")
+    finally:
+        operation_finished.disconnect(receiver)
+
+    assert receiver.call_count == 1
+    assert receiver.call_args.kwargs["service"] == "wsaa"
+    assert receiver.call_args.kwargs["operation"] == "loginCms"
+
+
+@override_settings(AFIP_RETRY_BACKOFF=0)
+def test_transport_sends_operation_finished_for_each_attempt() -> None:
+    session = MagicMock()
+    error = requests.ConnectionError()
+    session.post.side_effect = [error, MagicMock(status_code=500, content=b"")]
+    transport = AFIPTransport(session=session)
+    receiver = MagicMock()
+    operation_finished.connect(receiver)
+
+    try:
+        transport.post(
+            "https://servicios1.afip.gov.ar/wsfev1/service.asmx",
+            b"<Envelope />",
+            {"SOAPAction": '"http://ar.gov.afip.dif.FEV1/FEDummy"'},
+        )
+    finally:
+        operation_finished.disconnect(receiver)
+
+    first, second = (call.kwargs for call in receiver.call_args_list)
+    assert first["sandbox"] is False
+    assert first["cuit"] is None
+    assert first["outcome"] == "error"
+    assert first["exception"] is error
+    assert first["response_size"] is None
+    assert first["attempt"] == 1
+    assert second["outcome"] == "fault"
+    assert second["status_code"] == 500
+    assert second["attempt"] == 2
+
+
+def test_async_transport_uses_a_client_per_event_loop() -> None:
+    created: list[httpx.AsyncClient] = []
+
+    def create_client() -> httpx.AsyncClient:
+        created.append(
+            httpx.AsyncClient(
+                transport=httpx.MockTransport(lambda request: httpx.Response(200)),
+            ),
+        )
+        return created[-1]
+
+    transport = AsyncAFIPTransport(client_factory=create_client)
+
+    async def post_twice() -> None:
+        for _ in range(2):
+            await transport.post("https://example.com/", b"<Envelope />", {})
+
+    # Each call runs in a new event loop:
+    async_to_sync(post_twice)()
+    async_to_sync(post_twice)()
+
+    assert len(created) == 2
+    assert created[0] is not created[1]
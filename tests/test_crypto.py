@@ -5,6 +5,7 @@ from pathlib import Path
 import pytest
 
 from django_afip import crypto
+from django_afip import exceptions
 
 
 @pytest.fixture
@@ -27,3 +28,8 @@ def test_pkcs7_signing(
     # Data after this index DOES vary depending on current time and other settings:
     assert actual_data[64:1100] == signed_data[64:1100]
     assert 1717 <= len(actual_data) <= 1790
+
+
+def test_load_credentials_corrupt(expired_crt: bytes) -> None:
+    with pytest.raises(exceptions.CorruptCertificate):
+        crypto.load_credentials(expired_crt, b"Not a key")
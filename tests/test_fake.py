@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import pytest
+import requests
+from asgiref.sync import async_to_sync
+from django.test import override_settings
+from zeep import Client
+from zeep.exceptions import Fault as ZeepFault
+
+from django_afip import clients
+from django_afip import exceptions
+from django_afip import factories
+from django_afip import models
+from django_afip.testing.fake import Disconnect
+from django_afip.testing.fake import FakeAFIP
+from django_afip.testing.fake import Fault
+from django_afip.testing.fake import ServiceError
+from django_afip.testing.fake import Timeout
+
+
+@pytest.fixture
+def pos(db: None, fake: FakeAFIP) -> models.PointOfSales:
+    return factories.PointOfSalesFactory.create()
+
+
+def test_dummy(fake: FakeAFIP) -> None:
+    fake.status["DbServer"] = "down"
+
+    response = clients.get_client("wsfe", True).service.FEDummy()
+
+    assert response.AppServer == "OK"
+    assert response.DbServer == "down"
+
+
+def test_injected_fault(fake: FakeAFIP) -> None:
+    fake.inject("FEDummy", Fault("Mantenimiento"))
+
+    with pytest.raises(ZeepFault, match="Mantenimiento"):
+        clients.get_client("wsfe", True).service.FEDummy()
+    assert clients.get_client("wsfe", True).service.FEDummy().AppServer == "OK"
+
+
+@override_settings(AFIP_RETRIES=0)
+def test_injected_disconnect(fake: FakeAFIP) -> None:
+    fake.inject("FEDummy", Disconnect())
+
+    with pytest.raises(requests.ConnectionError):
+        clients.get_client("wsfe", True).service.FEDummy()
+
+
+@override_settings(AFIP_RETRIES=1, AFIP_RETRY_BACKOFF=0)
+def test_injected_timeout_is_retried(fake: FakeAFIP) -> None:
+    fake.inject("FEDummy", Timeout())
+
+    assert clients.get_client("wsfe", True).service.FEDummy().AppServer == "OK"
+    assert fake.calls == ["FEDummy", "FEDummy"]
+
+
+def test_http_server() -> None:
+    fake = FakeAFIP()
+
+    with fake.serve() as server, override_settings(AFIP_WSDLS=server.wsdls):
+        assert clients.get_wsdl("wsfe").startswith(server.url)
+
+        client = Client(
+            clients.get_wsdl("wsfe"),
+            transport=clients.AFIPTransport(cache=None),
+        )
+        assert client.service.FEDummy().AppServer == "OK"
+
+    assert fake.calls == ["FEDummy"]
+
+
+@pytest.mark.django_db
+def test_authorize(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+
+    ticket = taxpayer.create_ticket("wsfe")
+
+    assert ticket.token
+    assert ticket.signature
+    assert fake.calls == ["loginCms"]
+
+
+@pytest.mark.django_db
+def test_validate_numbers_sequentially(
+    fake: FakeAFIP,
+    pos: models.PointOfSales,
+) -> None:
+    factories.ReceiptWithVatAndTaxFactory.create(point_of_sales=pos)
+    factories.ReceiptWithVatAndTaxFactory.create(point_of_sales=pos)
+
+    errs = models.Receipt.objects.all().validate()
+
+    assert errs == []
+    assert list(
+        models.Receipt.objects.order_by("receipt_number").values_list(
+            "receipt_number",
+            "validation__cae",
+        )
+    ) == [(1, "70000000000001"), (2, "70000000000002")]
+    receipt_type = models.Receipt.objects.first().receipt_type
+    assert models.Receipt.objects.fetch_last_receipt_number(pos, receipt_type) == 2
+
+
+@pytest.mark.django_db
+def test_validate_rejects_out_of_sequence(
+    fake: FakeAFIP,
+    pos: models.PointOfSales,
+) -> None:
+    receipt = factories.ReceiptWithVatAndTaxFactory.create(
+        point_of_sales=pos,
+        receipt_number=3,
+    )
+
+    errs = receipt.validate()
+
+    assert len(errs) == 1
+    assert "10016" in errs[0]
+
+
+@pytest.mark.django_db
+def test_validate_continues_existing_sequence(
+    fake: FakeAFIP,
+    pos: models.PointOfSales,
+) -> None:
+    receipt = factories.ReceiptWithVatAndTaxFactory.create(point_of_sales=pos)
+    fake.set_last_receipt_number(pos.owner.cuit, pos.number, 6, 7)
+
+    assert receipt.validate() == []
+
+    receipt.refresh_from_db()
+    assert receipt.receipt_number == 8
+    assert fake.last_receipt_number(pos.owner.cuit, pos.number, 6) == 8
+
+
+@pytest.mark.django_db
+def test_validate_in_chunks(fake: FakeAFIP, pos: models.PointOfSales) -> None:
+    fake.max_receipts = 2
+    factories.ReceiptWithVatAndTaxFactory.create_batch(5, point_of_sales=pos)
+
+    assert models.Receipt.objects.all().validate() == []
+
+    assert list(
+        models.Receipt.objects.order_by("receipt_number").values_list(
+            "receipt_number",
+            "validation__cae",
+        )
+    ) == [(n, f"{70000000000000 + n:014d}") for n in range(1, 6)]
+    assert fake.calls.count("FECAESolicitar") == 3
+
+    # The limit is only fetched once:
+    factories.ReceiptWithVatAndTaxFactory.create(point_of_sales=pos)
+    assert models.Receipt.objects.all().validate() == []
+    assert fake.calls.count("FECompTotXRequest") == 1
+
+
+@pytest.mark.django_db
+def test_avalidate_in_chunks(fake: FakeAFIP, pos: models.PointOfSales) -> None:
+    fake.max_receipts = 2
+    factories.ReceiptWithVatAndTaxFactory.create_batch(3, point_of_sales=pos)
+
+    assert async_to_sync(models.Receipt.objects.all().avalidate)() == []
+
+    assert models.Receipt.objects.filter(validation__isnull=True).count() == 0
+    assert fake.calls.count("FECAESolicitar") == 2
+
+
+@pytest.mark.django_db
+def test_validate_failed_chunk(fake: FakeAFIP, pos: models.PointOfSales) -> None:
+    fake.max_receipts = 2
+    factories.ReceiptWithVatAndTaxFactory.create_batch(5, point_of_sales=pos)
+    fake.inject("FECAESolicitar", ServiceError(10000, "Error interno"))
+
+    with pytest.raises(exceptions.AfipException):
+        models.Receipt.objects.all().validate()
+
+    # Only the receipts in the failed chunk have been numbered:
+    assert models.Receipt.objects.filter(receipt_number__isnull=False).count() == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_validate_all(fake: FakeAFIP) -> None:
+    first = factories.PointOfSalesFactory.create(number=1)
+    second = factories.PointOfSalesFactory.create(number=2)
+    factories.ReceiptWithVatAndTaxFactory.create_batch(3, point_of_sales=first)
+    factories.ReceiptWithVatAndTaxFactory.create_batch(2, point_of_sales=second)
+    factories.ReceiptWithVatAndTaxFactory.create(
+        point_of_sales=second,
+        receipt_type__code=11,
+    )
+    fake.set_last_receipt_number(second.owner.cuit, 2, 11, 7)
+
+    results = models.Receipt.objects.all().validate_all(concurrency=3)
+
+    assert {
+        (pos.number, receipt_type.code): errs
+        for (pos, receipt_type), errs in results.items()
+    } == {(1, "6"): [], (2, "6"): [], (2, "11"): []}
+    assert list(
+        models.Receipt.objects.order_by(
+            "point_of_sales__number",
+            "receipt_type__code",
+            "receipt_number",
+        ).values_list("point_of_sales__number", "receipt_number")
+    ) == [(1, 1), (1, 2), (1, 3), (2, 8), (2, 1), (2, 2)]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_validate_all_failures(fake: FakeAFIP) -> None:
+    first = factories.PointOfSalesFactory.create(number=1)
+    second = factories.PointOfSalesFactory.create(number=2)
+    factories.ReceiptWithVatAndTaxFactory.create(point_of_sales=first)
+    factories.ReceiptWithVatAndTaxFactory.create(point_of_sales=second)
+    fake.inject("FECAESolicitar", ServiceError(10000, "Error interno"))
+
+    results = models.Receipt.objects.all().validate_all(concurrency=1)
+
+    errors = [result for result in results.values() if result]
+    assert len(errors) == 1
+    assert isinstance(errors[0], exceptions.AfipException)
+    assert models.ReceiptValidation.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_revalidate_after_timeout(
+    fake: FakeAFIP,
+    pos: models.PointOfSales,
+) -> None:
+    receipt = factories.ReceiptWithVatAndTaxFactory.create(point_of_sales=pos)
+    fake.inject("FECAESolicitar", Timeout(processed=True))
+
+    with pytest.raises(requests.Timeout):
+        receipt.validate()
+
+    validation = receipt.revalidate()
+    assert validation is not None
+    assert validation.cae == "70000000000001"
+
+
+@pytest.mark.django_db
+def test_service_error(fake: FakeAFIP, pos: models.PointOfSales) -> None:
+    receipt = factories.ReceiptWithVatAndTaxFactory.create(point_of_sales=pos)
+    fake.inject("FECompUltimoAutorizado", ServiceError(501, "Error interno"))
+
+    with pytest.raises(exceptions.AfipException, match="Error 501: Error interno"):
+        models.Receipt.objects.fetch_last_receipt_number(pos, receipt.receipt_type)
+
+
+@pytest.mark.django_db
+def test_fetch_points_of_sales(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    fake.points_of_sales = [1, 2]
+
+    results = taxpayer.fetch_points_of_sales()
+
+    assert [(pos.number, created) for pos, created in results] == [
+        (1, True),
+        (2, True),
+    ]
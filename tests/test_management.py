@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+from unittest.mock import patch
+
 import pytest
 from django.core import management
+from django.core.management.base import CommandError
 
+from django_afip import factories
 from django_afip.models import ClientVatCondition
 from django_afip.models import GenericAfipType
 
@@ -30,3 +34,109 @@ def test_call_load_metadata_populate_client_vat_condition() -> None:
     management.call_command("afipmetadata")
 
     assert ClientVatCondition.objects.count() == 11
+
+
+def test_afip_warmup_command() -> None:
+    with patch("django_afip.clients.warm_up", spec=True) as mocked_warm_up:
+        management.call_command("afipwarmup")
+
+    mocked_warm_up.assert_called_once_with(("wsaa", "wsfe"), None)
+
+
+def test_afip_warmup_command_with_arguments() -> None:
+    with patch("django_afip.clients.warm_up", spec=True) as mocked_warm_up:
+        management.call_command("afipwarmup", "--service", "wsfe", "--sandbox")
+
+    mocked_warm_up.assert_called_once_with(["wsfe"], True)
+
+
+@pytest.mark.django_db
+def test_afip_renew_tickets_command() -> None:
+    with patch(
+        "django_afip.models.AuthTicketManager.renew_expired",
+        return_value=[],
+    ) as mocked_renew_expired:
+        management.call_command("afiprenewtickets", "--window", "60")
+
+    mocked_renew_expired.assert_called_once_with(60.0)
+
+
+@pytest.mark.django_db
+def test_afip_purge_tickets_command() -> None:
+    with patch(
+        "django_afip.models.AuthTicketManager.purge_expired",
+        return_value=3,
+    ) as mocked_purge_expired:
+        management.call_command("afippurgetickets", "--batch-size", "10")
+
+    mocked_purge_expired.assert_called_once_with(10)
+
+
+@pytest.mark.django_db
+def test_afip_authorize_command() -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    factories.TaxPayerFactory.create(cuit=20111111112)
+
+    with patch(
+        "django_afip.models.AuthTicketManager.authorize_many",
+        return_value=([], []),
+    ) as mocked_authorize_many:
+        management.call_command(
+            "afipauthorize",
+            "--cuit",
+            str(taxpayer.cuit),
+            "--concurrency",
+            "4",
+        )
+
+    [(taxpayers, service, concurrency)] = [
+        call.args for call in mocked_authorize_many.call_args_list
+    ]
+    assert list(taxpayers) == [taxpayer]
+    assert (service, concurrency) == ("wsfe", 4)
+
+
+@pytest.mark.django_db
+def test_afip_authorize_command_failures() -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+
+    with (
+        patch(
+            "django_afip.models.AuthTicketManager.authorize_many",
+            return_value=([], [(taxpayer, Exception("Certificado expirado"))]),
+        ),
+        pytest.raises(CommandError, match="Could not authorize 1 taxpayers"),
+    ):
+        management.call_command("afipauthorize", "--all")
+
+
+@pytest.mark.django_db
+def test_afip_validate_command() -> None:
+    with patch(
+        "django_afip.models.ReceiptQuerySet.validate_all",
+        return_value={},
+    ) as mocked_validate_all:
+        management.call_command(
+            "afipvalidate",
+            "--cuit",
+            "20329642330",
+            "--concurrency",
+            "4",
+        )
+
+    mocked_validate_all.assert_called_once_with(4)
+
+
+@pytest.mark.django_db
+def test_afip_validate_command_failures() -> None:
+    receipt = factories.ReceiptFactory.create()
+    pos, receipt_type = receipt.point_of_sales, receipt.receipt_type
+
+    with (
+        patch(
+            "django_afip.models.ReceiptQuerySet.validate_all",
+            return_value={(pos, receipt_type): ["Error 10016: Número inválido"]},
+        ),
+        pytest.raises(CommandError, match="Could not validate receipts for 1 groups"),
+    ):
+        management.call_command("afipvalidate", "--all")
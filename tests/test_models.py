@@ -5,12 +5,17 @@ from datetime import datetime
 from datetime import timedelta
 from decimal import Decimal
 from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
+from asgiref.sync import async_to_sync
 from django import VERSION as DJANGO_VERSION
+from django.db import connection
 from django.db.models import DecimalField
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from freezegun import freeze_time
 
 if DJANGO_VERSION[0] < 5:
@@ -21,6 +26,7 @@ else:
 from django_afip import exceptions
 from django_afip import factories
 from django_afip import models
+from django_afip import parsers
 from django_afip.clients import TZ_AR
 from django_afip.factories import ReceiptFactory
 from django_afip.factories import ReceiptFCEAWithVatAndTaxFactory
@@ -28,6 +34,8 @@ from django_afip.factories import ReceiptFCEAWithVatTaxAndOptionalsFactory
 from django_afip.factories import ReceiptWithApprovedValidation
 from django_afip.factories import ReceiptWithInconsistentVatAndTaxFactory
 from django_afip.factories import ReceiptWithVatAndTaxFactory
+from django_afip.helpers import ServerStatus
+from django_afip.testing import query_budget
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -60,6 +68,259 @@ def test_validate_validated() -> None:
 # TODO: Also another tests that checks that we only pass filtered-out receipts.
 
 
+@pytest.mark.django_db
+def test_avalidate_receipt() -> None:
+    receipt = ReceiptFactory.create()
+    # TYPING: mypy can't understand default querysets.
+    qs: ReceiptQuerySet = models.Receipt.objects.filter(  # type: ignore[assignment]
+        pk=receipt.pk,
+    )
+
+    response = parsers.CAEResponse(
+        processed_date=datetime(2023, 11, 16, 18, 39, 40, tzinfo=TZ_AR),
+        results=(
+            parsers.CAEResult(
+                result="A",
+                receipt_number=8,
+                cae="67190616790549",
+                cae_expiration=date(2023, 11, 26),
+                observations=(),
+            ),
+        ),
+        errors=(),
+    )
+    client = MagicMock()
+
+    with (
+        patch(
+            "django_afip.models.ReceiptManager.afetch_max_receipts_per_request",
+            AsyncMock(return_value=250),
+        ),
+        patch(
+            "django_afip.models.ReceiptManager.afetch_last_receipt_number",
+            AsyncMock(return_value=7),
+        ),
+        patch("django_afip.clients.get_async_client", return_value=client),
+        patch("django_afip.clients.render_message", return_value=b"<envelope />"),
+        patch(
+            "django_afip.clients.asend_raw",
+            AsyncMock(return_value=response),
+        ) as asend_raw,
+        patch("django_afip.serializers.serialize_ticket"),
+        patch("django_afip.serializers.serialize_multiple_receipts"),
+    ):
+        errs = async_to_sync(qs.avalidate)(MagicMock())
+
+    assert errs == []
+    asend_raw.assert_awaited_once_with(
+        client,
+        "FECAESolicitar",
+        b"<envelope />",
+        parsers.parse_cae_response,
+    )
+
+    receipt.refresh_from_db()
+    assert receipt.receipt_number == 8
+    assert receipt.validation.cae == "67190616790549"
+
+
+@pytest.mark.django_db
+@override_settings(AFIP_RAW_SOAP=True)
+def test_validate_with_raw_soap() -> None:
+    receipt = ReceiptFactory.create()
+    # TYPING: mypy can't understand default querysets.
+    qs: ReceiptQuerySet = models.Receipt.objects.filter(  # type: ignore[assignment]
+        pk=receipt.pk,
+    )
+
+    response = parsers.CAEResponse(
+        processed_date=datetime(2023, 11, 16, 18, 39, 40, tzinfo=TZ_AR),
+        results=(
+            parsers.CAEResult(
+                result="A",
+                receipt_number=8,
+                cae="67190616790549",
+                cae_expiration=date(2023, 11, 26),
+                observations=(),
+            ),
+        ),
+        errors=(),
+    )
+    client = MagicMock()
+
+    with (
+        patch(
+            "django_afip.models.ReceiptManager.fetch_max_receipts_per_request",
+            return_value=250,
+        ),
+        patch(
+            "django_afip.models.ReceiptManager.fetch_last_receipt_number",
+            return_value=7,
+        ),
+        patch("django_afip.clients.get_client", return_value=client),
+        patch(
+            "django_afip.serializers.render_cae_request",
+            return_value=b"<envelope />",
+        ),
+        patch("django_afip.clients.send_raw", return_value=response) as send_raw,
+    ):
+        errs = qs.validate(MagicMock())
+
+    assert errs == []
+    send_raw.assert_called_once_with(
+        client,
+        "FECAESolicitar",
+        b"<envelope />",
+        parsers.parse_cae_response,
+    )
+    assert client.create_message.call_count == 0
+
+    receipt.refresh_from_db()
+    assert receipt.receipt_number == 8
+    assert receipt.validation.cae == "67190616790549"
+
+
+@pytest.mark.django_db
+@override_settings(AFIP_CIRCUIT_BREAKER=True)
+def test_validate_during_outage() -> None:
+    receipt = ReceiptFactory.create()
+    # TYPING: mypy can't understand default querysets.
+    qs: ReceiptQuerySet = models.Receipt.objects.filter(  # type: ignore[assignment]
+        pk=receipt.pk,
+    )
+
+    with (
+        patch(
+            "django_afip.helpers.get_cached_server_status",
+            return_value=ServerStatus(app=True, db=False, auth=True),
+        ),
+        patch(
+            "django_afip.models.ReceiptQuerySet._assign_numbers",
+            spec=True,
+        ) as mocked_assign_numbers,
+        pytest.raises(exceptions.ServiceUnavailable),
+    ):
+        qs.validate(MagicMock())
+
+    assert mocked_assign_numbers.call_count == 0
+
+
+@pytest.mark.django_db
+def test_assign_numbers() -> None:
+    first = ReceiptFactory.create()
+    numbered = ReceiptFactory.create(receipt_number=3)
+    last = ReceiptFactory.create()
+    # TYPING: mypy can't understand default querysets.
+    qs: ReceiptQuerySet = models.Receipt.objects.order_by(  # type: ignore[assignment]
+        "id",
+    )
+
+    with query_budget(max_queries=2):
+        numbers = qs._assign_numbers(last_number=7)
+
+    assert numbers == {first.pk: 8, last.pk: 9}
+    assert dict(qs.values_list("pk", "receipt_number")) == {
+        first.pk: 8,
+        numbered.pk: 3,
+        last.pk: 9,
+    }
+
+
+@pytest.mark.django_db
+def test_assign_numbers_in_batches() -> None:
+    ReceiptFactory.create_batch(5)
+    # TYPING: mypy can't understand default querysets.
+    qs: ReceiptQuerySet = models.Receipt.objects.order_by(  # type: ignore[assignment]
+        "id",
+    )
+
+    with (
+        patch.object(models.ReceiptQuerySet, "ASSIGN_NUMBERS_BATCH_SIZE", 2),
+        query_budget(max_queries=4),
+    ):
+        numbers = qs._assign_numbers(last_number=0)
+
+    assert sorted(numbers.values()) == [1, 2, 3, 4, 5]
+    assert list(qs.values_list("receipt_number", flat=True)) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.django_db
+def test_save_validation_results() -> None:
+    approved = ReceiptFactory.create(receipt_number=8)
+    rejected = ReceiptFactory.create(receipt_number=9)
+    # TYPING: mypy can't understand default querysets.
+    qs: ReceiptQuerySet = models.Receipt.objects.all()  # type: ignore[assignment]
+    response = parsers.CAEResponse(
+        processed_date=datetime(2023, 11, 16, 18, 39, 40, tzinfo=TZ_AR),
+        results=(
+            parsers.CAEResult(
+                result="A",
+                receipt_number=8,
+                cae="67190616790549",
+                cae_expiration=date(2023, 11, 26),
+                observations=(
+                    parsers.Message(10217, "Some observation"),
+                    parsers.Message(10218, "Another observation"),
+                ),
+            ),
+            parsers.CAEResult(
+                result="R",
+                receipt_number=9,
+                cae=None,
+                cae_expiration=None,
+                observations=(parsers.Message(10015, "Invalid document number"),),
+            ),
+        ),
+        errors=(),
+    )
+
+    with query_budget(max_queries=10):
+        errs = qs._save_validation_results(response)
+
+    assert errs == ["Error 10015: Invalid document number"]
+    approved.refresh_from_db()
+    assert approved.validation.cae == "67190616790549"
+    assert sorted(approved.validation.observations.values_list("code", flat=True)) == [
+        10217,
+        10218,
+    ]
+    rejected.refresh_from_db()
+    assert rejected.receipt_number is None
+    assert not models.ReceiptValidation.objects.filter(receipt=rejected).exists()
+
+
+@pytest.mark.django_db
+def test_save_validation_results_with_numbers() -> None:
+    receipt = ReceiptFactory.create(receipt_number=8)
+    # TYPING: mypy can't understand default querysets.
+    qs: ReceiptQuerySet = models.Receipt.objects.all()  # type: ignore[assignment]
+    response = parsers.CAEResponse(
+        processed_date=datetime(2023, 11, 16, 18, 39, 40, tzinfo=TZ_AR),
+        results=(
+            parsers.CAEResult(
+                result="A",
+                receipt_number=8,
+                cae="67190616790549",
+                cae_expiration=date(2023, 11, 26),
+                observations=(),
+            ),
+        ),
+        errors=(),
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        qs._save_validation_results(response, {receipt.pk: 8})
+
+    # Receipts aren't looked up by their number again:
+    assert not [
+        query
+        for query in queries
+        if query["sql"].startswith("SELECT") and "receipt_number" in query["sql"]
+    ]
+    receipt.refresh_from_db()
+    assert receipt.validation.cae == "67190616790549"
+
+
 def test_default_receipt_manager() -> None:
     assert isinstance(models.Receipt.objects, models.ReceiptManager)
 
@@ -222,8 +483,9 @@ def test_fetch_existing_data(populated_db: None) -> None:
         point_of_sales=pos,
     )
 
-    assert receipt.CbteDesde == last_receipt_number
-    assert receipt.PtoVta == pos.number
+    assert receipt is not None
+    assert receipt.receipt_number == last_receipt_number
+    assert receipt.point_of_sales == pos.number
 
 
 @pytest.mark.django_db
@@ -284,6 +546,39 @@ def test_receipt_revalidate_without_receipt_number() -> None:
     assert validation is None
 
 
+@pytest.mark.django_db
+def test_revalidation_with_observations() -> None:
+    receipt = ReceiptFactory.create(receipt_number=8)
+    receipt_data = parsers.ReceiptData(
+        receipt_type=6,
+        point_of_sales=receipt.point_of_sales.number,
+        receipt_number=8,
+        issued_date=date(2023, 11, 16),
+        total_amount=Decimal("130"),
+        result="A",
+        cae="67190616790549",
+        cae_expiration=date(2023, 11, 26),
+        processed_date=datetime(2023, 11, 16, 18, 39, 40, tzinfo=TZ_AR),
+        observations=(
+            parsers.Message(10217, "Some observation"),
+            parsers.Message(10218, "Another observation"),
+        ),
+    )
+
+    with patch(
+        "django_afip.models.ReceiptManager.fetch_receipt_data",
+        return_value=receipt_data,
+    ):
+        validation = receipt.revalidate()
+
+    assert validation is not None
+    assert validation.cae == "67190616790549"
+    assert sorted(validation.observations.values_list("code", flat=True)) == [
+        10217,
+        10218,
+    ]
+
+
 @pytest.mark.django_db
 def test_receipt_is_validated_when_not_validated() -> None:
     receipt = ReceiptFactory.create()
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from datetime import date
 from datetime import datetime
+from decimal import Decimal
 
+from django_afip import exceptions
 from django_afip import parsers
 from django_afip.clients import TZ_AR
 
@@ -42,3 +44,175 @@ def test_weirdly_encoded() -> None:
     # This is the encoding AFIP sometimes uses:
     string = "AÃ±adir paÃ\xads"
     assert parsers.parse_string(string) == "Añadir país"
+
+
+CAE_RESPONSE = b"""<?xml version="1.0" encoding="utf-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"
+    xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+    xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+  <soap:Body>
+    <FECAESolicitarResponse xmlns="http://ar.gov.afip.dif.FEV1/">
+      <FECAESolicitarResult>
+        <FeCabResp>
+          <Cuit>20329642330</Cuit>
+          <PtoVta>1</PtoVta>
+          <CbteTipo>6</CbteTipo>
+          <FchProceso>20231116183940</FchProceso>
+          <CantReg>2</CantReg>
+          <Resultado>P</Resultado>
+          <Reproceso>N</Reproceso>
+        </FeCabResp>
+        <FeDetResp>
+          <FECAEDetResponse>
+            <Concepto>1</Concepto>
+            <DocTipo>96</DocTipo>
+            <DocNro>203012345</DocNro>
+            <CbteDesde>8</CbteDesde>
+            <CbteHasta>8</CbteHasta>
+            <CbteFch>20231116</CbteFch>
+            <Resultado>A</Resultado>
+            <Observaciones>
+              <Obs>
+                <Code>10217</Code>
+                <Msg>Some observation</Msg>
+              </Obs>
+            </Observaciones>
+            <CAE>67190616790549</CAE>
+            <CAEFchVto>20231126</CAEFchVto>
+          </FECAEDetResponse>
+          <FECAEDetResponse>
+            <Concepto>1</Concepto>
+            <DocTipo>96</DocTipo>
+            <DocNro>203012345</DocNro>
+            <CbteDesde>9</CbteDesde>
+            <CbteHasta>9</CbteHasta>
+            <CbteFch>20231116</CbteFch>
+            <Resultado>R</Resultado>
+            <Observaciones>
+              <Obs>
+                <Code>10015</Code>
+                <Msg>Invalid document number</Msg>
+              </Obs>
+            </Observaciones>
+            <CAE />
+            <CAEFchVto />
+          </FECAEDetResponse>
+        </FeDetResp>
+        <Events>
+          <Evt>
+            <Code>51</Code>
+            <Msg>Some event</Msg>
+          </Evt>
+        </Events>
+      </FECAESolicitarResult>
+    </FECAESolicitarResponse>
+  </soap:Body>
+</soap:Envelope>
+"""
+
+ERROR_RESPONSE = b"""<?xml version="1.0" encoding="utf-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+  <soap:Body>
+    <FECompConsultarResponse xmlns="http://ar.gov.afip.dif.FEV1/">
+      <FECompConsultarResult>
+        <Errors>
+          <Err>
+            <Code>602</Code>
+            <Msg>Sin Resultados</Msg>
+          </Err>
+        </Errors>
+      </FECompConsultarResult>
+    </FECompConsultarResponse>
+  </soap:Body>
+</soap:Envelope>
+"""
+
+RECEIPT_DATA_RESPONSE = b"""<?xml version="1.0" encoding="utf-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+  <soap:Body>
+    <FECompConsultarResponse xmlns="http://ar.gov.afip.dif.FEV1/">
+      <FECompConsultarResult>
+        <ResultGet>
+          <Concepto>1</Concepto>
+          <DocTipo>96</DocTipo>
+          <DocNro>203012345</DocNro>
+          <CbteDesde>8</CbteDesde>
+          <CbteHasta>8</CbteHasta>
+          <CbteFch>20231116</CbteFch>
+          <ImpTotal>130.5</ImpTotal>
+          <Iva>
+            <AlicIva>
+              <Id>5</Id>
+              <BaseImp>100</BaseImp>
+              <Importe>21</Importe>
+            </AlicIva>
+          </Iva>
+          <Resultado>A</Resultado>
+          <CodAutorizacion>67190616790549</CodAutorizacion>
+          <EmisionTipo>CAE</EmisionTipo>
+          <FchVto>20231126</FchVto>
+          <FchProceso>20231116183940</FchProceso>
+          <PtoVta>1</PtoVta>
+          <CbteTipo>6</CbteTipo>
+        </ResultGet>
+      </FECompConsultarResult>
+    </FECompConsultarResponse>
+  </soap:Body>
+</soap:Envelope>
+"""
+
+
+def test_parse_cae_response() -> None:
+    response = parsers.parse_cae_response(CAE_RESPONSE)
+
+    assert response.processed_date == datetime(2023, 11, 16, 18, 39, 40, tzinfo=TZ_AR)
+    assert response.errors == ()
+    assert response.results == (
+        parsers.CAEResult(
+            result="A",
+            receipt_number=8,
+            cae="67190616790549",
+            cae_expiration=date(2023, 11, 26),
+            observations=(parsers.Message(10217, "Some observation"),),
+        ),
+        parsers.CAEResult(
+            result="R",
+            receipt_number=9,
+            cae=None,
+            cae_expiration=None,
+            observations=(parsers.Message(10015, "Invalid document number"),),
+        ),
+    )
+
+
+def test_parse_cae_response_with_errors() -> None:
+    response = parsers.parse_cae_response(ERROR_RESPONSE)
+
+    assert response.results == ()
+    assert response.errors == (parsers.Message(602, "Sin Resultados"),)
+    assert str(exceptions.AfipException(response)) == "Error 602: Sin Resultados"
+
+
+def test_parse_receipt_data() -> None:
+    response = parsers.parse_receipt_data(RECEIPT_DATA_RESPONSE)
+
+    assert response.errors == ()
+    assert response.receipt == parsers.ReceiptData(
+        receipt_type=6,
+        point_of_sales=1,
+        receipt_number=8,
+        issued_date=date(2023, 11, 16),
+        total_amount=Decimal("130.5"),
+        result="A",
+        cae="67190616790549",
+        cae_expiration=date(2023, 11, 26),
+        processed_date=datetime(2023, 11, 16, 18, 39, 40, tzinfo=TZ_AR),
+        observations=(),
+    )
+
+
+def test_parse_receipt_data_not_found() -> None:
+    response = parsers.parse_receipt_data(ERROR_RESPONSE)
+
+    assert response.receipt is None
+    assert response.errors == (parsers.Message(602, "Sin Resultados"),)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from zeep.wsdl.utils import etree_to_string
+
+from django_afip import factories
+from django_afip import models
+from django_afip import serializers
+from django_afip.clients import get_client
+
+# Render zeep's envelopes from the fake's WSDL, without network access:
+pytestmark = pytest.mark.usefixtures("fake")
+
+
+def render_with_zeep(
+    ticket: models.AuthTicket, receipts: models.ReceiptQuerySet
+) -> bytes:
+    client = get_client("wsfe")
+    envelope = client.create_message(
+        client.service,
+        "FECAESolicitar",
+        serializers.serialize_ticket(ticket),
+        serializers.serialize_multiple_receipts(receipts),
+    )
+    return etree_to_string(envelope)
+
+
+@pytest.fixture
+def pos(db: None) -> models.PointOfSales:
+    return factories.PointOfSalesFactory.create()
+
+
+@pytest.fixture
+def ticket(pos: models.PointOfSales) -> models.AuthTicket:
+    return models.AuthTicket(
+        owner=pos.owner,
+        token="PD94bWwgdmVyc2lvbj0iMS4wIiBlbmNvZGluZz0iVVRGLTgiPz4=",
+        signature="a+b/c&d<e>",
+    )
+
+
+@pytest.mark.django_db
+def test_render_cae_request_matches_zeep(
+    pos: models.PointOfSales,
+    ticket: models.AuthTicket,
+) -> None:
+    for number in (1, 2):
+        factories.ReceiptWithVatAndTaxFactory.create(
+            receipt_number=number,
+            point_of_sales=pos,
+        )
+    factories.ReceiptFactory.create(receipt_number=3, point_of_sales=pos)
+    receipts = models.Receipt.objects.all()
+
+    assert serializers.render_cae_request(ticket, receipts) == render_with_zeep(
+        ticket, receipts
+    )
+
+
+@pytest.mark.django_db
+def test_render_cae_request_matches_zeep_service_optionals(
+    pos: models.PointOfSales,
+    ticket: models.AuthTicket,
+) -> None:
+    receipt = factories.ReceiptFCEAWithVatTaxAndOptionalsFactory.create(
+        receipt_number=1,
+        point_of_sales=pos,
+        concept__code=2,
+        service_start=date(2023, 10, 1),
+        service_end=date(2023, 10, 31),
+        expiration_date=date(2023, 11, 30),
+    )
+    receipts = models.Receipt.objects.filter(pk=receipt.pk)
+
+    assert serializers.render_cae_request(ticket, receipts) == render_with_zeep(
+        ticket, receipts
+    )
+
+
+@pytest.mark.django_db
+def test_render_cae_request_matches_zeep_related_receipts(
+    pos: models.PointOfSales,
+    ticket: models.AuthTicket,
+) -> None:
+    invoice = factories.ReceiptWithVatAndTaxFactory.create(
+        receipt_number=1, point_of_sales=pos
+    )
+    credit_note = factories.ReceiptWithClientVatConditionFactory.create(
+        receipt_number=2,
+        point_of_sales=pos,
+        receipt_type__code=8,
+    )
+    credit_note.related_receipts.set([invoice])
+    receipts = models.Receipt.objects.filter(pk=credit_note.pk)
+
+    assert serializers.render_cae_request(ticket, receipts) == render_with_zeep(
+        ticket, receipts
+    )
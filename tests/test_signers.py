@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import os
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+from django.test import override_settings
+
+from django_afip import exceptions
+from django_afip import factories
+from django_afip import models
+from django_afip import signers
+from django_afip.testing.fake import FakeAFIP
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+
+@pytest.fixture(autouse=True)
+def clear_signer() -> Generator[None, None, None]:
+    signers.get_signer.cache_clear()
+    yield
+    signers.get_signer.cache_clear()
+
+
+@pytest.fixture
+def signer_socket(tmp_path: Path) -> Generator[str, None, None]:
+    path = str(tmp_path / "signer.sock")
+    with (
+        ThreadPoolExecutor(2) as executor,
+        signers.SignerServer(path, executor) as server,
+    ):
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        yield path
+        server.shutdown()
+        thread.join()
+
+
+def test_default_signer() -> None:
+    assert isinstance(signers.get_signer(), signers.LocalSigner)
+
+
+@override_settings(
+    AFIP_SIGNER={
+        "BACKEND": "django_afip.signers.SocketSigner",
+        "OPTIONS": {"path": "/run/afip-signer.sock", "timeout": 5},
+    }
+)
+def test_configured_signer() -> None:
+    signer = signers.get_signer()
+
+    assert isinstance(signer, signers.SocketSigner)
+    assert signer.path == "/run/afip-signer.sock"
+    assert signer.timeout == 5
+
+
+class IncompleteSigner(signers.Signer):
+    pass
+
+
+@override_settings(AFIP_SIGNER={"BACKEND": "tests.test_signers.IncompleteSigner"})
+def test_incomplete_signer() -> None:
+    with pytest.raises(TypeError, match="abstract method"):
+        signers.get_signer()
+
+
+def test_signer_socket_is_private(signer_socket: str) -> None:
+    assert stat.S_IMODE(os.stat(signer_socket).st_mode) == 0o600
+
+
+@pytest.mark.django_db(transaction=True)
+def test_socket_signer(signer_socket: str) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    other = factories.AlternateTaxpayerFactory.create()
+
+    signatures = signers.SocketSigner(signer_socket).sign_many(
+        [(taxpayer, b"Some data."), (other, b"Other data.")]
+    )
+
+    assert len(signatures) == 2
+    assert b"Some data." in signatures[0]
+    assert b"Other data." in signatures[1]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_socket_signer_errors(signer_socket: str) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    signer = signers.SocketSigner(signer_socket)
+    missing = models.TaxPayer(pk=taxpayer.pk + 1)
+
+    with pytest.raises(exceptions.SigningError, match="does not exist"):
+        signer.sign(missing, b"Some data.")
+
+
+def test_socket_signer_authentication_errors() -> None:
+    result = {"error": "CorruptCertificate", "message": "Not a key"}
+
+    with pytest.raises(exceptions.CorruptCertificate, match="Not a key"):
+        signers._decode_result(result)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_authorize_with_socket_signer(signer_socket: str) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+
+    with (
+        FakeAFIP().install() as fake,
+        override_settings(
+            AFIP_SIGNER={
+                "BACKEND": "django_afip.signers.SocketSigner",
+                "OPTIONS": {"path": signer_socket},
+            }
+        ),
+    ):
+        signers.get_signer.cache_clear()
+        ticket = taxpayer.create_ticket("wsfe")
+
+    assert ticket.token
+    assert fake.calls == ["loginCms"]
@@ -0,0 +1,470 @@
+from __future__ import annotations
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import override_settings
+
+from django_afip import crypto
+from django_afip import exceptions
+from django_afip import factories
+from django_afip import models
+from django_afip import signers
+from django_afip.testing import query_budget
+from django_afip.testing.fake import FakeAFIP
+from django_afip.testing.fake import Fault
+from django_afip.testing.fake import ServiceError
+
+
+@pytest.mark.django_db
+def test_cached_ticket_skips_db(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    ticket = taxpayer.create_ticket("wsfe")
+
+    with query_budget(max_queries=0):
+        cached = taxpayer.get_or_create_ticket("wsfe")
+
+    assert cached.token == ticket.token
+    assert cached.owner is taxpayer
+    assert taxpayer.get_ticket("wsaa") is None
+
+
+@pytest.mark.django_db
+def test_ticket_cached_after_first_read(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    ticket = taxpayer.create_ticket("wsfe")
+    models.ticket_cache.clear()
+
+    with query_budget(max_queries=1):
+        assert taxpayer.get_ticket("wsfe") == ticket
+    with query_budget(max_queries=0):
+        assert taxpayer.get_ticket("wsfe") == ticket
+
+
+@pytest.mark.django_db
+def test_expired_ticket_not_returned(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    ticket = taxpayer.create_ticket("wsfe")
+    models.AuthTicket.objects.filter(pk=ticket.pk).update(
+        expires=datetime.now(timezone.utc) - timedelta(minutes=1),
+    )
+    ticket.expires = datetime.now(timezone.utc) - timedelta(minutes=1)
+    models.ticket_cache.set(ticket)
+
+    assert taxpayer.get_ticket("wsfe") is None
+
+
+@pytest.mark.django_db
+def test_rejected_ticket_is_invalidated(fake: FakeAFIP) -> None:
+    pos = factories.PointOfSalesFactory.create()
+    receipt_type = factories.ReceiptTypeFactory.create()
+    ticket = pos.owner.create_ticket("wsfe")
+    fake.inject(
+        "FECompUltimoAutorizado",
+        ServiceError(600, "ValidacionDeToken: No validaron las firmas digitales"),
+    )
+
+    with pytest.raises(exceptions.AfipException, match="Error 600"):
+        models.Receipt.objects.fetch_last_receipt_number(pos, receipt_type)
+
+    assert pos.owner.get_ticket("wsfe") is None
+    ticket.refresh_from_db()
+    assert ticket.expires <= datetime.now(timezone.utc)
+
+    # A new ticket is created for the next request:
+    assert models.Receipt.objects.fetch_last_receipt_number(pos, receipt_type) == 0
+    assert fake.calls.count("loginCms") == 2
+
+
+@pytest.mark.django_db
+def test_other_errors_keep_ticket(fake: FakeAFIP) -> None:
+    pos = factories.PointOfSalesFactory.create()
+    receipt_type = factories.ReceiptTypeFactory.create()
+    ticket = pos.owner.create_ticket("wsfe")
+    fake.inject("FECompUltimoAutorizado", ServiceError(501, "Error interno"))
+
+    with pytest.raises(exceptions.AfipException, match="Error 501"):
+        models.Receipt.objects.fetch_last_receipt_number(pos, receipt_type)
+
+    assert pos.owner.get_ticket("wsfe") == ticket
+
+
+@pytest.mark.django_db
+@override_settings(AFIP_TICKET_CACHE="default")
+def test_shared_cache(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    ticket = taxpayer.create_ticket("wsfe")
+    # Simulate another process, which has an empty in-process cache:
+    models.ticket_cache.clear()
+
+    with query_budget(max_queries=0):
+        cached = taxpayer.get_ticket("wsfe")
+
+    assert cached == ticket
+    assert cached.token == ticket.token
+    assert cached.expires == ticket.expires
+
+    ticket.invalidate()
+    models.ticket_cache.clear()
+    assert taxpayer.get_ticket("wsfe") is None
+
+
+@pytest.mark.django_db
+def test_async_cached_ticket(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    ticket = async_to_sync(taxpayer.acreate_ticket)("wsfe")
+
+    with query_budget(max_queries=0):
+        cached = async_to_sync(taxpayer.aget_or_create_ticket)("wsfe")
+
+    assert cached.token == ticket.token
+    assert fake.calls == ["loginCms"]
+
+
+def expire_in(ticket: models.AuthTicket, delta: timedelta) -> None:
+    models.AuthTicket.objects.filter(pk=ticket.pk).update(
+        expires=datetime.now(timezone.utc) + delta,
+    )
+
+
+@pytest.mark.django_db
+def test_renew_expired(fake: FakeAFIP) -> None:
+    expired = factories.TaxPayerFactory.create()
+    old_ticket = expired.create_ticket("wsfe")
+    expire_in(old_ticket, timedelta(minutes=-10))
+    valid = factories.AlternateTaxpayerFactory.create()
+    expire_in(valid.create_ticket("wsfe"), timedelta(hours=10))
+    models.ticket_cache.clear()
+
+    [ticket] = models.AuthTicket.objects.renew_expired(window=30 * 60)
+
+    assert ticket.owner == expired
+    assert ticket.service == "wsfe"
+    assert ticket != old_ticket
+    assert expired.get_ticket("wsfe") == ticket
+    assert models.AuthTicket.objects.renew_expired(window=30 * 60) == []
+
+
+@pytest.mark.django_db
+def test_renew_expired_skips_valid(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    expire_in(taxpayer.create_ticket("wsfe"), timedelta(minutes=10))
+
+    assert models.AuthTicket.objects.renew_expired(window=30 * 60) == []
+    # AFIP would refuse a new ticket while this one is valid:
+    assert fake.calls == ["loginCms"]
+
+
+@pytest.mark.django_db
+def test_renew_expired_skips_unused(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    expire_in(taxpayer.create_ticket("wsfe"), timedelta(hours=-2))
+
+    assert models.AuthTicket.objects.renew_expired(window=30 * 60) == []
+
+
+@pytest.mark.django_db
+def test_renew_expired_still_valid_for_afip(
+    fake: FakeAFIP,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    expire_in(taxpayer.create_ticket("wsfe"), timedelta(seconds=-1))
+    fake.inject(
+        "loginCms",
+        Fault("El CEE ya posee un TA valido para el acceso al WSN solicitado"),
+    )
+
+    assert models.AuthTicket.objects.renew_expired(window=30 * 60) == []
+    assert "Could not renew" not in caplog.text
+
+    # It's retried on the next run:
+    [ticket] = models.AuthTicket.objects.renew_expired(window=30 * 60)
+    assert ticket.owner == taxpayer
+
+
+@pytest.mark.django_db
+def test_renew_expired_failure(
+    fake: FakeAFIP,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    expire_in(taxpayer.create_ticket("wsfe"), timedelta(minutes=-10))
+    fake.inject("loginCms", Fault("Certificado expirado"))
+
+    assert models.AuthTicket.objects.renew_expired(window=30 * 60) == []
+    assert "Could not renew the wsfe ticket" in caplog.text
+
+
+@pytest.mark.django_db
+def test_next_expiration(fake: FakeAFIP) -> None:
+    first = factories.TaxPayerFactory.create()
+    expire_in(first.create_ticket("wsfe"), timedelta(hours=1))
+    replaced = first.create_ticket("wsaa")
+    expire_in(replaced, timedelta(minutes=5))
+    expire_in(first.create_ticket("wsaa"), timedelta(hours=2))
+    expire_in(first.create_ticket("wsfe"), timedelta(minutes=-5))
+    second = factories.AlternateTaxpayerFactory.create()
+    soonest = second.create_ticket("wsfe")
+    expire_in(soonest, timedelta(minutes=30))
+
+    soonest.refresh_from_db()
+    assert models.AuthTicket.objects.next_expiration() == soonest.expires
+
+
+@pytest.mark.django_db
+def test_next_expiration_without_tickets() -> None:
+    assert models.AuthTicket.objects.next_expiration() is None
+
+
+@pytest.mark.django_db
+def test_ticket_renewer_waits_for_expiration(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    expire_in(taxpayer.create_ticket("wsfe"), timedelta(minutes=-1))
+    other = factories.AlternateTaxpayerFactory.create()
+    expire_in(other.create_ticket("wsfe"), timedelta(minutes=10))
+
+    wait = models.TicketRenewer(interval=3600).renew()
+
+    assert 9 * 60 < wait <= 10 * 60 + models.TicketRenewer.DELAY
+    assert fake.calls == ["loginCms", "loginCms", "loginCms"]
+    assert taxpayer.get_ticket("wsfe") is not None
+
+
+@pytest.mark.django_db
+def test_ticket_renewer_without_tickets() -> None:
+    assert models.TicketRenewer(interval=60).renew() == 60
+
+
+@pytest.mark.django_db
+def test_concurrent_creation_reuses_ticket(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    ticket = taxpayer.create_ticket("wsfe")
+
+    # Simulate another process having created a ticket after we checked:
+    with patch.object(models.TaxPayer, "get_ticket", return_value=None):
+        assert taxpayer.get_or_create_ticket("wsfe") == ticket
+
+    assert fake.calls == ["loginCms"]
+
+
+@pytest.mark.django_db
+def test_exclusive_creation_reuses_valid_ticket(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    expire_in(taxpayer.create_ticket("wsfe"), timedelta(minutes=-10))
+    fresh = taxpayer.create_ticket("wsfe")
+
+    ticket, created = taxpayer._get_or_create_ticket_exclusively("wsfe")
+
+    assert (ticket, created) == (fresh, False)
+    assert fake.calls == ["loginCms", "loginCms"]
+
+
+@pytest.mark.django_db
+def test_purge_expired(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    for _ in range(5):
+        expire_in(taxpayer.create_ticket("wsfe"), timedelta(minutes=-10))
+    ticket = taxpayer.create_ticket("wsfe")
+
+    with query_budget(max_queries=7):
+        assert models.AuthTicket.objects.purge_expired(batch_size=2) == 5
+
+    assert list(models.AuthTicket.objects.all()) == [ticket]
+
+
+@pytest.mark.django_db
+@override_settings(AFIP_PURGE_EXPIRED_TICKETS=True)
+def test_create_ticket_purges_expired(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    expire_in(taxpayer.create_ticket("wsfe"), timedelta(minutes=-10))
+    other_service = taxpayer.create_ticket("ws_sr_constancia_inscripcion")
+    expire_in(other_service, timedelta(minutes=-10))
+
+    ticket = taxpayer.create_ticket("wsfe")
+
+    assert set(models.AuthTicket.objects.all()) == {ticket, other_service}
+
+
+@pytest.mark.django_db
+def test_get_any_active_prefers_latest(fake: FakeAFIP) -> None:
+    first = factories.TaxPayerFactory.create()
+    expire_in(first.create_ticket("wsfe"), timedelta(hours=1))
+    second = factories.AlternateTaxpayerFactory.create()
+    ticket = second.create_ticket("wsfe")
+
+    with query_budget(max_queries=1):
+        active = models.AuthTicket.objects.get_any_active("wsfe")
+        assert active.owner == second
+
+    assert active == ticket
+
+
+@pytest.mark.django_db
+def test_get_any_active_creates_for_first_taxpayer(fake: FakeAFIP) -> None:
+    first = factories.TaxPayerFactory.create()
+    factories.AlternateTaxpayerFactory.create()
+
+    ticket = models.AuthTicket.objects.get_any_active("wsfe")
+
+    assert ticket.owner == first
+    assert models.AuthTicket.objects.get_any_active("wsfe") == ticket
+    assert fake.calls == ["loginCms"]
+
+
+@pytest.mark.django_db
+def test_get_any_active_default_taxpayer(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create(cuit=20111111112)
+    factories.AlternateTaxpayerFactory.create().create_ticket("wsfe")
+
+    with override_settings(AFIP_DEFAULT_TAXPAYER=20111111112):
+        ticket = models.AuthTicket.objects.get_any_active("wsfe")
+
+    assert ticket.owner == taxpayer
+
+
+@pytest.mark.django_db
+@override_settings(AFIP_DEFAULT_TAXPAYER=20111111112)
+def test_get_any_active_missing_default_taxpayer() -> None:
+    with pytest.raises(exceptions.AuthenticationError, match="20111111112"):
+        models.AuthTicket.objects.get_any_active("wsfe")
+
+
+@pytest.mark.django_db
+def test_get_any_active_without_taxpayers() -> None:
+    with pytest.raises(exceptions.AuthenticationError, match="no taxpayers"):
+        models.AuthTicket.objects.get_any_active("wsfe")
+
+
+@pytest.mark.django_db
+def test_credentials_cached(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+
+    with patch(
+        "django_afip.crypto.load_credentials",
+        wraps=crypto.load_credentials,
+    ) as load_credentials:
+        taxpayer.create_ticket("wsfe")
+        taxpayer.create_ticket("ws_sr_constancia_inscripcion")
+        assert load_credentials.call_count == 1
+
+        # Saving may have replaced the files:
+        taxpayer.save()
+        taxpayer.create_ticket("wsfe")
+        assert load_credentials.call_count == 2
+
+
+@pytest.mark.django_db
+@override_settings(AFIP_CREDENTIAL_CACHE_SIZE=1)
+def test_credential_cache_size(fake: FakeAFIP) -> None:
+    first = factories.TaxPayerFactory.create()
+    second = factories.AlternateTaxpayerFactory.create()
+
+    with patch(
+        "django_afip.crypto.load_credentials",
+        wraps=crypto.load_credentials,
+    ) as load_credentials:
+        for taxpayer in (first, second, second, first):
+            taxpayer.create_ticket("wsfe")
+
+    assert load_credentials.call_count == 3
+
+
+@pytest.mark.django_db
+def test_authorize_many(fake: FakeAFIP) -> None:
+    first = factories.TaxPayerFactory.create()
+    second = factories.AlternateTaxpayerFactory.create()
+
+    tickets, failed = models.AuthTicket.objects.authorize_many(
+        [first, second],
+        "wsfe",
+        concurrency=2,
+    )
+
+    assert failed == []
+    assert {ticket.owner for ticket in tickets} == {first, second}
+    assert set(models.AuthTicket.objects.all()) == set(tickets)
+    with query_budget(max_queries=0):
+        assert first.get_ticket("wsfe") in tickets
+    assert fake.calls == ["loginCms", "loginCms"]
+
+
+@pytest.mark.django_db
+def test_authorize_many_failure(fake: FakeAFIP) -> None:
+    first = factories.TaxPayerFactory.create()
+    second = factories.AlternateTaxpayerFactory.create()
+    fake.inject("loginCms", Fault("Certificado expirado"))
+
+    tickets, failed = models.AuthTicket.objects.authorize_many(
+        [first, second],
+        "wsfe",
+    )
+
+    assert len(tickets) == 1
+    [(taxpayer, error)] = failed
+    assert taxpayer in (first, second)
+    assert taxpayer != tickets[0].owner
+    assert isinstance(error, exceptions.CertificateExpired)
+    assert models.AuthTicket.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_authorize_many_signs_in_batch(fake: FakeAFIP) -> None:
+    first = factories.TaxPayerFactory.create()
+    second = factories.AlternateTaxpayerFactory.create()
+
+    with patch.object(
+        signers.LocalSigner,
+        "sign_many",
+        autospec=True,
+        side_effect=signers.LocalSigner.sign_many,
+    ) as sign_many:
+        tickets, failed = models.AuthTicket.objects.authorize_many(
+            [first, second],
+            "wsfe",
+        )
+
+    assert (len(tickets), failed) == (2, [])
+    [(_, requests)] = [call.args for call in sign_many.call_args_list]
+    assert [taxpayer for taxpayer, _ in requests] == [first, second]
+
+
+@pytest.mark.django_db
+def test_authorize_many_signing_failure(fake: FakeAFIP) -> None:
+    first = factories.TaxPayerFactory.create()
+    second = factories.AlternateTaxpayerFactory.create()
+    error = exceptions.CorruptCertificate("Not a key")
+
+    def sign(signer: signers.Signer, taxpayer: models.TaxPayer, data: bytes) -> bytes:
+        if taxpayer == second:
+            raise error
+        return crypto.sign(data, *signers.credential_cache.get(taxpayer))
+
+    with patch.object(signers.LocalSigner, "sign", autospec=True, side_effect=sign):
+        tickets, failed = models.AuthTicket.objects.authorize_many(
+            [first, second],
+            "wsfe",
+        )
+
+    assert [ticket.owner for ticket in tickets] == [first]
+    assert failed == [(second, error)]
+    assert fake.calls == ["loginCms"]
+
+
+@pytest.mark.django_db
+def test_authorize_many_reuses_valid_ticket(fake: FakeAFIP) -> None:
+    taxpayer = factories.TaxPayerFactory.create()
+    existing = taxpayer.create_ticket("wsfe")
+    fake.inject(
+        "loginCms",
+        Fault("El CEE ya posee un TA valido para el acceso al WSN solicitado"),
+    )
+
+    tickets, failed = models.AuthTicket.objects.authorize_many([taxpayer], "wsfe")
+
+    assert (tickets, failed) == ([existing], [])
+    assert models.AuthTicket.objects.count() == 1